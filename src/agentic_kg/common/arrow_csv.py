@@ -0,0 +1,155 @@
+"""Vectorized CSV search over Arrow record batches.
+
+The CSV dialect is sniffed with clevercsv, then the file is streamed as Arrow
+record batches (every column read as a string) and matched column-wise with
+Arrow compute kernels. Only the first `limit` matching rows are kept, while
+the total number of matching rows is still counted.
+
+Arrow rejects a whole file when a row has more or fewer fields than the
+header. Such files are read again through the csv reader instead, with short
+rows padded with empty values and long rows cut to the header, and counted.
+"""
+import logging
+from contextlib import nullcontext
+from itertools import batched
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from .compression import is_compressed, open_binary
+from .csv_files import open_csv_rows, read_csv_header
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODES = ("exact", "prefix", "substring", "regex")
+
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# rows per record batch of a file read through the csv reader
+PADDED_BATCH_ROWS = 64 * 1024
+
+
+def _parse_options(dialect) -> pa_csv.ParseOptions:
+    # quoted values may span lines, like the csv module reads them
+    if dialect is None:
+        return pa_csv.ParseOptions(newlines_in_values=True)
+    return pa_csv.ParseOptions(
+        delimiter=dialect.delimiter or ",",
+        quote_char=dialect.quotechar or False,
+        escape_char=dialect.escapechar or False,
+        newlines_in_values=True,
+    )
+
+
+def open_batches(path: Path, header: List[str], dialect, columns: Optional[List[str]] = None) -> Iterator[pa.RecordBatch]:
+    """Stream a CSV file as record batches of string columns, optionally projected to some columns.
+
+    The file is closed once the batches are exhausted, or the iterator is closed.
+    """
+    # compressed files are read through a decompressing stream, which Arrow doesn't close
+    with open_binary(path) if is_compressed(path) else nullcontext(path) as source:
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=BLOCK_SIZE),
+            parse_options=_parse_options(dialect),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=False,
+                include_columns=columns,
+            ),
+        )
+        yield from reader
+
+
+def padded_batches(path: Path, stats: Dict[str, int], columns: Optional[List[str]] = None) -> Iterator[pa.RecordBatch]:
+    """Stream a CSV file as record batches of string columns through the csv reader, for files Arrow rejects.
+
+    Rows are padded or cut to the header; their number is added to stats['irregular_rows'].
+    """
+    with open_csv_rows(path) as (header, rows):
+        names = columns or header
+        indexes = [header.index(name) for name in names]
+        for chunk in batched(rows, PADDED_BATCH_ROWS):
+            values: List[List[str]] = [[] for _ in names]
+            for row in chunk:
+                if len(row) != len(header):
+                    stats["irregular_rows"] = stats.get("irregular_rows", 0) + 1
+                for values_of, index in zip(values, indexes):
+                    values_of.append(row[index] if index < len(row) else "")
+            yield pa.RecordBatch.from_arrays([pa.array(v, pa.string()) for v in values], names=names)
+
+
+def match_column(column: pa.Array, query: str, match_mode: str, case_sensitive: bool) -> pa.Array:
+    ignore_case = not case_sensitive
+    if match_mode == "exact":
+        if case_sensitive:
+            return pc.equal(column, query)
+        return pc.equal(pc.utf8_lower(column), query.lower())
+    if match_mode == "prefix":
+        return pc.starts_with(column, query, ignore_case=ignore_case)
+    if match_mode == "substring":
+        return pc.match_substring(column, query, ignore_case=ignore_case)
+    if match_mode == "regex":
+        return pc.match_substring_regex(column, query, ignore_case=ignore_case)
+    raise ValueError(f"Unknown match mode '{match_mode}'. Use one of {', '.join(MATCH_MODES)}.")
+
+
+def search_batches(
+    batches: Iterable[pa.RecordBatch],
+    header: List[str],
+    query: str,
+    columns: Optional[List[str]] = None,
+    match_mode: str = "substring",
+    case_sensitive: bool = False,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Find rows in a stream of record batches where any of the given columns (default: all) match the query.
+
+    Returns:
+        A dictionary with the 'header', up to `limit` matching 'rows' (lists of strings, in order)
+        and the 'total_count' of matching rows.
+    """
+    if match_mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{match_mode}'. Use one of {', '.join(MATCH_MODES)}.")
+    search_columns = columns or header
+    unknown = [c for c in search_columns if c not in header]
+    if unknown:
+        raise ValueError(f"Unknown columns {unknown}. Available columns are {header}.")
+
+    rows: List[List[str]] = []
+    total_count = 0
+    for batch in batches:
+        mask = None
+        for name in search_columns:
+            matched = match_column(batch.column(name), query, match_mode, case_sensitive)
+            mask = matched if mask is None else pc.or_(mask, matched)
+        matches = pc.sum(mask).as_py() or 0
+        if not matches:
+            continue
+        total_count += matches
+        if len(rows) < limit:
+            kept = batch.filter(mask).slice(0, limit - len(rows))
+            rows.extend(list(row) for row in zip(*(kept.column(name).to_pylist() for name in header)))
+    return {"header": header, "rows": rows, "total_count": total_count}
+
+
+def search_csv(
+    path: Path,
+    query: str,
+    columns: Optional[List[str]] = None,
+    match_mode: str = "substring",
+    case_sensitive: bool = False,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Find rows of a CSV file where any of the given columns (default: all) match the query. See search_batches."""
+    header, dialect = read_csv_header(path)
+    try:
+        return search_batches(open_batches(path, header, dialect), header, query, columns, match_mode, case_sensitive, limit)
+    except pa.ArrowInvalid as e:
+        logger.info(f"Searching {path} with the csv reader, since Arrow can't parse it: {e}")
+    stats = {"irregular_rows": 0}
+    search = search_batches(padded_batches(path, stats), header, query, columns, match_mode, case_sensitive, limit)
+    return {**search, "irregular_rows": stats["irregular_rows"]}
@@ -0,0 +1,65 @@
+"""Adaptive transaction batch sizes for imports, tuned between runs.
+
+Each run of an import records its batch size and throughput (rows/sec). The
+next run tries a batch size one step away from the best size seen so far: while
+throughput improves it keeps stepping in the same direction, and when it
+doesn't, it turns around with a smaller step. The step shrinks until the size
+settles on the best one found, so repeated imports of similar files converge
+without any manual tuning.
+"""
+import math
+from typing import Any, Dict, Optional
+
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 50_000
+
+INITIAL_STEP = 2.0
+# below this, the step is too small to be worth measuring
+MIN_STEP = 1.1
+
+
+def _clamp(batch_size: float) -> int:
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, int(round(batch_size))))
+
+
+def _turn(step: float) -> float:
+    """Step the other way, by a smaller factor, or settle once the step gets too small."""
+    step = step ** -0.5
+    return step if abs(math.log(step)) >= math.log(MIN_STEP) else 1.0
+
+
+def next_batch_size(history: Optional[Dict[str, Any]], default: int) -> int:
+    """The batch size for the next run, given the tuning history of earlier runs (or None)."""
+    if not history:
+        return _clamp(default)
+    return _clamp(history["best_batch_size"] * history["step"])
+
+
+def record_run(history: Optional[Dict[str, Any]], batch_size: int, rows: int, seconds: float) -> Optional[Dict[str, Any]]:
+    """Update the tuning history with the throughput of a run.
+
+    Runs too small to fill a single batch say little about the batch size and are ignored.
+    """
+    if rows < batch_size or seconds <= 0:
+        return history
+    rows_per_second = rows / seconds
+    if not history:
+        return {
+            "best_batch_size": batch_size,
+            "best_rows_per_second": rows_per_second,
+            "step": INITIAL_STEP,
+            "runs": 1,
+        }
+
+    history = {**history, "runs": history.get("runs", 0) + 1}
+    if batch_size == history["best_batch_size"]:
+        # the step ran into a size limit (or has settled): keep the latest throughput of the best size
+        history["best_rows_per_second"] = rows_per_second
+        if history["step"] != 1.0:
+            history["step"] = _turn(history["step"])
+    elif rows_per_second > history["best_rows_per_second"]:
+        history["best_batch_size"] = batch_size
+        history["best_rows_per_second"] = rows_per_second
+    else:
+        history["step"] = _turn(history["step"])
+    return history
@@ -0,0 +1,107 @@
+"""Checkpoints of graph builds, so that an interrupted build can be resumed.
+
+A build of a construction plan records, per rule, whether it is running, done
+or failed, and how many source rows its committed batches have consumed. The
+checkpoint file is named after a hash of the plan, and every rule's entry holds
+the signature of its source file, so a checkpoint only applies to the same plan
+over the same files. Resuming skips rules that are done, and restarts the
+others after their last committed row.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .build_progress import RuleProgress
+from .file_catalog import file_signature, get_catalog_dir
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_DIR = "checkpoints"
+
+
+def plan_hash(construction_plan: dict) -> str:
+    """A hash of the content of a construction plan."""
+    text = json.dumps(construction_plan, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def source_fingerprint(path: Path) -> Optional[Dict[str, int]]:
+    """The signature of a rule's source file, or None if it doesn't exist."""
+    try:
+        return file_signature(path)
+    except OSError:
+        return None
+
+
+class CheckpointStore:
+    """The checkpoints of one construction plan, saved to a JSON file after every change. Thread safe."""
+
+    def __init__(self, path: Path, construction_plan_hash: str, resume: bool = False):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        state: Dict[str, Any] = {}
+        if resume and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+        if state.get("plan_hash") != construction_plan_hash:
+            state = {"plan_hash": construction_plan_hash, "rules": {}}
+        self.state = state
+
+    @classmethod
+    def for_plan(cls, import_dir: Path, construction_plan: dict, resume: bool = False) -> "CheckpointStore":
+        construction_plan_hash = plan_hash(construction_plan)
+        path = get_catalog_dir(import_dir) / CHECKPOINTS_DIR / f"{construction_plan_hash}.json"
+        return cls(path, construction_plan_hash, resume)
+
+    def _save(self) -> None:
+        # failing to save a checkpoint only costs the ability to resume
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save checkpoint {self.path}: {e}")
+
+    def _entry(self, key: str, fingerprint: Optional[Dict[str, int]]) -> Optional[Dict[str, Any]]:
+        entry = self.state["rules"].get(key)
+        if entry is None or fingerprint is None or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry
+
+    def is_done(self, key: str, fingerprint: Optional[Dict[str, int]]) -> bool:
+        """True if the rule was completed, over the same source file."""
+        with self.lock:
+            entry = self._entry(key, fingerprint)
+            return entry is not None and entry["status"] == "done"
+
+    def begin(self, key: str, fingerprint: Optional[Dict[str, int]]) -> RuleProgress:
+        """Start (or restart) a rule, returning its progress. A rule that stopped part way resumes after its last committed row."""
+        with self.lock:
+            entry = self._entry(key, fingerprint)
+            skip_rows = entry["rows_committed"] if entry is not None and entry["status"] != "done" else 0
+            self.state["rules"][key] = {"fingerprint": fingerprint, "status": "running", "rows_committed": skip_rows}
+            self._save()
+        progress = RuleProgress(skip_rows)
+        progress.listeners.append(lambda p: self.update(key, rows_committed=p.rows_committed))
+        return progress
+
+    def update(self, key: str, **values: Any) -> None:
+        with self.lock:
+            self.state["rules"][key].update(values)
+            self._save()
+
+    def finish(self, key: str, result: Dict[str, Any]) -> None:
+        """Record the outcome of a rule."""
+        if result["status"] == "error":
+            self.update(key, status="failed", error_message=result["error_message"])
+        else:
+            self.update(key, status="done")
@@ -0,0 +1,78 @@
+"""Estimates of how long a graph build will take, before it runs.
+
+Each construction query is planned with EXPLAIN, which doesn't run it. The plan
+is a tree of operators, and two kinds of them make bulk loads slow:
+
+- label scans (AllNodesScan, NodeByLabelScan and friends) read every node of a
+  label for every row, because no index finds the node by its key
+- eager operators (Eager) read every row before writing any, so the whole file
+  is held in memory instead of streaming through batches
+
+A rule's runtime is its rows over its throughput: the rows/sec measured by an
+earlier import of the rule if there was one, otherwise a conservative default.
+Label scans add the time to read the scanned nodes once per row. The runtime of
+the whole build then follows from running the rules on the build's workers,
+each starting once the rules it depends on have finished.
+"""
+import heapq
+import math
+from typing import Any, Dict, List, Optional
+
+# throughput of MERGE by an indexed key, when nothing was measured
+DEFAULT_ROWS_PER_SECOND = {"node": 10_000, "relationship": 5_000}
+SCANNED_NODES_PER_SECOND = 2_000_000
+TRANSACTION_SECONDS = 0.005
+
+LABEL_SCAN_OPERATORS = (
+    "AllNodesScan", "NodeByLabelScan", "UnionNodeByLabelsScan",
+    "IntersectionNodeByLabelsScan", "SubtractionNodeByLabelsScan",
+)
+EAGER_OPERATORS = ("Eager",)
+
+
+def plan_operators(plan: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The operators of an EXPLAIN plan, depth first, with their 'operator' name and 'details'."""
+    if not plan:
+        return []
+    # operator types may be suffixed with the runtime, like 'NodeByLabelScan@neo4j'
+    operator = plan.get("operatorType", "").split("@")[0]
+    details = (plan.get("arguments") or {}).get("Details")
+    operators = [{"operator": operator, "details": details}]
+    for child in plan.get("children") or []:
+        operators.extend(plan_operators(child))
+    return operators
+
+
+def read_plan(plan: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The distinct 'operators' of a plan, and the 'label_scans' and 'eager' operators in it."""
+    operators = plan_operators(plan)
+    return {
+        "operators": list(dict.fromkeys(o["operator"] for o in operators)),
+        "label_scans": [o["details"] or o["operator"] for o in operators if o["operator"] in LABEL_SCAN_OPERATORS],
+        "eager": any(o["operator"] in EAGER_OPERATORS for o in operators),
+    }
+
+
+def estimate_rule(rows: int, batch_size: int, rows_per_second: float, scanned_nodes_per_row: int = 0) -> Dict[str, Any]:
+    """The 'transactions' and 'seconds' of a rule writing `rows` rows."""
+    transactions = math.ceil(rows / batch_size) if rows else 0
+    seconds = rows / rows_per_second + rows * scanned_nodes_per_row / SCANNED_NODES_PER_SECOND
+    return {"transactions": transactions, "seconds": round(seconds + transactions * TRANSACTION_SECONDS, 1)}
+
+
+def schedule_seconds(seconds: Dict[str, float], dependencies: Dict[str, List[str]], max_workers: int) -> float:
+    """How long rules take on max_workers workers, each starting (in order) once its dependencies are done."""
+    pending = list(seconds)
+    running: List[Any] = []
+    done = set()
+    now = 0.0
+    while pending or running:
+        ready = [key for key in pending if all(d in done or d not in seconds for d in dependencies.get(key, []))]
+        for key in ready[:max(0, max_workers - len(running))]:
+            pending.remove(key)
+            heapq.heappush(running, (now + seconds[key], key))
+        if not running:
+            break
+        now, key = heapq.heappop(running)
+        done.add(key)
+    return round(now, 1)
@@ -0,0 +1,145 @@
+"""Live progress of graph builds.
+
+Loaders report every committed batch to the rule's RuleProgress. A
+ProgressRegistry holds the progress of every rule of a build, and turns it into
+snapshots with rows processed, rows/sec, an ETA (from an estimate of the rows in
+the source file) and the time since the last committed batch, which shows a
+stalled load. Snapshots can be taken from any thread while the build runs.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .compression import is_compressed
+from .json_records import JSON_LINES_SUFFIXES
+
+ESTIMATE_SAMPLE_BYTES = 1024 * 1024
+
+
+class RuleProgress:
+    """The progress of one rule, reported by its loader after every committed batch.
+
+    Loaders skip the first `skip_rows` source rows, which were committed by an earlier run.
+    Listeners (the checkpoint store, the progress registry) are called after every batch.
+    A loader that can't report batches as they commit (LOAD CSV) may set `live_rows`, a
+    callable estimating the rows written so far.
+    """
+
+    def __init__(self, skip_rows: int = 0):
+        self.skip_rows = skip_rows
+        self.rows_read = 0
+        self.rows_written = 0
+        self.batches = 0
+        self.started = time.monotonic()
+        self.last_batch: Optional[float] = None
+        self.listeners: List[Callable[["RuleProgress"], None]] = []
+        self.live_rows: Optional[Callable[[], Optional[int]]] = None
+
+    def batch_committed(self, rows_read: int, rows_written: int) -> None:
+        """Count a committed batch: the source rows it consumed and the rows it wrote."""
+        self.rows_read += rows_read
+        self.rows_written += rows_written
+        self.batches += 1
+        self.last_batch = time.monotonic()
+        for listener in self.listeners:
+            listener(self)
+
+    @property
+    def rows_committed(self) -> int:
+        """The source rows committed so far, including those of earlier runs."""
+        return self.skip_rows + self.rows_read
+
+
+def estimate_row_count(path: Path) -> Optional[int]:
+    """Estimate the data rows of a CSV or JSON Lines file from the line density of its first megabyte.
+
+    None for files whose rows can't be estimated this way (compressed files, JSON documents).
+    """
+    path = Path(path)
+    if is_compressed(path) or path.suffix.lower() not in (".csv", *JSON_LINES_SUFFIXES):
+        return None
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            sample = f.read(ESTIMATE_SAMPLE_BYTES)
+    except OSError:
+        return None
+    if not sample:
+        return 0
+    lines = sample.count(b"\n") + (0 if sample.endswith(b"\n") else 1)
+    if len(sample) < size:
+        lines = round(lines * size / len(sample))
+    return max(0, lines - 1) if path.suffix.lower() == ".csv" else lines
+
+
+class ProgressRegistry:
+    """The progress of every rule of one build."""
+
+    def __init__(self, rule_keys: List[str]):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.rules: Dict[str, Dict[str, Any]] = {key: {"state": "pending"} for key in rule_keys}
+        self.progress: Dict[str, RuleProgress] = {}
+
+    def rule_started(self, key: str, progress: RuleProgress, total_rows: Optional[int]) -> None:
+        with self.lock:
+            self.rules[key] = {"state": "running", "total_rows": total_rows}
+            self.progress[key] = progress
+
+    def rule_finished(self, key: str, result: Dict[str, Any]) -> None:
+        with self.lock:
+            state = "failed" if result["status"] == "error" else "done"
+            self.rules[key] = {**self.rules[key], "state": state, "seconds": result.get("seconds")}
+
+    def build_finished(self) -> None:
+        self.finished = time.monotonic()
+
+    @staticmethod
+    def _rule_snapshot(rule: Dict[str, Any], progress: Optional[RuleProgress], now: float) -> Dict[str, Any]:
+        if progress is None:
+            return rule
+        elapsed = now - progress.started if rule["state"] == "running" else (rule.get("seconds") or now - progress.started)
+        rows_written = progress.rows_written
+        rows_done = progress.rows_committed
+        if rule["state"] == "running" and progress.batches == 0 and progress.live_rows is not None:
+            # a single LOAD CSV query: estimated from what has been written so far
+            live = progress.live_rows()
+            if live is not None:
+                rows_written = live
+                rows_done = progress.skip_rows + live
+        rows_per_second = (rows_done - progress.skip_rows) / elapsed if elapsed > 0 else None
+        total_rows = rule.get("total_rows")
+        eta_seconds = None
+        if rule["state"] == "running" and total_rows is not None and rows_per_second:
+            eta_seconds = round(max(0, total_rows - rows_done) / rows_per_second, 1)
+        last_batch = progress.last_batch or progress.started
+        rule.update({
+            "rows_processed": rows_done,
+            "rows_written": rows_written,
+            "batches": progress.batches,
+            "rows_per_second": round(rows_per_second, 1) if rows_per_second is not None else None,
+            "eta_seconds": eta_seconds,
+            "seconds_since_last_batch": round(now - last_batch, 1) if rule["state"] == "running" else None,
+        })
+        if progress.skip_rows:
+            rule["resumed_after_rows"] = progress.skip_rows
+        return rule
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The progress of the build and each of its rules."""
+        now = time.monotonic()
+        with self.lock:
+            current = [(key, dict(rule), self.progress.get(key)) for key, rule in self.rules.items()]
+        # outside the lock, since estimating the rows of a LOAD CSV query asks the database
+        rules = {key: self._rule_snapshot(rule, progress, now) for key, rule, progress in current}
+        states = [rule["state"] for rule in rules.values()]
+        return {
+            "running": self.finished is None,
+            "seconds": round((self.finished or now) - self.started, 1),
+            "rules_done": states.count("done"),
+            "rules_failed": states.count("failed"),
+            "rules_running": [key for key, rule in rules.items() if rule["state"] == "running"],
+            "rules": rules,
+        }
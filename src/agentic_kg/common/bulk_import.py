@@ -0,0 +1,110 @@
+"""Inputs of the offline bulk importer, `neo4j-admin database import full`.
+
+The importer writes a new database directly, without transactions, which makes
+a first build orders of magnitude faster than MERGE, but it doesn't run Cypher:
+every node file needs a header naming its `:ID` column (in an ID space per
+label), every relationship file its `:START_ID` and `:END_ID` columns in the ID
+spaces of its endpoints, and property columns are typed in the header (like
+`price:double`). Values must already be in the importer's formats, so rows are
+written out converted: booleans as true/false, dates as ISO dates, lists joined
+by the array delimiter, and empty values as empty fields, which the importer
+leaves out. Names are written into headers and command arguments as they are,
+so names holding the characters those are parsed by are rejected.
+"""
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# the importer's name of each property type; currency amounts are written as numbers
+BULK_IMPORT_TYPES = {
+    "int": "long",
+    "float": "double",
+    "currency": "double",
+    "bool": "boolean",
+    "date": "date",
+    "string": "string",
+}
+ARRAY_DELIMITER = ";"
+
+# ':' starts a header field's type, ',' separates header fields and files, '=' a label from its files,
+# and parentheses enclose an ID space
+RESERVED_CHARACTERS = ':,=()"\n\r'
+
+
+def property_field(column: str, property_type: str = "string", array: bool = False) -> str:
+    """The header field of a property column, like 'price:double' or 'category:string[]'."""
+    bulk_type = BULK_IMPORT_TYPES.get(property_type, "string")
+    if array:
+        return f"{column}:{bulk_type}[]"
+    return column if bulk_type == "string" else f"{column}:{bulk_type}"
+
+
+def node_header(unique_column_name: str, properties: List[str], types: Dict[str, str], id_space: str,
+                arrays: bool = False) -> List[str]:
+    """The header of a node file: its key column in the label's ID space, then its properties.
+
+    The key is stored as a text property named after its column, like the key MERGE would write.
+    """
+    return [f"{unique_column_name}:ID({id_space})"] + [
+        property_field(column, types.get(column, "string"), arrays)
+        for column in properties if column != unique_column_name
+    ]
+
+
+def relationship_header(properties: List[str], types: Dict[str, str], from_id_space: str, to_id_space: str,
+                        arrays: bool = False) -> List[str]:
+    """The header of a relationship file: its start and end node IDs, then its properties."""
+    return [f":START_ID({from_id_space})", f":END_ID({to_id_space})"] + [
+        property_field(column, types.get(column, "string"), arrays) for column in properties
+    ]
+
+
+def bulk_value(value: Any) -> str:
+    """A property value in the importer's format. None is an empty field, which leaves the property out."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, list):
+        items = [bulk_value(v) for v in value if v is not None]
+        if any(ARRAY_DELIMITER in item for item in items):
+            raise ValueError(f"the list value {items} has an item containing the array delimiter '{ARRAY_DELIMITER}'")
+        return ARRAY_DELIMITER.join(items)
+    return str(value)
+
+
+def import_command(neo4j_admin: str, database: str, nodes: List[Tuple[str, str, str]],
+                   relationships: List[Tuple[str, str, str]], multiline_fields: bool = False,
+                   overwrite: bool = False) -> List[str]:
+    """The arguments of a `neo4j-admin database import full` command.
+
+    Args:
+        nodes: the (label, header file, data file) of every node file
+        relationships: the (relationship type, header file, data file) of every relationship file
+        multiline_fields: whether values span lines, which the importer only reads when told to
+        overwrite: replace an existing database (otherwise the importer refuses to)
+    """
+    command = [neo4j_admin, "database", "import", "full"]
+    command += [f"--nodes={label}={header},{data}" for label, header, data in nodes]
+    command += [f"--relationships={relationship_type}={header},{data}" for relationship_type, header, data in relationships]
+    # like MATCH, rows whose nodes don't exist are skipped (and listed in the import report)
+    command.append("--skip-bad-relationships=true")
+    command.append(f"--array-delimiter={ARRAY_DELIMITER}")
+    if multiline_fields:
+        command.append("--multiline-fields=true")
+    if overwrite:
+        command.append("--overwrite-destination=true")
+    command.append(database)
+    return command
+
+
+def check_bulk_name(name: str, kind: str = "Column") -> Optional[str]:
+    """An error message if a column, label or relationship type can't be named in an importer header
+    or argument, otherwise None."""
+    reserved = sorted({character for character in name if character in RESERVED_CHARACTERS})
+    if reserved:
+        return f"{kind} {name!r} contains {', '.join(repr(c) for c in reserved)}, which the bulk importer can't read in a name."
+    if not name.strip() or name != name.strip():
+        return f"{kind} {name!r} is empty or starts or ends with spaces, which the bulk importer trims."
+    return None
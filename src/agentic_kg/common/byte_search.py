@@ -0,0 +1,80 @@
+"""Memory-mapped, byte-level case-insensitive search for large text files.
+
+Rather than decoding and lower-casing every line, the file is memory-mapped and
+scanned in fixed-size chunks: each chunk is case-folded as bytes and searched
+with bytes.find. Line numbers are only computed for matches, by counting
+newlines since the previous match, and callers can stop consuming matches at
+any time without reading the rest of the file.
+
+Bytes fold case for ASCII only, so callers should use this path for
+ASCII queries and fall back to a decoded scan otherwise.
+"""
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    # mmap has no count(), so count over bounded slices to keep memory flat
+    count = 0
+    for chunk_start in range(start, end, CHUNK_SIZE):
+        count += mm[chunk_start:min(chunk_start + CHUNK_SIZE, end)].count(b"\n")
+    return count
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[Optional[mmap.mmap]]:
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield None  # empty files can't be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _iter_line_spans(mm: mmap.mmap, query: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) byte offsets of each line containing the query, once per line."""
+    needle = query.encode("utf-8").lower()
+    overlap = len(needle) - 1
+    size = len(mm)
+    next_line_start = 0
+    for chunk_start in range(0, size, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, size)
+        # extend each chunk so matches straddling the chunk boundary are found exactly once
+        chunk = mm[chunk_start:min(chunk_end + overlap, size)].lower()
+        pos = chunk.find(needle, max(0, next_line_start - chunk_start))
+        while pos != -1 and chunk_start + pos < chunk_end:
+            match_start = chunk_start + pos
+            line_start = mm.rfind(b"\n", 0, match_start) + 1
+            line_end = mm.find(b"\n", match_start + len(needle))
+            if line_end == -1:
+                line_end = size
+            yield line_start, line_end
+            next_line_start = line_end + 1
+            if next_line_start >= chunk_end:
+                break
+            pos = chunk.find(needle, next_line_start - chunk_start)
+
+
+def iter_byte_matches(path: Path, query: str) -> Iterator[Tuple[int, bytes]]:
+    """Yield (1-based line number, raw line) for each line containing the query, case-insensitively."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        line_number = 1
+        counted_to = 0
+        for line_start, line_end in _iter_line_spans(mm, query):
+            line_number += _count_newlines(mm, counted_to, line_start)
+            counted_to = line_start
+            yield line_number, mm[line_start:line_end]
+
+
+def count_byte_matches(path: Path, query: str) -> int:
+    """Count the lines containing the query, without computing line numbers or copying lines."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return 0
+        return sum(1 for _ in _iter_line_spans(mm, query))
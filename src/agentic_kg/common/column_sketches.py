@@ -0,0 +1,179 @@
+"""Compact per-column sketches for estimating cardinality and set containment.
+
+Each column is summarized by:
+- a bottom-k MinHash sketch (the k smallest 64-bit hashes of distinct values), and
+- a HyperLogLog sketch for distinct-count estimation.
+
+Together they estimate how much of one column's values are contained in another
+column, which is the signal used to discover foreign-key (inclusion dependency)
+candidates across files without ever holding the full columns in memory.
+"""
+import base64
+import hashlib
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+MINHASH_SIZE = 256
+HLL_PRECISION = 12
+
+_HASH_BITS = 64
+
+
+def hash_value(value: str) -> int:
+    """A stable 64-bit hash of a string value."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHashSketch:
+    """Bottom-k MinHash: keeps the k smallest distinct hashes seen."""
+
+    def __init__(self, k: int = MINHASH_SIZE, hashes: Optional[Iterable[int]] = None):
+        self.k = k
+        self._heap: List[int] = []  # max-heap via negated values
+        self._members = set()
+        for h in hashes or []:
+            self.add_hash(h)
+
+    def add_hash(self, h: int) -> None:
+        if h in self._members:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -h)
+            self._members.add(h)
+        elif h < -self._heap[0]:
+            evicted = -heapq.heapreplace(self._heap, -h)
+            self._members.discard(evicted)
+            self._members.add(h)
+
+    @property
+    def hashes(self) -> List[int]:
+        return sorted(self._members)
+
+    def is_exact(self) -> bool:
+        """True when fewer than k distinct values were seen, so the sketch holds the whole set."""
+        return len(self._members) < self.k
+
+    def jaccard(self, other: "MinHashSketch") -> float:
+        """Estimate the Jaccard similarity of the two underlying sets."""
+        k = min(self.k, other.k)
+        union_bottom = sorted(self._members | other._members)[:k]
+        if not union_bottom:
+            return 0.0
+        both = self._members & other._members
+        return sum(1 for h in union_bottom if h in both) / len(union_bottom)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "hashes": [format(h, "x") for h in self.hashes]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MinHashSketch":
+        return cls(data["k"], (int(h, 16) for h in data["hashes"]))
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator over 64-bit hashes."""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[bytearray] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    def add_hash(self, h: int) -> None:
+        index = h >> (_HASH_BITS - self.precision)
+        remainder = h & ((1 << (_HASH_BITS - self.precision)) - 1)
+        rank = (_HASH_BITS - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        return HyperLogLog(self.precision, bytearray(max(a, b) for a, b in zip(self.registers, other.registers)))
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small cardinalities
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        return cls(data["precision"], bytearray(base64.b64decode(data["registers"])))
+
+
+class ColumnSketch:
+    """Summary of one column: counts plus MinHash and HyperLogLog sketches of its distinct values."""
+
+    def __init__(self, minhash: Optional[MinHashSketch] = None, hll: Optional[HyperLogLog] = None,
+                 row_count: int = 0, non_empty_count: int = 0):
+        self.minhash = minhash or MinHashSketch()
+        self.hll = hll or HyperLogLog()
+        self.row_count = row_count
+        self.non_empty_count = non_empty_count
+
+    def add(self, value: Optional[str]) -> None:
+        self.row_count += 1
+        if value is None:
+            return
+        value = value.strip()
+        if not value:
+            return
+        self.non_empty_count += 1
+        h = hash_value(value)
+        self.minhash.add_hash(h)
+        self.hll.add_hash(h)
+
+    def distinct_count(self) -> float:
+        """Estimated number of distinct non-empty values (exact when small)."""
+        if self.minhash.is_exact():
+            return float(len(self.minhash.hashes))
+        return self.hll.estimate()
+
+    def uniqueness(self) -> float:
+        """Ratio of distinct to non-empty values; close to 1.0 for key-like columns."""
+        if not self.non_empty_count:
+            return 0.0
+        return min(1.0, self.distinct_count() / self.non_empty_count)
+
+    def containment_in(self, other: "ColumnSketch") -> float:
+        """Estimate the fraction of this column's distinct values that also appear in another column."""
+        if not self.non_empty_count or not other.non_empty_count:
+            return 0.0
+        if self.minhash.is_exact() and other.minhash.is_exact():
+            mine = set(self.minhash.hashes)
+            return len(mine & set(other.minhash.hashes)) / len(mine)
+        union_count = self.hll.merge(other.hll).estimate()
+        intersection = self.minhash.jaccard(other.minhash) * union_count
+        return max(0.0, min(1.0, intersection / self.distinct_count()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "row_count": self.row_count,
+            "non_empty_count": self.non_empty_count,
+            "minhash": self.minhash.to_dict(),
+            "hll": self.hll.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnSketch":
+        return cls(
+            MinHashSketch.from_dict(data["minhash"]),
+            HyperLogLog.from_dict(data["hll"]),
+            data["row_count"],
+            data["non_empty_count"],
+        )
+
+
+def sketch_columns(header: List[str], rows: Iterable[List[str]]) -> Dict[str, ColumnSketch]:
+    """Build a sketch for every column in a single streaming pass over the rows."""
+    sketches = {column: ColumnSketch() for column in header}
+    columns = list(sketches.values())
+    for row in rows:
+        for i, sketch in enumerate(columns):
+            sketch.add(row[i] if i < len(row) else None)
+    return sketches
@@ -0,0 +1,174 @@
+"""A cached columnar (Parquet) copy of CSV source files.
+
+Each CSV file is converted once into a Parquet file (every column kept as a
+string, so values read back exactly as they appear in the source). Copies are
+keyed by the content hash of their source, and the file catalog maps each
+source file to its current copy. When a source file changes, its copy is
+rebuilt; a file that was merely touched keeps its copy.
+
+Repeat analysis then reads only the columns it needs, in compressed batches,
+instead of parsing the whole CSV file again.
+"""
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .arrow_csv import MATCH_MODES, match_column, open_batches, padded_batches
+from .csv_files import read_csv_header
+from .file_catalog import content_hash, get_catalog_dir, read_catalog_entry, write_catalog_entry
+from .property_types import TYPE_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_COPY = "columnar_copy"
+
+
+def _copy_path(import_dir: Path, digest: str) -> Path:
+    return get_catalog_dir(import_dir) / "parquet" / f"{digest}.parquet"
+
+
+def find_columnar_copy(import_dir: Path, file_path: str) -> Optional[Path]:
+    """The Parquet copy of a file, if one exists for the file's current content."""
+    entry = read_catalog_entry(import_dir, COLUMNAR_COPY, file_path)
+    if entry is None:
+        return None
+    copy_path = _copy_path(import_dir, entry["content_hash"])
+    return copy_path if copy_path.exists() else None
+
+
+def convert_to_parquet(source: Path, target: Path) -> int:
+    """Stream a CSV file into a Parquet file of string columns. Returns the number of rows written.
+
+    Files with rows Arrow rejects (more or fewer fields than the header) are converted with those rows
+    padded or cut to the header, see arrow_csv.padded_batches.
+    """
+    header, dialect = read_csv_header(source)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_suffix(".tmp")
+    schema = pa.schema([(name, pa.string()) for name in header])
+
+    def write(batches: Iterator[pa.RecordBatch]) -> int:
+        rows = 0
+        with pq.ParquetWriter(tmp_target, schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    try:
+        rows = write(open_batches(source, header, dialect))
+    except pa.ArrowInvalid as e:
+        logger.info(f"Converting {source} with the csv reader, since Arrow can't parse it: {e}")
+        stats = {"irregular_rows": 0}
+        rows = write(padded_batches(source, stats))
+        logger.warning(f"{source} has {stats['irregular_rows']} rows with more or fewer fields than its header")
+    tmp_target.replace(target)
+    return rows
+
+
+def get_columnar_copy(import_dir: Path, file_path: str) -> Path:
+    """The Parquet copy of a file, converting the file first if its content has no copy yet."""
+    copy_path = find_columnar_copy(import_dir, file_path)
+    if copy_path is not None:
+        return copy_path
+
+    previous = read_catalog_entry(import_dir, COLUMNAR_COPY, file_path, allow_stale=True)
+    digest = content_hash(Path(import_dir) / file_path)
+    copy_path = _copy_path(import_dir, digest)
+    if not copy_path.exists():
+        logger.info(f"Converting {file_path} to a columnar copy")
+        convert_to_parquet(Path(import_dir) / file_path, copy_path)
+    write_catalog_entry(import_dir, COLUMNAR_COPY, file_path, {"content_hash": digest})
+
+    # the source changed, so its previous copy is no longer needed
+    if previous and previous["content_hash"] != digest:
+        _copy_path(import_dir, previous["content_hash"]).unlink(missing_ok=True)
+    return copy_path
+
+
+def read_header(copy_path: Path) -> List[str]:
+    return pq.read_schema(copy_path).names
+
+
+def row_count(copy_path: Path) -> int:
+    return pq.ParquetFile(copy_path).metadata.num_rows
+
+
+def iter_batches(copy_path: Path, columns: Optional[List[str]] = None) -> Iterator[pa.RecordBatch]:
+    """Stream record batches from a columnar copy, reading only the given columns."""
+    return pq.ParquetFile(copy_path).iter_batches(columns=columns)
+
+
+def read_column(copy_path: Path, column: str) -> pa.ChunkedArray:
+    return pq.read_table(copy_path, columns=[column]).column(column)
+
+
+def search_columnar(
+    copy_path: Path,
+    query: str,
+    columns: Optional[List[str]] = None,
+    match_mode: str = "substring",
+    case_sensitive: bool = False,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Like arrow_csv.search_batches, but only decodes the searched columns, plus 
+    the full rows of row groups that have matches still to be returned."""
+    if match_mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{match_mode}'. Use one of {', '.join(MATCH_MODES)}.")
+    parquet_file = pq.ParquetFile(copy_path)
+    header = parquet_file.schema_arrow.names
+    search_columns = columns or header
+    unknown = [c for c in search_columns if c not in header]
+    if unknown:
+        raise ValueError(f"Unknown columns {unknown}. Available columns are {header}.")
+
+    rows: List[List[str]] = []
+    total_count = 0
+    for row_group in range(parquet_file.num_row_groups):
+        projected = parquet_file.read_row_group(row_group, columns=search_columns)
+        mask = None
+        for name in search_columns:
+            matched = match_column(projected.column(name), query, match_mode, case_sensitive)
+            mask = matched if mask is None else pc.or_(mask, matched)
+        matches = pc.sum(mask).as_py() or 0
+        if not matches:
+            continue
+        total_count += matches
+        if len(rows) < limit:
+            kept = parquet_file.read_row_group(row_group).filter(mask).slice(0, limit - len(rows))
+            rows.extend(list(row) for row in zip(*(kept.column(name).to_pylist() for name in header)))
+    return {"header": header, "rows": rows, "total_count": total_count}
+
+
+def column_type(non_empty: pa.ChunkedArray) -> str:
+    """The most specific property type that every (non-empty) value of a string column has."""
+    if not len(non_empty):
+        return "string"
+    trimmed = pc.utf8_trim_whitespace(non_empty)
+    for name, pattern in TYPE_PATTERNS.items():
+        if pc.all(pc.match_substring_regex(trimmed, pattern)).as_py():
+            return name
+    return "string"
+
+
+def column_statistics(column: pa.ChunkedArray, top_k: int = 5) -> Dict[str, Any]:
+    """Summary statistics of a string column: counts, distinct values, min/max, the most common values and the type."""
+    non_empty = column.filter(pc.not_equal(column, ""))
+    min_max = pc.min_max(non_empty).as_py() if len(non_empty) else {"min": None, "max": None}
+    distinct = pc.count_distinct(non_empty).as_py()
+    top_values = pc.value_counts(non_empty).to_pylist() if len(non_empty) else []
+    top_values.sort(key=lambda v: v["counts"], reverse=True)
+    return {
+        "non_empty": len(non_empty),
+        "empty": len(column) - len(non_empty),
+        "distinct": distinct,
+        "is_unique": distinct == len(column) and len(column) > 0,
+        "min": min_max["min"],
+        "max": min_max["max"],
+        "top_values": [{"value": v["values"], "count": v["counts"]} for v in top_values[:top_k]],
+        "type": column_type(non_empty),
+    }
@@ -0,0 +1,117 @@
+"""Transparent streaming decompression of compressed input files.
+
+Files ending in .gz, .bz2, .xz or .zst are decompressed on the fly while they
+are read, without ever writing a decompressed copy to disk. The format of the
+content is taken from the suffix before the compression suffix, so
+"orders.csv.gz" is a CSV file.
+
+Zstandard needs either Python 3.14 (compression.zstd) or the optional
+`zstandard` package; the other formats are in the standard library.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+
+from .file_catalog import CATALOG_DIR_NAME, file_signature, read_catalog_entry, write_catalog_entry
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+# compressions that Neo4j's LOAD CSV reads natively
+LOAD_CSV_COMPRESSIONS = (None, "gzip")
+
+GZIP_COPY = "gzip_copy"
+
+
+def compression_of(path: Path) -> Optional[str]:
+    """The compression of a file, from its suffix, or None for uncompressed files."""
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def is_compressed(path: Path) -> bool:
+    return compression_of(path) is not None
+
+
+def content_suffix(path: Path) -> str:
+    """The lower-cased suffix of a file's content, looking past any compression suffix."""
+    path = Path(path)
+    if is_compressed(path):
+        path = path.with_suffix("")
+    return path.suffix.lower()
+
+
+def _open_zstd(path: Path) -> BinaryIO:
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.open(path, "rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            f"Reading Zstandard-compressed file {path} requires Python 3.14 or the 'zstandard' package."
+        ) from None
+    raw = open(path, "rb")
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+
+
+def open_binary(path: Path) -> BinaryIO:
+    """Open a file for reading bytes, decompressing it on the fly if it is compressed."""
+    compression = compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "zstd":
+        return _open_zstd(path)
+    return open(path, "rb")
+
+
+def open_text(path: Path, newline: Optional[str] = None) -> TextIO:
+    """Open a file for reading UTF-8 text, decompressing it on the fly if it is compressed."""
+    if not is_compressed(path):
+        return open(path, "r", encoding="utf-8", newline=newline)
+    return io.TextIOWrapper(open_binary(path), encoding="utf-8", newline=newline)
+
+
+def loadable_file(import_dir: Path, file_path: str) -> str:
+    """A path, relative to the import directory, that LOAD CSV can read the file from.
+
+    Uncompressed and gzip-compressed files are loaded as they are. Other
+    compressions are recompressed once into a gzip copy inside the import
+    directory (the copy must be readable by Neo4j), which is reused until the
+    source file changes.
+    """
+    if compression_of(file_path) in LOAD_CSV_COMPRESSIONS:
+        return file_path
+    import_dir = Path(import_dir)
+    cached = read_catalog_entry(import_dir, GZIP_COPY, file_path)
+    if cached is not None and (import_dir / cached).exists():
+        return cached
+
+    signature = file_signature(import_dir / file_path)
+    copy_name = f"{Path(file_path).with_suffix('').name}-{signature['mtime_ns']}.gz"
+    copy_path = Path(CATALOG_DIR_NAME) / "gzip" / Path(file_path).parent / copy_name
+    target = import_dir / copy_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_suffix(".tmp")
+    with open_binary(import_dir / file_path) as source, gzip.open(tmp_target, "wb", compresslevel=1) as sink:
+        shutil.copyfileobj(source, sink, 1024 * 1024)
+    tmp_target.replace(target)
+
+    previous = read_catalog_entry(import_dir, GZIP_COPY, file_path, allow_stale=True)
+    write_catalog_entry(import_dir, GZIP_COPY, file_path, str(copy_path))
+    if previous and previous != str(copy_path):
+        (import_dir / previous).unlink(missing_ok=True)
+    return str(copy_path)
@@ -23,6 +23,19 @@ class agentic_kgSettings(BaseSettings):
     # Neo4j configuration
     neo4j_dsn: Optional[Neo4jDsn] = Field(default="bolt://localhost:7687")
 
+    # File catalog configuration (derived artifacts such as column sketches)
+    # defaults to a hidden directory inside the Neo4j import directory
+    file_catalog_dir: Optional[str] = Field(default=None)
+
+    # Graph construction: how many construction rules may be imported at once
+    construction_max_workers: int = Field(default=4, ge=1)
+    # and how many rows each import transaction writes, unless a rule sets its own batch size
+    construction_batch_size: int = Field(default=1000, ge=1)
+    # the neo4j-admin executable that runs bulk imports (a name on the PATH, or a path)
+    neo4j_admin: str = Field(default="neo4j-admin")
+    # and how long a bulk import may run, in seconds
+    neo4j_admin_timeout: int = Field(default=6 * 60 * 60, ge=1)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
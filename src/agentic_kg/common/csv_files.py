@@ -0,0 +1,56 @@
+"""Helpers for streaming rows out of CSV files with a sniffed dialect."""
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+import clevercsv
+
+from .compression import open_text
+
+logger = logging.getLogger(__name__)
+
+SNIFF_SIZE = 2048
+
+
+def sniff_dialect(sample: str):
+    """Sniff a CSV dialect from a text sample, or None if sniffing fails."""
+    try:
+        return clevercsv.Sniffer().sniff(sample)
+    except clevercsv.Error:
+        return None
+
+
+def _sniff_file(path: Path):
+    # sniff from a separate handle, since decompressing streams can't seek back to the start
+    with open_text(path, newline="") as csvfile:
+        dialect = sniff_dialect(csvfile.read(SNIFF_SIZE))
+    if dialect is None:
+        logger.warning(f"Could not sniff CSV dialect for {path}. Using default dialect.")
+    return dialect
+
+
+def _reader(csvfile, dialect) -> Iterator[List[str]]:
+    return clevercsv.reader(csvfile) if dialect is None else clevercsv.reader(csvfile, dialect)
+
+
+@contextmanager
+def open_csv_rows(path: Path) -> Iterator[Tuple[List[str], Iterator[List[str]]]]:
+    """Open a CSV file, yielding its header and a lazy iterator over the remaining rows.
+
+    Usage:
+        with open_csv_rows(path) as (header, rows):
+            for row in rows: ...
+    """
+    dialect = _sniff_file(path)
+    with open_text(path, newline="") as csvfile:
+        reader = _reader(csvfile, dialect)
+        header = next(reader, [])
+        yield header, reader
+
+
+def read_csv_header(path: Path) -> Tuple[List[str], Any]:
+    """Read the header row of a CSV file. Returns (header, sniffed dialect or None)."""
+    dialect = _sniff_file(path)
+    with open_text(path, newline="") as csvfile:
+        return next(_reader(csvfile, dialect), []), dialect
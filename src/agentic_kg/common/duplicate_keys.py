@@ -0,0 +1,94 @@
+"""Duplicate keys in the rows of a construction rule, collapsed before they are written.
+
+When a node file repeats a key, MERGE finds the node again and SET rewrites its
+properties for every repeated row; repeated (from, to) pairs of a relationship
+file check for the same relationship again and again, and rows for the same
+key in concurrent batches wait on each other's locks. A streaming pre-pass
+hashes every key to find the ones that repeat. The rows are then streamed
+again: rows with a unique key pass straight through, and only the rows of
+duplicate keys are held back and collapsed by a policy:
+
+- "first": the first row of each key, later ones are dropped
+- "last": the last row of each key, like writing every row in turn
+- "aggregate": one row per key, with each property's values collected into a list
+
+Memory stays bounded by the number of keys (as 64-bit hashes), plus the rows of
+the keys that repeat. The hashes only pick the rows to hold back: held rows are
+grouped by their actual key, so keys whose hashes collide are never merged.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from .column_sketches import hash_value
+from .row_delta import row_key
+
+DUPLICATE_POLICIES = ("first", "last", "aggregate")
+DEFAULT_DUPLICATE_POLICY = "last"
+
+
+def find_duplicate_keys(rows: Iterable[Dict[str, Any]], key_columns: List[str]) -> Dict[str, Any]:
+    """Stream the rows of a rule, counting its keys.
+
+    Returns:
+        A dictionary with the 'rows', the hashes of the keys that repeat ('duplicates'), how many
+        'duplicate_keys' there are, and the 'duplicate_rows' beyond the first of each key.
+    """
+    seen: Set[int] = set()
+    duplicates: Set[int] = set()
+    rows_count = 0
+    duplicate_rows = 0
+    for row in rows:
+        rows_count += 1
+        key = row_key(row, key_columns)
+        if key is None:
+            continue
+        h = hash_value(key)
+        if h in seen:
+            duplicates.add(h)
+            duplicate_rows += 1
+        else:
+            seen.add(h)
+    return {"rows": rows_count, "duplicates": duplicates, "duplicate_keys": len(duplicates), "duplicate_rows": duplicate_rows}
+
+
+def _aggregated(rows: List[Dict[str, Any]], key_columns: List[str]) -> Dict[str, Any]:
+    collapsed = {column: rows[0][column] for column in key_columns}
+    for column in rows[0]:
+        if column in key_columns:
+            continue
+        values: List[Any] = []
+        for row in rows:
+            value = row.get(column)
+            if isinstance(value, list):
+                values.extend(value)
+            elif value is not None:
+                values.append(value)
+        # Neo4j lists hold one type of value
+        if len({type(v) for v in values}) > 1:
+            values = [str(v) for v in values]
+        collapsed[column] = values or None
+    return collapsed
+
+
+def collapse_duplicates(rows: Iterable[Dict[str, Any]], key_columns: List[str], duplicates: Set[int],
+                        policy: str = DEFAULT_DUPLICATE_POLICY) -> Iterator[Dict[str, Any]]:
+    """Stream rows with one row per key, collapsing the rows of the duplicate keys found by find_duplicate_keys.
+
+    Rows of unique keys keep their place; collapsed rows follow at the end (or, for 'first', in place).
+    """
+    held: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        key = row_key(row, key_columns)
+        if key is None or hash_value(key) not in duplicates:
+            yield row
+        elif policy == "first":
+            if key not in held:
+                held[key] = []
+                yield row
+        elif policy == "last":
+            held[key] = [row]
+        else:
+            held.setdefault(key, []).append(row)
+    if policy == "first":
+        return
+    for key_rows in held.values():
+        yield key_rows[-1] if policy == "last" else _aggregated(key_rows, key_columns)
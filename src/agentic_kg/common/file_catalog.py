@@ -0,0 +1,137 @@
+"""A local catalog of derived artifacts for files in the import directory.
+
+Expensive per-file analysis (column sketches, search indexes, ...) is computed
+once and cached here. Every entry records the size and modification time of
+the source file it was derived from, so entries are invalidated automatically
+when the source file changes.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_DIR_NAME = ".agentic_kg"
+
+# serializes read-modify-write updates of entries by the threads of this process
+_update_lock = threading.Lock()
+
+
+def get_catalog_dir(import_dir: Path) -> Path:
+    """Return the catalog directory, configured by FILE_CATALOG_DIR or defaulting to a hidden directory inside the import dir."""
+    configured = get_settings().file_catalog_dir
+    if configured:
+        return Path(configured)
+    return Path(import_dir) / CATALOG_DIR_NAME
+
+
+def is_catalog_path(relative_path: Path) -> bool:
+    """True if a path (relative to the import dir) lives inside the default catalog directory."""
+    return CATALOG_DIR_NAME in Path(relative_path).parts
+
+
+def file_signature(path: Path) -> Dict[str, int]:
+    """A cheap signature of a file's current content: size and modification time."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def content_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """A hash of a file's full content, for when size and modification time are not enough."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def catalog_name(name: str) -> str:
+    """A name made safe to be one part of a catalog path, like a kind of artifact per construction rule."""
+    # readable slug for humans, plus a digest so distinct names never collide
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", str(name))[-80:]
+    digest = hashlib.sha1(str(name).encode("utf-8")).hexdigest()[:12]
+    return f"{slug}-{digest}"
+
+
+def _entry_path(import_dir: Path, kind: str, file_path: str) -> Path:
+    return get_catalog_dir(import_dir) / kind / f"{catalog_name(file_path)}.json"
+
+
+def read_catalog_entry(import_dir: Path, kind: str, file_path: str, allow_stale: bool = False) -> Optional[Any]:
+    """Read a cached artifact for a file, or None if missing or stale.
+
+    Args:
+        import_dir: the import directory the file is relative to
+        kind: the kind of artifact, for example "column_sketches"
+        file_path: the source file, relative to the import directory
+        allow_stale: return the artifact even if the file has changed since it was cached
+    """
+    entry_path = _entry_path(import_dir, kind, file_path)
+    if not entry_path.exists():
+        return None
+    try:
+        with open(entry_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable catalog entry {entry_path}: {e}")
+        return None
+    if not allow_stale and entry.get("signature") != file_signature(Path(import_dir) / file_path):
+        return None
+    return entry.get("payload")
+
+
+def catalog_entry_exists(import_dir: Path, kind: str, file_path: str) -> bool:
+    """Whether an artifact was cached for a file, fresh or stale, without reading it."""
+    return _entry_path(import_dir, kind, file_path).exists()
+
+
+def write_catalog_entry(import_dir: Path, kind: str, file_path: str, payload: Any) -> None:
+    """Cache an artifact for a file, stamped with the file's current signature.
+
+    Failing to write the catalog is not fatal; the artifact will be recomputed next time.
+    """
+    entry_path = _entry_path(import_dir, kind, file_path)
+    entry = {
+        "path": str(file_path),
+        "signature": file_signature(Path(import_dir) / file_path),
+        "payload": payload,
+    }
+    tmp_path = None
+    try:
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        # a temporary file of its own, so concurrent writers never publish each other's half-written file
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=entry_path.parent, prefix=entry_path.stem,
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        logger.warning(f"Could not write catalog entry {entry_path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def update_catalog_entry(import_dir: Path, kind: str, file_path: str,
+                         update: Callable[[Optional[Any]], Optional[Any]]) -> Optional[Any]:
+    """Read, change and write back an artifact for a file, one update at a time.
+
+    Entries shared by concurrent imports (for example the batch tuning of every rule of a file) are
+    changed this way, so no update is lost. `update` gets the current payload, stale or not (None if
+    missing), and returns the new one, or None to leave the entry as it is.
+
+    Returns:
+        The new payload, or None if the entry was left as it is.
+    """
+    with _update_lock:
+        payload = update(read_catalog_entry(import_dir, kind, file_path, allow_stale=True))
+        if payload is not None:
+            write_catalog_entry(import_dir, kind, file_path, payload)
+        return payload
@@ -0,0 +1,176 @@
+"""A local, streaming preview of how a relationship file joins its node files.
+
+The relationship import matches each row's `from_node_column` value against
+the property of the same name on the from-nodes (and likewise for the
+to-nodes). This module reproduces that join locally as a hash join: the key
+column of each node file is hashed into a set, then the relationship file is
+streamed past both sets.
+
+Memory stays bounded by `max_keys`. Keys are kept by 64-bit hash rather than by
+value, and if a file has more distinct keys than the budget, the join falls
+back to a consistent hash sample: only keys whose hash has its lowest `level`
+bits zero are kept, on both sides of the join, so every sampled key still finds
+its match. Counts are then scaled up by 2**level to estimate the totals.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .column_sketches import hash_value
+from .csv_files import open_csv_rows
+from .json_records import is_json_file, iter_flat_records, value_to_text
+
+DEFAULT_MAX_KEYS = 1_000_000
+MAX_EXAMPLES = 10
+
+
+def iter_column_values(path: Path, columns: List[str]) -> Iterator[Tuple[str, ...]]:
+    """Stream the values of some columns of a CSV or JSON file, as text (empty when missing)."""
+    if is_json_file(path):
+        for record in iter_flat_records(path):
+            yield tuple(value_to_text(record.get(column)) for column in columns)
+        return
+    with open_csv_rows(path) as (header, rows):
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"{path.name} has no column(s) {missing}. Available columns are {header}.")
+        positions = [header.index(column) for column in columns]
+        for row in rows:
+            yield tuple(row[i] if i < len(row) else "" for i in positions)
+
+
+class SampledKeys:
+    """A set of key hashes, thinned by consistent hash sampling to stay within a budget."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, level: int = 0):
+        self.max_keys = max_keys
+        self.level = level
+        self.hashes: Set[int] = set()
+
+    def accepts(self, h: int) -> bool:
+        return h & ((1 << self.level) - 1) == 0
+
+    def raise_level(self, level: int) -> None:
+        while self.level < level:
+            self.level += 1
+            self.hashes = {h for h in self.hashes if self.accepts(h)}
+
+    def add(self, h: int) -> bool:
+        """Add a hash if the sample accepts it. Returns True if it was already present."""
+        if not self.accepts(h):
+            return False
+        if h in self.hashes:
+            return True
+        self.hashes.add(h)
+        while len(self.hashes) > self.max_keys:
+            self.raise_level(self.level + 1)
+        return False
+
+    @property
+    def scale(self) -> int:
+        return 1 << self.level
+
+
+def collect_node_keys(path: Path, key_column: str, max_keys: int = DEFAULT_MAX_KEYS) -> Tuple[SampledKeys, Dict[str, int]]:
+    """Hash the key column of a node file. Returns the keys and counts of rows, empty and duplicate keys."""
+    keys = SampledKeys(max_keys)
+    rows = empty = duplicates = 0
+    for (value,) in iter_column_values(path, [key_column]):
+        rows += 1
+        if not value:
+            empty += 1
+        elif keys.add(hash_value(value)):
+            duplicates += 1
+    return keys, {"rows": rows, "empty_keys": empty, "duplicate_keys": duplicates}
+
+
+class _JoinSide:
+    """Join statistics for one end (from or to) of the relationships."""
+
+    def __init__(self, node_keys: SampledKeys, max_keys: int):
+        self.node_keys = node_keys
+        self.max_keys = max_keys
+        self.rows_per_key: Counter = Counter()
+        self.empty_keys = 0
+        self.orphan_examples: Dict[int, str] = {}
+
+    @property
+    def level(self) -> int:
+        return self.node_keys.level
+
+    def add(self, value: str) -> Optional[int]:
+        """Count a key of a relationship row. Returns its hash, or None for an empty key."""
+        if not value:
+            self.empty_keys += 1
+            return None
+        h = hash_value(value)
+        if not self.node_keys.accepts(h):
+            return h
+        self.rows_per_key[h] += 1
+        if h not in self.node_keys.hashes and len(self.orphan_examples) < MAX_EXAMPLES:
+            self.orphan_examples[h] = value
+        if len(self.rows_per_key) > self.max_keys:
+            self.node_keys.raise_level(self.level + 1)
+            self.rows_per_key = Counter({k: n for k, n in self.rows_per_key.items() if self.node_keys.accepts(k)})
+        return h
+
+    def report(self) -> Dict[str, Any]:
+        scale = self.node_keys.scale
+        matched = {h: n for h, n in self.rows_per_key.items() if h in self.node_keys.hashes}
+        orphans = [h for h in self.rows_per_key if h not in self.node_keys.hashes]
+        sampled_rows = sum(self.rows_per_key.values())
+        matched_rows = sum(matched.values())
+        fan_out = sorted(matched.values())
+        return {
+            "match_rate": round(matched_rows / sampled_rows, 4) if sampled_rows else 0.0,
+            "matched_rows": matched_rows * scale,
+            "empty_keys": self.empty_keys,
+            "orphan_keys": len(orphans) * scale,
+            "orphan_rows": sum(self.rows_per_key[h] for h in orphans) * scale,
+            "orphan_examples": [self.orphan_examples[h] for h in orphans if h in self.orphan_examples],
+            "nodes_linked": len(matched) * scale,
+            "node_coverage": round(len(matched) / len(self.node_keys.hashes), 4) if self.node_keys.hashes else 0.0,
+            "fan_out": {
+                "min": fan_out[0] if fan_out else 0,
+                "mean": round(sum(fan_out) / len(fan_out), 2) if fan_out else 0.0,
+                "p95": fan_out[min(len(fan_out) - 1, int(len(fan_out) * 0.95))] if fan_out else 0,
+                "max": fan_out[-1] if fan_out else 0,
+            },
+        }
+
+
+def preview_join(relationship_file: Path, from_column: str, to_column: str,
+                 from_node_keys: SampledKeys, to_node_keys: SampledKeys,
+                 max_keys: int = DEFAULT_MAX_KEYS) -> Dict[str, Any]:
+    """Stream the relationship file past the node keys of both ends, and report how the rows join.
+
+    Returns:
+        A dictionary with the number of 'rows', the 'relationships' (rows where both ends match, 
+        before MERGE collapses repeated pairs),
+        whether the result is 'estimated' from a sample, and 'from' and 'to' reports with the
+        'match_rate', 'orphan_keys' (with examples), 'node_coverage' and 'fan_out' of each end.
+    """
+    from_side = _JoinSide(from_node_keys, max_keys)
+    to_side = _JoinSide(to_node_keys, max_keys)
+    rows = 0
+    both_keyed = 0
+    both_sampled = 0
+    both_matched = 0
+    for from_value, to_value in iter_column_values(relationship_file, [from_column, to_column]):
+        rows += 1
+        fh = from_side.add(from_value)
+        th = to_side.add(to_value)
+        # the fraction of rows where both ends match, estimated over rows where both keys are sampled
+        if fh is not None and th is not None:
+            both_keyed += 1
+            if from_node_keys.accepts(fh) and to_node_keys.accepts(th):
+                both_sampled += 1
+                both_matched += fh in from_node_keys.hashes and th in to_node_keys.hashes
+
+    return {
+        "rows": rows,
+        "relationships": round(both_keyed * both_matched / both_sampled) if both_sampled else 0,
+        "estimated": from_side.level > 0 or to_side.level > 0,
+        "from": from_side.report(),
+        "to": to_side.report(),
+    }
@@ -0,0 +1,264 @@
+"""Lazy iteration over the records of JSON and JSON Lines files.
+
+JSON Lines files (.jsonl, .ndjson) hold one record per line. A .json file may
+hold a top-level array of records, which is decoded one element at a time from
+a sliding text buffer, or a single object, which is one record. Files are never
+loaded whole into memory (apart from a single huge record).
+
+Records are flattened into columns: nested objects become dotted paths
+("address.city"), while arrays are left as they are.
+"""
+import json
+import random
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .column_sketches import ColumnSketch
+from .compression import content_suffix, open_text
+from .sampling import Sample
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+JSON_SUFFIXES = (".json",) + JSON_LINES_SUFFIXES
+
+_READ_CHUNK = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def is_json_file(path: Path) -> bool:
+    return content_suffix(path) in JSON_SUFFIXES
+
+
+def _iter_json_lines(f) -> Iterator[Any]:
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from None
+
+
+def _iter_json_document(f) -> Iterator[Any]:
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = f.read(_READ_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # most likely a value cut off at the end of the buffer
+                if eof or not fill():
+                    raise
+                continue
+            # a number at the very end of the buffer may continue in the next chunk
+            if end == len(buffer) and not eof and fill():
+                continue
+            pos = end
+            return value
+
+    skip(" \t\r\n")
+    if pos >= len(buffer):
+        return
+    if buffer[pos] != "[":
+        yield decode()
+        return
+
+    pos += 1
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+        if buffer[pos] == "]":
+            return
+        yield decode()
+
+
+def iter_json_records(path: Path) -> Iterator[Any]:
+    """Lazily yield the records of a JSON or JSON Lines file (which may be compressed)."""
+    with open_text(path) as f:
+        if content_suffix(path) in JSON_LINES_SUFFIXES:
+            yield from _iter_json_lines(f)
+        else:
+            yield from _iter_json_document(f)
+
+
+def flatten_record(record: Any, prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested objects into dotted paths. Arrays and scalars are kept as values."""
+    if not isinstance(record, dict):
+        return {prefix or "value": record}
+    flat = {}
+    for key, value in record.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict) and value:
+            flat.update(flatten_record(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def iter_flat_records(path: Path) -> Iterator[Dict[str, Any]]:
+    return (flatten_record(record) for record in iter_json_records(path))
+
+
+def value_to_text(value: Any) -> str:
+    """The text of a field value, for matching and display. Missing and null values are empty."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def to_property_value(value: Any) -> Any:
+    """A value Neo4j can store as a property: scalars and arrays of scalars as they are, anything else as JSON text."""
+    if isinstance(value, list) and all(isinstance(v, (str, int, float, bool)) for v in value):
+        if len({type(v) for v in value}) <= 1:
+            return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def sample_records(records: Iterable[Dict[str, Any]], max_records: int, max_bytes: int,
+                   mode: str = "head", rng: Optional[random.Random] = None) -> Sample:
+    """Sample records as JSON lines, either the first ones ('head') or a uniform random sample ('reservoir')."""
+    if mode == "reservoir":
+        rng = rng or random.Random()
+        reservoir: List[Any] = []
+        for seen, record in enumerate(records):
+            if seen < max_records:
+                reservoir.append((seen, record))
+            else:
+                j = rng.randrange(seen + 1)
+                if j < max_records:
+                    reservoir[j] = (seen, record)
+        # back in file order
+        chosen: Iterable[Dict[str, Any]] = [record for _, record in sorted(reservoir, key=lambda r: r[0])]
+    else:
+        chosen = records
+
+    sample = Sample()
+    remaining = max_bytes
+    for record in chosen:
+        if len(sample.lines) >= max_records:
+            break
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        size = len(line.encode("utf-8"))
+        if size > remaining:
+            sample.budget_exhausted = True
+            break
+        remaining -= size
+        sample.lines.append(line)
+    return sample
+
+
+def _matcher(query: str, match_mode: str, case_sensitive: bool):
+    """A predicate on field text, with the same match modes as arrow_csv."""
+    if match_mode == "regex":
+        pattern = re.compile(query, 0 if case_sensitive else re.IGNORECASE)
+        return lambda text: pattern.search(text) is not None
+    needle = query if case_sensitive else query.lower()
+    fold = (lambda text: text) if case_sensitive else (lambda text: text.lower())
+    if match_mode == "exact":
+        return lambda text: fold(text) == needle
+    if match_mode == "prefix":
+        return lambda text: fold(text).startswith(needle)
+    if match_mode == "substring":
+        return lambda text: needle in fold(text)
+    raise ValueError(f"Unknown match mode '{match_mode}'. Use one of exact, prefix, substring, regex.")
+
+
+def search_records(records: Iterable[Dict[str, Any]], query: str, columns: Optional[List[str]] = None,
+                   match_mode: str = "substring", case_sensitive: bool = False, limit: int = 100) -> Dict[str, Any]:
+    """Find flattened records where any of the given columns (default: all) match the query.
+
+    Returns:
+        A dictionary with up to `limit` matching 'records' (in order) and the 'total_count' of matching records.
+    """
+    matches = _matcher(query, match_mode, case_sensitive)
+    found: List[Dict[str, Any]] = []
+    total_count = 0
+    for record in records:
+        values = (record.get(c) for c in columns) if columns else record.values()
+        if any(matches(value_to_text(value)) for value in values):
+            total_count += 1
+            if len(found) < limit:
+                found.append(record)
+    return {"records": found, "total_count": total_count}
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def profile_records(records: Iterable[Dict[str, Any]], top_k: int = 5) -> Dict[str, Any]:
+    """Profile flattened records in a single pass: per column, how often it is present or empty,
+    the JSON types of its values, and (estimated) distinct values."""
+    record_count = 0
+    present: Counter = Counter()
+    types: Dict[str, Counter] = {}
+    sketches: Dict[str, ColumnSketch] = {}
+    top_values: Dict[str, Counter] = {}
+    for record in records:
+        record_count += 1
+        for name, value in record.items():
+            present[name] += 1
+            types.setdefault(name, Counter())[_json_type(value)] += 1
+            text = value_to_text(value)
+            sketches.setdefault(name, ColumnSketch()).add(text)
+            # bounded, so a key-like column can't grow the counter without limit
+            counter = top_values.setdefault(name, Counter())
+            if text and (text in counter or len(counter) < 1000):
+                counter[text] += 1
+
+    columns = {}
+    for name, sketch in sketches.items():
+        distinct = round(sketch.distinct_count())
+        # exact for small columns, estimated (within the sketch's error) for large ones
+        looks_unique = distinct == record_count if sketch.minhash.is_exact() else sketch.uniqueness() >= 0.99
+        columns[name] = {
+            "present": present[name],
+            "missing": record_count - present[name],
+            "non_empty": sketch.non_empty_count,
+            "types": dict(types[name]),
+            "distinct": distinct,
+            "is_unique": record_count > 0 and sketch.non_empty_count == record_count and looks_unique,
+            "top_values": [{"value": v, "count": c} for v, c in top_values[name].most_common(top_k)],
+        }
+    return {"record_count": record_count, "columns": columns}
@@ -0,0 +1,118 @@
+"""Streaming section parser for markdown documents.
+
+A document is split into sections at its headings (by default, at level 1 and
+2 headings), reading one line at a time. Text before the first split heading,
+including a level 1 title, is the first section. Headings inside fenced code
+blocks are ignored, and horizontal rules that separate sections are dropped.
+
+Sections that look like reviews, for example the product review files
+
+    ## Rating: ★★★★☆ (4/5)
+    Good quality table that looks more expensive than it is. ...
+
+    - @woodworker_amy (Portland)
+
+also get structured fields: 'rating' (and 'rating_scale'), 'author' and 'city'.
+The signature line is removed from the section text.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+RATING_HEADING = re.compile(r"^rating\s*:", re.IGNORECASE)
+RATING_FRACTION = re.compile(r"\(\s*(\d+(?:\.\d+)?)\s*/\s*(\d+)\s*\)")
+SIGNATURE = re.compile(r"^\s*[-–—]\s*@?(?P<author>[\w.\-]+)\s*(?:\((?P<city>[^)]+)\))?\s*$")
+SOURCE_URL = re.compile(r"(?:scraped from|source:)\s*(https?://\S+)", re.IGNORECASE)
+
+
+@dataclass
+class Section:
+    index: int
+    heading: str
+    level: int
+    start_line: int
+    text: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+def _finish(index: int, heading: str, level: int, start_line: int, lines: List[str]) -> Section:
+    # drop separators and surrounding blank lines
+    while lines and (not lines[-1].strip() or RULE.match(lines[-1])):
+        lines.pop()
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    section = Section(index, heading, level, start_line, "\n".join(lines))
+    section.fields, section.text = parse_fields(heading, section.text)
+    return section
+
+
+def iter_sections(lines: Iterable[str], split_level: int = 2) -> Iterator[Section]:
+    """Lazily split markdown lines into sections at headings of split_level or above."""
+    index = 0
+    heading, level, start_line = "", 0, 1
+    body: List[str] = []
+    in_fence = False
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if match and len(match.group(1)) <= split_level:
+            new_level = len(match.group(1))
+            # a title starts the first section, rather than splitting off an empty one
+            if index == 0 and not heading and not any(l.strip() for l in body):
+                heading, level, start_line = match.group(2), new_level, line_number
+                continue
+            yield _finish(index, heading, level, start_line, body)
+            index += 1
+            heading, level, start_line, body = match.group(2), new_level, line_number, []
+            continue
+        body.append(line)
+    if heading or any(l.strip() for l in body):
+        yield _finish(index, heading, level, start_line, body)
+
+
+def _rating(heading: str) -> Dict[str, Any]:
+    fraction = RATING_FRACTION.search(heading)
+    if fraction:
+        return {"rating": float(fraction.group(1)), "rating_scale": int(fraction.group(2))}
+    stars = heading.count("★")
+    if stars:
+        return {"rating": float(stars), "rating_scale": stars + heading.count("☆")}
+    return {}
+
+
+def parse_fields(heading: str, text: str) -> Tuple[Dict[str, Any], str]:
+    """Extract structured fields from a section. Returns (fields, text without any signature line)."""
+    fields: Dict[str, Any] = {}
+    source_url = SOURCE_URL.search(text)
+    if source_url:
+        fields["source_url"] = source_url.group(1)
+
+    if not RATING_HEADING.match(heading):
+        return fields, text
+    fields.update(_rating(heading))
+
+    lines = text.split("\n")
+    for i in range(len(lines) - 1, -1, -1):
+        if not lines[i].strip():
+            continue
+        signature = SIGNATURE.match(lines[i])
+        if signature:
+            fields["author"] = signature.group("author")
+            if signature.group("city"):
+                fields["city"] = signature.group("city").strip()
+            text = "\n".join(lines[:i]).rstrip()
+        break
+    return fields, text
+
+
+def document_title(first_section: Optional[Section]) -> Optional[str]:
+    """The title of a document: the level 1 heading that starts it, if any."""
+    if first_section is not None and first_section.index == 0 and first_section.level == 1:
+        return first_section.heading
+    return None
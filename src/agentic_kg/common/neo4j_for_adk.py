@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re
 import atexit
 import logging
@@ -8,6 +8,7 @@ from neo4j import (
     GraphDatabase,
     Result,
 )
+from neo4j.exceptions import DatabaseUnavailable, ServiceUnavailable
 
 from .config import get_settings
 from .pydantic_neo4j import Neo4jConfig
@@ -40,6 +41,10 @@ def sanitize(cypher_name: str) -> str:
     """Very basic string sanitization when a query param is not possible."""
     return re.sub("[.,-:$()><{}[\]'\"`\s]", '', cypher_name)
 
+def quote_symbol(symbol: str) -> str:
+    """Quote a label, relationship type or property key with backticks, for when it can't be a query parameter."""
+    return "`" + symbol.replace("`", "``") + "`"
+
 def is_symbol(symbol: str) -> bool:
     """Validate that a string is a valid Neo4j symbol (no spaces, not a Cypher keyword).
 
@@ -157,6 +162,53 @@ class Neo4jForADK:
         finally:
             session.close()
 
+    def send_queries(self, queries: List[Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Run several queries in one write transaction, so that either all of them or none are committed.
+
+        The transaction is retried on transient errors, like deadlocks. Returns the records of each query.
+        """
+        def run_all(tx):
+            return [
+                [to_python(record.data()) for record in tx.run(query, parameters or {})]
+                for query, parameters in queries
+            ]
+
+        session = self._driver.session(database=self._neo4j_config.database)
+        try:
+            return tool_success("records", session.execute_write(run_all))
+        except Exception as e:
+            return tool_error(str(e))
+        finally:
+            session.close()
+
+    def check_available(self) -> Dict[str, Any]:
+        """Check whether the database answers queries.
+
+        Returns 'available' False only when the server or the database is down; any other failure,
+        like bad credentials, is an error, since it doesn't tell whether the database is running.
+        """
+        session = self._driver.session(database=self._neo4j_config.database)
+        try:
+            session.run("RETURN 1").consume()
+            return tool_success("available", True)
+        except (ServiceUnavailable, DatabaseUnavailable):
+            return tool_success("available", False)
+        except Exception as e:
+            return tool_error(str(e))
+        finally:
+            session.close()
+
+    def explain_query(self, cypher_query, parameters=None) -> Dict[str, Any]:
+        """Plan a query with EXPLAIN, without running it, returning its plan as a tree of operators."""
+        session = self._driver.session(database=self._neo4j_config.database)
+        try:
+            summary = session.run("EXPLAIN " + cypher_query, parameters or {}).consume()
+            return tool_success("plan", to_python(summary.plan))
+        except Exception as e:
+            return tool_error(str(e))
+        finally:
+            session.close()
+
 # Lazy singleton for the Neo4j client
 _graphdb_singleton: Optional[Neo4jForADK] = None
 
@@ -0,0 +1,84 @@
+"""Bounded, referentially consistent samples of the files of a construction plan.
+
+A dry run of a plan loads a sample of every file instead of all of it. Sampling
+each file on its own would break the graph apart: a relationship row would
+rarely find both of its nodes in the samples of the node files. So node files
+are sampled first, each by a hash of its key (keeping a key is the same
+decision wherever it appears), and the values of every column the plan looks
+those nodes up by are remembered. Relationship rows are then kept only if both
+of their endpoints were sampled, so the sampled graph is a faithful, smaller
+copy of the real one.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .column_sketches import hash_value
+
+RowFilter = Callable[[Iterable[Dict[str, Any]]], Iterator[Dict[str, Any]]]
+
+_HASH_RANGE = 1 << 64
+
+
+class PlanSample:
+    """The sampled rows of the rules of one plan, filtered as the loaders stream them.
+
+    Args:
+        max_rows: the most rows sampled from each file
+        lookups: the (label, column) pairs that relationships look nodes up by
+    """
+
+    def __init__(self, max_rows: int, lookups: Iterable[Tuple[str, str]]):
+        self.max_rows = max_rows
+        self.lookups = set(lookups)
+        self.values: Dict[Tuple[str, str], Set[Any]] = {}
+        self.rows: Dict[str, int] = {}
+        self.pairs: Dict[str, Set[Tuple[Any, Any]]] = {}
+
+    def node_filter(self, key: str, label: str, unique_column_name: str, estimated_rows: Optional[int]) -> RowFilter:
+        """Keep up to max_rows rows of a node file, about evenly spread over it, by the hash of their key."""
+        rate = 1.0 if not estimated_rows else min(1.0, self.max_rows / estimated_rows)
+        columns = [column for (lookup_label, column) in self.lookups if lookup_label == label]
+        columns.append(unique_column_name)
+        for column in columns:
+            self.values.setdefault((label, column), set())
+
+        def sampled(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            self.rows[key] = 0
+            for row in rows:
+                if self.rows[key] >= self.max_rows:
+                    return
+                value = row.get(unique_column_name)
+                if value is None or hash_value(str(value)) >= rate * _HASH_RANGE:
+                    continue
+                self.rows[key] += 1
+                for column in columns:
+                    if column in row:
+                        self.values[(label, column)].add(row[column])
+                yield row
+        return sampled
+
+    def relationship_filter(self, key: str, from_end: Tuple[str, str], to_end: Tuple[str, str]) -> RowFilter:
+        """Keep up to max_rows rows of a relationship file whose sampled endpoints are both sampled.
+
+        An end whose label has no node rule in the plan can't be sampled, so its rows are all kept.
+        """
+        def sampled_end(end: Tuple[str, str], value: Any) -> bool:
+            values = self.values.get(end)
+            return values is None or value in values
+
+        def sampled(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            self.rows[key] = 0
+            self.pairs[key] = set()
+            for row in rows:
+                if self.rows[key] >= self.max_rows:
+                    return
+                from_value, to_value = row.get(from_end[1]), row.get(to_end[1])
+                if from_value is None or to_value is None:
+                    continue
+                if sampled_end(from_end, from_value) and sampled_end(to_end, to_value):
+                    self.rows[key] += 1
+                    self.pairs[key].add((from_value, to_value))
+                    yield row
+        return sampled
+
+    def has_node_rule(self, label: str) -> bool:
+        return any(sampled_label == label for sampled_label, _ in self.values)
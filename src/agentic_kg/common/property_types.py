@@ -0,0 +1,133 @@
+"""Property types of construction rules: inference from column values, and coercion at import time.
+
+CSV values are text. A construction rule may declare a type for each of its
+properties, so that they are stored as numbers, booleans or dates, rather than
+as strings that need casting in every query:
+
+- "int": whole numbers, like `14`
+- "float": decimal numbers, like `3.5` or `1e-3`
+- "currency": amounts with a currency symbol and thousands separators, like `$1,042.73`, stored as a float
+- "bool": `true`/`false` or `yes`/`no`, in any case
+- "date": ISO dates, like `2024-05-31`
+- "string": anything else, stored as it is
+
+Empty values are never stored, whatever their type. A value that doesn't parse
+as its declared type is dropped too, like Cypher's toInteger() returning null.
+"""
+import datetime
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+PROPERTY_TYPES = ("string", "int", "float", "currency", "bool", "date")
+
+# patterns a non-empty value must match to have a type; the order is the order of preference
+TYPE_PATTERNS = {
+    "int": r"^[+-]?\d+$",
+    "float": r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$",
+    "currency": r"^[+-]?\s*[$€£¥]\s*(\d+|\d{1,3}(,\d{3})+)(\.\d+)?$",
+    "bool": r"^(?i:true|false|yes|no)$",
+    "date": r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$",
+}
+_COMPILED = {name: re.compile(pattern) for name, pattern in TYPE_PATTERNS.items()}
+
+CURRENCY_SYMBOLS = "$€£¥"
+TRUE_VALUES = ("true", "yes")
+FALSE_VALUES = ("false", "no")
+
+
+def _value_types(value: Any) -> Optional[List[str]]:
+    """The types a non-empty value could have, in order of preference, or None if it is empty."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return ["bool"]
+    if isinstance(value, int):
+        return ["int", "float"]
+    if isinstance(value, float):
+        return ["float"]
+    if isinstance(value, str):
+        text = value.strip()
+        return [name for name, pattern in _COMPILED.items() if pattern.match(text)]
+    return []
+
+
+def infer_types(records: Iterable[Dict[str, Any]], columns: List[str]) -> Dict[str, str]:
+    """The most specific type that every non-empty value of each column has, in one pass over the records.
+
+    Columns without any values are strings.
+    """
+    candidates: Dict[str, Optional[List[str]]] = {column: None for column in columns}
+    undecided = set(columns)
+    for record in records:
+        for column in list(undecided):
+            types = _value_types(record.get(column))
+            if types is None:
+                continue
+            known = candidates[column]
+            candidates[column] = types if known is None else [t for t in known if t in types]
+            if not candidates[column]:
+                undecided.discard(column)
+        if not undecided:
+            break
+    return {column: types[0] if types else "string" for column, types in candidates.items()}
+
+
+def infer_type(values: Iterable[Any]) -> str:
+    """The most specific type that every non-empty value has ('string' if there are no values)."""
+    return infer_types(({"value": value} for value in values), ["value"])["value"]
+
+
+def coerce_value(value: Any, property_type: str) -> Any:
+    """Convert a value to its declared type. Empty values, and values that don't parse, become None."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if property_type == "string" or not isinstance(value, str):
+        # JSON values are already typed
+        return value
+    text = value.strip()
+    try:
+        if property_type == "int":
+            return int(text)
+        if property_type == "float":
+            return float(text)
+        if property_type == "currency":
+            return float(text.replace(",", "").translate({ord(c): None for c in CURRENCY_SYMBOLS + " "}))
+        if property_type == "bool":
+            lowered = text.lower()
+            return True if lowered in TRUE_VALUES else False if lowered in FALSE_VALUES else None
+        if property_type == "date":
+            return datetime.date.fromisoformat(text)
+    except ValueError:
+        return None
+    return value
+
+
+def cypher_coercion(expression: str, property_type: str) -> str:
+    """A Cypher expression converting a text expression to its declared type, or null if empty or unparsable."""
+    if property_type == "int":
+        converted = f"toInteger({expression})"
+    elif property_type == "float":
+        converted = f"toFloat({expression})"
+    elif property_type == "currency":
+        stripped = f"replace({expression}, ',', '')"
+        for symbol in CURRENCY_SYMBOLS + " ":
+            stripped = f"replace({stripped}, {json.dumps(symbol)}, '')"
+        converted = f"toFloat({stripped})"
+    elif property_type == "bool":
+        converted = (f"CASE toLower(trim({expression})) WHEN 'true' THEN true WHEN 'yes' THEN true "
+                     f"WHEN 'false' THEN false WHEN 'no' THEN false END")
+    elif property_type == "date":
+        # date() fails on malformed text, so only well-formed dates are converted (the pattern has no escapes to quote)
+        converted = f"CASE WHEN trim({expression}) =~ '{TYPE_PATTERNS['date'][1:-1]}' THEN date(trim({expression})) END"
+    else:
+        converted = expression
+    return f"CASE WHEN trim({expression}) = '' THEN null ELSE {converted} END"
+
+
+def check_property_types(property_types: Dict[str, str]) -> Optional[str]:
+    """An error message if any declared type is unknown, otherwise None."""
+    unknown = {column: t for column, t in property_types.items() if t not in PROPERTY_TYPES}
+    if unknown:
+        return f"Unknown property types {unknown}. Use one of {', '.join(PROPERTY_TYPES)}."
+    return None
@@ -0,0 +1,133 @@
+"""Partitions of relationship rows whose transactions can commit concurrently.
+
+MERGE of a relationship locks both of its nodes, so concurrent batches that
+share a node wait on each other's locks, or deadlock. The rows of a
+relationship file are instead split into a grid of cells by a hash of their
+keys: cell (i, j) holds the rows whose from key hashes to partition i and
+whose to key hashes to partition j. Cells that differ in both i and j touch
+disjoint sets of nodes, so the cells of one diagonal of the grid make a round
+whose lanes (one per cell) are written at once, and rounds follow each other.
+
+When both ends have the same label, a node may be at either end, so cell (i, j)
+shares nodes with every cell that has i or j at either end. Rounds then pair
+the partitions like a round-robin tournament: a lane writes cells (i, j) and
+(j, i), and no partition is in two lanes of a round. A last round writes the
+cells (i, i).
+
+A hub node, with many more relationships than the rest (a common supplier),
+would make its cells much larger than the others and hold up their round. The
+rows of hub nodes are held out of the grid, and written last by a serial lane.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .column_sketches import hash_value
+
+MIN_HUB_DEGREE = 100
+
+Cell = Tuple[int, int]
+
+
+def key_hash(value: Any) -> int:
+    """The hash of a key value. Keys are compared as text, like the keys of the nodes they match."""
+    return hash_value(str(value))
+
+
+def endpoint_degrees(rows: Iterable[Dict[str, Any]], from_column: str, to_column: str) -> Dict[str, Any]:
+    """Stream the rows of a relationship file, counting the relationships of every from and to key.
+
+    Returns:
+        A dictionary with the 'rows', the 'keyed_rows' (with both keys), and Counters of the
+        'from' and 'to' key hashes. Memory is bounded by the number of distinct keys.
+    """
+    from_degrees: Counter = Counter()
+    to_degrees: Counter = Counter()
+    rows_count = 0
+    keyed_rows = 0
+    for row in rows:
+        rows_count += 1
+        from_value, to_value = row.get(from_column), row.get(to_column)
+        if from_value is None or to_value is None:
+            continue
+        keyed_rows += 1
+        from_degrees[key_hash(from_value)] += 1
+        to_degrees[key_hash(to_value)] += 1
+    return {"rows": rows_count, "keyed_rows": keyed_rows, "from": from_degrees, "to": to_degrees}
+
+
+def hub_degree(rows: int, partitions: int) -> int:
+    """The degree above which a node is a hub: more relationships than an average cell of the grid holds."""
+    return max(MIN_HUB_DEGREE, rows // (partitions * partitions))
+
+
+def partition_rounds(partitions: int, same_label: bool) -> List[List[List[Cell]]]:
+    """The rounds of a grid of partitions: each round a list of lanes, each lane the cells it writes.
+
+    The lanes of a round never share a partition at the same end (or, for same_label, at either end),
+    and every cell of the grid is in exactly one lane.
+    """
+    if not same_label:
+        return [[[(i, (i + r) % partitions)] for i in range(partitions)] for r in range(partitions)]
+    # the circle method: partition 0 stays put, the others rotate; an odd count gets a bye
+    players: List[Optional[int]] = list(range(partitions)) + ([None] if partitions % 2 else [])
+    rounds: List[List[List[Cell]]] = []
+    for _ in range(len(players) - 1):
+        lanes = []
+        for k in range(len(players) // 2):
+            a, b = players[k], players[len(players) - 1 - k]
+            if a is not None and b is not None:
+                lanes.append([(a, b), (b, a)])
+        rounds.append(lanes)
+        players = [players[0], players[-1], *players[1:-1]]
+    rounds.append([[(i, i)] for i in range(partitions)])
+    return [lanes for lanes in rounds if lanes]
+
+
+class RelationshipPartitions:
+    """The rounds and lanes of a partitioned relationship load, and the cell of each row.
+
+    Args:
+        partitions: the number of partitions of each end, and the most lanes written at once
+        same_label: whether both ends of the relationships have the same label
+        from_hubs: the key hashes of the hub nodes at the from end, whose rows go to the serial lane
+        to_hubs: the key hashes of the hub nodes at the to end
+    """
+
+    def __init__(self, partitions: int, same_label: bool, from_hubs: Set[int], to_hubs: Set[int]):
+        self.partitions = partitions
+        self.same_label = same_label
+        self.from_hubs = from_hubs
+        self.to_hubs = to_hubs
+        self.rounds = partition_rounds(partitions, same_label)
+        self._lanes: Dict[Cell, Tuple[int, int]] = {
+            cell: (r, lane) for r, lanes in enumerate(self.rounds) for lane, cells in enumerate(lanes) for cell in cells
+        }
+
+    @classmethod
+    def from_degrees(cls, degrees: Dict[str, Any], partitions: int, same_label: bool,
+                     min_degree: Optional[int] = None) -> "RelationshipPartitions":
+        """Partitions whose hubs are the keys with more relationships than hub_degree (or min_degree)."""
+        threshold = min_degree or hub_degree(degrees["keyed_rows"], partitions)
+        if same_label:
+            # a node of the label has the relationships of both of its ends
+            hubs = {h for h, degree in (degrees["from"] + degrees["to"]).items() if degree > threshold}
+            return cls(partitions, True, hubs, hubs)
+        from_hubs = {h for h, degree in degrees["from"].items() if degree > threshold}
+        to_hubs = {h for h, degree in degrees["to"].items() if degree > threshold}
+        return cls(partitions, False, from_hubs, to_hubs)
+
+    def cell(self, from_value: Any, to_value: Any) -> Optional[Cell]:
+        """The cell of a row with both keys, or None for a row of a hub node."""
+        from_hash, to_hash = key_hash(from_value), key_hash(to_value)
+        if from_hash in self.from_hubs or to_hash in self.to_hubs:
+            return None
+        return from_hash % self.partitions, to_hash % self.partitions
+
+    def lane(self, cell: Cell) -> Tuple[int, int]:
+        """The round and lane that write a cell."""
+        return self._lanes[cell]
+
+    @property
+    def hub_count(self) -> int:
+        # hubs at the two ends of different labels are different nodes
+        return len(self.from_hubs) if self.same_label else len(self.from_hubs) + len(self.to_hubs)
@@ -0,0 +1,81 @@
+"""Row-level deltas between two versions of a source file.
+
+A delta import remembers a fingerprint of every row it loaded, keyed by the
+row's identity: the unique column of a node rule, or the (from, to) columns of
+a relationship rule. The next version of the file is streamed past those
+fingerprints, and only rows that are new (inserts) or whose values changed
+(updates) are passed on. Keys that no longer appear are the deletes.
+
+Keys are stored as JSON lists of their values, so they can be decoded back into
+values to delete by, and fingerprints as short hashes of the row's values.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+def row_key(row: Dict[str, Any], key_columns: List[str]) -> Optional[str]:
+    """The identity of a row, or None if any key column is empty."""
+    values = [row.get(column) for column in key_columns]
+    if any(value is None for value in values):
+        return None
+    return json.dumps(values, ensure_ascii=False)
+
+
+def row_fingerprint(row: Dict[str, Any], columns: List[str]) -> str:
+    """A short hash of the values of a row."""
+    text = json.dumps([row.get(column) for column in columns], ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class DeltaScan:
+    """Streams the rows of a new file version, passing on only inserted and updated rows.
+
+    Args:
+        previous: the fingerprints of the last version, by row key
+        key_columns: the columns that identify a row
+        columns: the columns whose values are fingerprinted
+        reload: pass on every row (for example when the columns of the rule changed), while still
+                counting inserts and deletes against the previous keys
+        track_inserts: also remember the keys of the inserted rows
+    """
+
+    def __init__(self, previous: Dict[str, str], key_columns: List[str], columns: List[str], reload: bool = False,
+                 track_inserts: bool = False):
+        self.previous = previous
+        self.key_columns = key_columns
+        self.columns = columns
+        self.reload = reload
+        self.fingerprints: Dict[str, str] = {}
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.inserted_keys: Optional[List[List[Any]]] = [] if track_inserts else None
+
+    def changed_rows(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            key = row_key(row, self.key_columns)
+            if key is None:
+                # passed on so the loader counts it as skipped
+                yield row
+                continue
+            fingerprint = row_fingerprint(row, self.columns)
+            self.fingerprints[key] = fingerprint
+            before = self.previous.get(key)
+            if before is None:
+                self.inserted += 1
+                if self.inserted_keys is not None:
+                    self.inserted_keys.append(json.loads(key))
+            elif before != fingerprint or self.reload:
+                self.updated += 1
+            else:
+                self.unchanged += 1
+                continue
+            yield row
+
+    def deleted_keys(self) -> List[List[Any]]:
+        """The key values of rows in the previous version that are gone. Only complete after the scan."""
+        return [json.loads(key) for key in self.previous if key not in self.fingerprints]
+
+    def counts(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "unchanged": self.unchanged}
@@ -0,0 +1,176 @@
+"""Representative line sampling of text files under a hard byte budget.
+
+Sampling modes:
+- head: the first lines of the file
+- reservoir: a uniform random sample of lines, in a single streaming pass
+- random: lines found by seeking to random byte offsets, which never reads the whole file
+
+All modes can keep the first line (the header of a CSV file), return lines in
+file order, cut overly long lines short, and stop adding lines once the byte
+budget is spent.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import BinaryIO, List, Optional, Tuple
+
+SAMPLING_MODES = ("head", "reservoir", "random")
+
+MAX_LINE_BYTES = 4096
+
+_READ_CHUNK = 64 * 1024
+
+
+@dataclass
+class Sample:
+    lines: List[str] = field(default_factory=list)
+    truncated_lines: int = 0
+    budget_exhausted: bool = False
+
+    @property
+    def content(self) -> str:
+        return "".join(self.lines)
+
+
+def _read_line(f: BinaryIO, max_line_bytes: int) -> Tuple[Optional[bytes], bool]:
+    """Read the next line, keeping at most max_line_bytes of it. Returns (line or None at EOF, was cut short)."""
+    line = f.readline(max_line_bytes)
+    if not line:
+        return None, False
+    if line.endswith(b"\n") or len(line) < max_line_bytes:
+        return line, False
+    # skip the rest of an overly long line without holding it in memory
+    while True:
+        rest = f.readline(_READ_CHUNK)
+        if not rest or rest.endswith(b"\n"):
+            break
+    return line + b"\n", True
+
+
+def _decode(line: bytes, cut_short: bool) -> str:
+    text = line.decode("utf-8", errors="replace")
+    if cut_short:
+        return text.rstrip("\n") + " ...[line truncated]\n"
+    return text
+
+
+class _Budget:
+    def __init__(self, sample: Sample, max_lines: int, max_bytes: int):
+        self.sample = sample
+        self.max_lines = max_lines
+        self.remaining_bytes = max_bytes
+
+    def add(self, line: bytes, cut_short: bool) -> bool:
+        """Add a line if it fits the budget. Returns False once the budget is exhausted."""
+        if len(self.sample.lines) >= self.max_lines:
+            return False
+        if len(line) > self.remaining_bytes:
+            self.sample.budget_exhausted = True
+            return False
+        self.remaining_bytes -= len(line)
+        self.sample.lines.append(_decode(line, cut_short))
+        if cut_short:
+            self.sample.truncated_lines += 1
+        return True
+
+
+def _add_in_file_order(budget: _Budget, picked: List[Tuple[int, bytes, bool]], rng: random.Random) -> None:
+    """Add sampled (position, line, cut short) lines in file order.
+
+    The byte budget is spent on the lines in random order, so that a tight budget keeps lines from
+    across the file rather than the earliest of them.
+    """
+    picked = list(picked)
+    rng.shuffle(picked)
+    room = budget.max_lines - len(budget.sample.lines)
+    remaining = budget.remaining_bytes
+    kept = []
+    for position, line, cut_short in picked:
+        if len(kept) >= room:
+            break
+        if len(line) > remaining:
+            budget.sample.budget_exhausted = True
+            break
+        remaining -= len(line)
+        kept.append((position, line, cut_short))
+    for _, line, cut_short in sorted(kept):
+        budget.add(line, cut_short)
+
+
+def _add_header(f: BinaryIO, budget: _Budget, keep_header: bool, max_line_bytes: int) -> None:
+    if keep_header:
+        header, cut_short = _read_line(f, max_line_bytes)
+        if header is not None:
+            budget.add(header, cut_short)
+
+
+def sample_head(f: BinaryIO, max_lines: int, max_bytes: int, max_line_bytes: int = MAX_LINE_BYTES) -> Sample:
+    """The first lines of a file."""
+    sample = Sample()
+    budget = _Budget(sample, max_lines, max_bytes)
+    while True:
+        line, cut_short = _read_line(f, max_line_bytes)
+        if line is None or not budget.add(line, cut_short):
+            return sample
+
+
+def sample_reservoir(f: BinaryIO, max_lines: int, max_bytes: int, keep_header: bool = True,
+                     max_line_bytes: int = MAX_LINE_BYTES, rng: Optional[random.Random] = None) -> Sample:
+    """A uniform random sample of lines (after the header), chosen in a single pass."""
+    rng = rng or random.Random()
+    sample = Sample()
+    budget = _Budget(sample, max_lines, max_bytes)
+    _add_header(f, budget, keep_header, max_line_bytes)
+
+    k = max_lines - len(sample.lines)
+    reservoir: List[Tuple[int, bytes, bool]] = []
+    seen = 0
+    while k > 0:
+        line, cut_short = _read_line(f, max_line_bytes)
+        if line is None:
+            break
+        if seen < k:
+            reservoir.append((seen, line, cut_short))
+        else:
+            j = rng.randrange(seen + 1)
+            if j < k:
+                reservoir[j] = (seen, line, cut_short)
+        seen += 1
+
+    _add_in_file_order(budget, reservoir, rng)
+    return sample
+
+
+def sample_random_offsets(f: BinaryIO, max_lines: int, max_bytes: int, keep_header: bool = True,
+                          max_line_bytes: int = MAX_LINE_BYTES, rng: Optional[random.Random] = None) -> Sample:
+    """Random lines found by seeking to random byte offsets, for files too large to read through.
+
+    Longer lines are somewhat more likely to be picked, which is fine for getting a feel of the data.
+    """
+    rng = rng or random.Random()
+    sample = Sample()
+    budget = _Budget(sample, max_lines, max_bytes)
+    _add_header(f, budget, keep_header, max_line_bytes)
+    body_start = f.tell()
+    size = f.seek(0, 2)
+    if size <= body_start:
+        return sample
+
+    k = max_lines - len(sample.lines)
+    picked = {}
+    for offset in (rng.randrange(body_start, size) for _ in range(k * 2)):
+        if len(picked) >= k:
+            break
+        if offset > body_start:
+            f.seek(offset - 1)
+            _read_line(f, max_line_bytes)  # move to the start of the next full line
+        else:
+            f.seek(offset)
+        line_start = f.tell()
+        if line_start in picked:
+            continue
+        line, cut_short = _read_line(f, max_line_bytes)
+        if line is not None:
+            picked[line_start] = (line, cut_short)
+
+    _add_in_file_order(budget, [(line_start, *line) for line_start, line in picked.items()], rng)
+    return sample
@@ -0,0 +1,120 @@
+"""A trigram index for fast, repeated case-insensitive substring search over text files.
+
+For each file, the index records the byte offset of every line and, for every
+trigram of the lower-cased text, the lines that contain it. A query is answered
+by intersecting the posting lists of its trigrams, then verifying only those
+candidate lines against the file. Indexes are cached in the file catalog and
+rebuilt only when their source file changes. The last few indexes loaded are
+also kept in memory, so repeated searches of a file don't parse its posting
+lists again.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .compression import is_compressed
+from .file_catalog import file_signature, read_catalog_entry, write_catalog_entry
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX = "search_index"
+
+# larger files are searched with a plain scan rather than indexed; an index holds
+# every line number of every trigram, several times the size of the file in memory
+MAX_INDEXED_FILE_SIZE = 32 * 1024 * 1024
+
+# indexes kept in memory, by path, with the signature of the file they were built from
+MAX_LOADED_INDEXES = 8
+_loaded: "OrderedDict[str, Tuple[Dict[str, int], TrigramIndex]]" = OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Line offsets plus trigram posting lists (of 0-based line numbers) for one file."""
+
+    def __init__(self, line_offsets: List[int], postings: Dict[str, List[int]]):
+        self.line_offsets = line_offsets
+        self.postings = postings
+
+    @classmethod
+    def build(cls, path: Path) -> "TrigramIndex":
+        line_offsets = []
+        postings: Dict[str, List[int]] = {}
+        offset = 0
+        with open(path, "rb") as f:
+            for line_number, raw_line in enumerate(f):
+                line_offsets.append(offset)
+                offset += len(raw_line)
+                for gram in trigrams(raw_line.decode("utf-8").lower()):
+                    postings.setdefault(gram, []).append(line_number)
+        return cls(line_offsets, postings)
+
+    def candidate_lines(self, query: str) -> Optional[List[int]]:
+        """Lines that may contain the query, or None if the query is too short to use the index."""
+        grams = trigrams(query.lower())
+        if not grams:
+            return None
+        posting_lists = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+        candidates = set(posting_lists[0])
+        for posting_list in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting_list)
+        return sorted(candidates)
+
+    def to_dict(self) -> dict:
+        return {"line_offsets": self.line_offsets, "postings": self.postings}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TrigramIndex":
+        return cls(data["line_offsets"], data["postings"])
+
+
+def get_search_index(import_dir: Path, file_path: str) -> Optional[TrigramIndex]:
+    """Get the index for a file, building and caching it if the file changed since it was last indexed.
+
+    Returns None for files too large to index, and for compressed files, which cannot be read at line offsets.
+    """
+    path = Path(import_dir) / file_path
+    if is_compressed(path) or path.stat().st_size > MAX_INDEXED_FILE_SIZE:
+        return None
+    key = str(path.resolve())
+    signature = file_signature(path)
+    with _loaded_lock:
+        loaded = _loaded.get(key)
+        if loaded is not None and loaded[0] == signature:
+            _loaded.move_to_end(key)
+            return loaded[1]
+    cached = read_catalog_entry(import_dir, SEARCH_INDEX, file_path)
+    if cached is not None:
+        index = TrigramIndex.from_dict(cached)
+    else:
+        logger.debug(f"Building search index for {file_path}")
+        index = TrigramIndex.build(path)
+        write_catalog_entry(import_dir, SEARCH_INDEX, file_path, index.to_dict())
+    with _loaded_lock:
+        _loaded[key] = (signature, index)
+        _loaded.move_to_end(key)
+        while len(_loaded) > MAX_LOADED_INDEXES:
+            _loaded.popitem(last=False)
+    return index
+
+
+def verified_matches(path: Path, index: TrigramIndex, query: str) -> Iterator[Tuple[int, str]]:
+    """Yield (1-based line number, line) for candidate lines which really contain the query."""
+    candidates = index.candidate_lines(query)
+    if candidates is None:
+        raise ValueError("query is too short to use the search index")
+    search_query = query.lower()
+    with open(path, "rb") as f:
+        for line_number in candidates:
+            f.seek(index.line_offsets[line_number])
+            line = f.readline().decode("utf-8")
+            if search_query in line.lower():
+                yield line_number + 1, line
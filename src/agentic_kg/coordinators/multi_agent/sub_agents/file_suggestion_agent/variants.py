@@ -8,7 +8,7 @@ These instructions guide the agent's behavior, workflow, and tool usage.
 from agentic_kg.tools.user_goal_tools import get_approved_user_goal
 
 from agentic_kg.tools.file_tools import (
-    list_import_files, sample_file, search_file,
+    list_import_files, sample_file, sample_files, search_file, search_files, search_import_dir,
     set_suggested_files, approve_suggested_files, get_suggested_files
 )
 
@@ -25,9 +25,12 @@ variants = {
                 Review the file list for relevance to the kind of graph and description specified in the approved user goal. 
 
                 For any file that you're not sure about, use the 'sample_file' tool to get 
-                a better understanding of the file contents. 
+                a better understanding of the file contents. When several files need a look,
+                sample them together with the 'sample_files' tool rather than one by one. 
+                To find which files mention a term, use the 'search_import_dir' or 'search_files' tool.
 
                 Only consider structured data files like CSV or JSON.
+                Compressed files (listed in 'compressed_files', like 'orders.csv.gz') count as the format of their content.
 
                 Prepare for the task:
                 - use the 'get_approved_user_goal' tool to get the approved user goal
@@ -44,7 +47,8 @@ variants = {
                 """,
             "tools": [
                 get_approved_user_goal, 
-                list_import_files, sample_file, search_file,
+                list_import_files, sample_file, sample_files, 
+                search_file, search_files, search_import_dir,
                 set_suggested_files, approve_suggested_files, 
                 get_suggested_files,
                 finished
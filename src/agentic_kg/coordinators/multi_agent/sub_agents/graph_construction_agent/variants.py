@@ -15,8 +15,11 @@ from agentic_kg.tools.cypher_tools import (
     read_neo4j_cypher, write_neo4j_cypher, create_uniqueness_constraint, 
     get_physical_schema,
 )
-from agentic_kg.tools.file_tools import get_approved_files
-from agentic_kg.tools.kg_construction_tools import build_graph_from_construction_rules
+from agentic_kg.tools.file_tools import get_approved_files, import_markdown_files
+from agentic_kg.tools.kg_construction_tools import (
+    build_graph_from_construction_rules, dry_run_graph_construction, estimate_graph_construction, get_construction_progress,
+    prepare_bulk_import, run_bulk_import,
+)
 from agentic_kg.tools.adk_tools import finished
 
 variants = {
@@ -33,19 +36,39 @@ variants = {
 
         Follow these steps to construct a knowledge graph:
         1. check that the construction rules are valid by comparing the construction plan with the approved files and schema
-        2. create appropriate constraints for every node construction using the 'create_uniqueness_constraint' tool
-        3. use the 'build_graph_from_construction_rules' tool to build the graph
-        4. verify that the graph has been built by comparing the physical schema with the approved schema using the 'read_neo4j_cypher' tool
-        5. verify that the graph is reasonable by proposing a hypothetical question that reflects the user goal. try to answer it using the 'read_neo4j_cypher' tool
-        6. summarize the state of the graph and your post-construction analysis to the user
-        7. invite the user to try some questions that you'll answer using the 'read_neo4j_cypher' tool
-        8. when the user is satisfied, use the 'finished' tool to signal that this phase of graph construction is complete
+        2. the 'build_graph_from_construction_rules' tool creates the constraints and indexes the construction rules need.
+           only use the 'create_uniqueness_constraint' tool for additional constraints
+        3. before building, use the 'estimate_graph_construction' tool. tell the user the estimated time, and report its warnings
+           (label scans, eager plans). if the build would take more than an hour, or a rule's import is flagged, ask the user
+           whether to build anyway or to revise the construction plan first.
+           to check that the rules make a connected graph without a full build, use the 'dry_run_graph_construction' tool,
+           which builds a small sample and removes it again. report rules with unmatched pairs or isolated nodes
+           for a first build of a large graph into a new, empty database, offer the bulk importer instead: use the
+           'prepare_bulk_import' tool and show the user its command. only if the user confirms and has stopped the database,
+           use the 'run_bulk_import' tool (with overwrite=True only if the user agrees to replace the existing database).
+           after the database is started again, the user runs the 'schema_statements' (schema.cypher); then continue with step 5
+        4. use the 'build_graph_from_construction_rules' tool to build the graph. check its 'failed_rules' and report any failures to the user.
+           also report the rules with 'duplicates': files that repeat keys, and how their rows were collapsed.
+           when refreshing a graph after its files were updated, use delta=True to only write changed rows,
+           and delete_missing=True only if the user wants removed rows deleted from the graph.
+           if a build failed part way, fix the cause and build again with resume=True to continue where it stopped.
+           if the build is expected to take more than a few minutes, build with background=True: the tool returns at once,
+           and the 'get_construction_progress' tool reports how the build is going, and its result once it is done.
+           if the user asks how a build is going, use the 'get_construction_progress' tool
+           approved markdown or text files (like product reviews) are not covered by construction rules.
+           import them with the 'import_markdown_files' tool, giving their directory or a glob pattern, and a label for the documents
+        5. verify that the graph has been built by comparing the physical schema with the approved schema using the 'read_neo4j_cypher' tool
+        6. verify that the graph is reasonable by proposing a hypothetical question that reflects the user goal. try to answer it using the 'read_neo4j_cypher' tool
+        7. summarize the state of the graph and your post-construction analysis to the user
+        8. invite the user to try some questions that you'll answer using the 'read_neo4j_cypher' tool
+        9. when the user is satisfied, use the 'finished' tool to signal that this phase of graph construction is complete
 
         """,
         "tools": [
             get_approved_user_goal, get_approved_files, get_approved_construction_plan,
-            create_uniqueness_constraint, build_graph_from_construction_rules,
-            get_physical_schema, read_neo4j_cypher, 
+            create_uniqueness_constraint, estimate_graph_construction, dry_run_graph_construction,
+            build_graph_from_construction_rules, get_construction_progress, prepare_bulk_import, run_bulk_import,
+            import_markdown_files, get_physical_schema, read_neo4j_cypher, 
             finished
         ]
     },
@@ -11,13 +11,16 @@ from agentic_kg.tools.user_goal_tools import (
     get_approved_user_goal
  )
 from agentic_kg.tools.file_tools import (
-    get_approved_files, sample_file, search_file,
+    get_approved_files, sample_file, sample_files, search_file, search_files,
+    cache_approved_files, profile_csv_file, profile_json_file, search_json_file,
  )
 from agentic_kg.tools.construction_plan_tools import (
     propose_node_construction, propose_relationship_construction,
     remove_node_construction, remove_relationship_construction,
-    get_proposed_construction_plan,
+    get_proposed_construction_plan, preview_relationship_join, set_construction_loader,
+    set_construction_batching, set_property_types, set_duplicate_keys,
 )
+from agentic_kg.tools.foreign_key_tools import discover_foreign_keys
 
 from agentic_kg.tools.adk_tools import finished
 
@@ -40,7 +43,10 @@ variants = {
             identifiers found within the file.
 
             Because unique identifiers are so important for determining the structure of the graph,
-            always verify the uniqueness of suspected unique identifiers using the 'search_file' tool.
+            always verify the uniqueness of suspected unique identifiers using the 'profile_csv_file' tool 
+            (see 'is_unique' and 'distinct') or the 'search_file' tool.
+            For JSON files, use the 'profile_json_file' and 'search_json_file' tools; nested fields are
+            flattened into dotted column names like 'address.city', which can be used as columns in rules.
 
             General guidance for identifying a node or a relationship:
             - If the file name is singular and has only 1 unique identifier it is likely a node
@@ -71,22 +77,43 @@ variants = {
             Prepare for the task:
             - get the user goal using the 'get_approved_user_goal' tool
             - get the list of approved files using the 'get_approved_files' tool
+            - prepare the approved files for fast analysis using the 'cache_approved_files' tool
             - get the current construction plan using the 'get_proposed_construction_plan' tool
+            - get a ranked list of likely foreign-key links between the approved files using the 'discover_foreign_keys' tool
+
+            Treat the discovered foreign-key candidates as a starting point for relationships, 
+            not as final answers. A high containment score means the values of the 'from' column
+            are (almost) all found in the key column of the 'to' file.
 
             Think carefully, using tools to perform actions and reconsidering your actions when a tool returns an error:
-            1. For each approved file, consider whether it represents a node or relationship. Check the content for potential unique identifiers using the 'sample_file' tool.
-            2. For each identifier, verify that it is unique by using the 'search_file' tool.
+            1. For each approved file, consider whether it represents a node or relationship. Check the content for potential unique identifiers using the 'sample_file' tool, or the 'sample_files' tool to sample several files at once.
+            2. For each identifier, verify that it is unique by using the 'profile_csv_file' tool (or 'profile_json_file' for JSON files) or the 'search_file' tool.
             3. Use the node vs relationship guidance for deciding whether the file represents a node or a relationship.
             4. For a node file, propose a node construction using the 'propose_node_construction' tool. 
             5. If the node contains a reference relationship, use the 'propose_relationship_construction' tool to propose a relationship construction. 
             6. For a relationship file, propose a relationship construction using the 'propose_relationship_construction' tool
-            7. If you need to remove a construction, use the 'remove_node_construction' or 'remove_relationship_construction' tool
-            8. When you are done with construction proposals, use the 'get_proposed_construction_plan' tool to present the plan to the user
+            7. After proposing a relationship construction, check how its rows will join the node files using the 'preview_relationship_join' tool. 
+               Reconsider the rule if it has warnings, for example a low match rate.
+            8. If you need to remove a construction, use the 'remove_node_construction' or 'remove_relationship_construction' tool
+            9. By default, CSV files in the import directory are loaded by Neo4j with LOAD CSV and other files are streamed by the client.
+               If the user asks for a different loader for a rule, use the 'set_construction_loader' tool
+               For large relationship files, the 'partitioned' loader writes several transactions at once without deadlocks;
+               set how many with the 'concurrency' of the 'set_construction_batching' tool
+               If the user asks for different transaction batching for a rule (batch size, adaptive batch sizes, concurrent transactions
+               or an error mode), use the 'set_construction_batching' tool
+               Property types (int, float, currency, bool, date or string) are inferred when a rule is proposed. If the user
+               asks for a different type for a property, or an inferred type is wrong, use the 'set_property_types' tool
+               Rows that repeat a key are collapsed into one, keeping the last row's values. If the first row should win,
+               or repeated values should be kept as lists (for example several categories of a product), use the 'set_duplicate_keys' tool
+            10. When you are done with construction proposals, use the 'get_proposed_construction_plan' tool to present the plan to the user
         """,
         "tools": [
             get_approved_user_goal, get_approved_files, get_proposed_construction_plan,
-            sample_file, search_file,
+            cache_approved_files, profile_csv_file, profile_json_file, search_json_file,
+            sample_file, sample_files, search_file, search_files, discover_foreign_keys,
             propose_node_construction, propose_relationship_construction, remove_node_construction, remove_relationship_construction,
+            preview_relationship_join, set_construction_loader, set_construction_batching, set_property_types,
+            set_duplicate_keys,
         ]
     },
     "schema_critic_agent_v1":
@@ -96,9 +123,10 @@ variants = {
             Criticize the proposed schema for relevance to the user goal and approved files.
 
             Criticize the proposed schema for relevance and correctness:
-            - Are unique identifiers actually unique? Use the 'search_file' tool to validate. Composite identifier are not acceptable.
+            - Are unique identifiers actually unique? Use the 'profile_csv_file' or 'search_file' tool to validate. Composite identifier are not acceptable.
             - Could any nodes be relationships instead? Double-check that unique identifiers are unique and not references to other nodes. Use the 'search_file' tool to validate
             - Can you manually trace through the source data to find the necessary information for anwering a hypothetical question?
+            - Will relationships actually connect nodes? Use the 'preview_relationship_join' tool to check the match rate of each relationship construction.
             - Is every node in the schema connected? What relationships could be missing? Every node should connect to at least one other node.
             - Are hierarchical container relationships missing? 
             - Are any relationships redundant? A relationship between two nodes is redundant if it is semantically equivalent to or the inverse of another relationship between those two nodes.
@@ -107,7 +135,7 @@ variants = {
             - get the user goal using the 'get_approved_user_goal' tool
             - get the list of approved files using the 'get_approved_files' tool
             - get the construction plan using the 'get_proposed_construction_plan' tool
-            - use the 'sample_file' and 'search_file' tools to validate the schema design
+            - use the 'sample_file' and 'search_file' tools (or 'sample_files' and 'search_files' for several files at once) to validate the schema design
 
             Think carefully, using tools to perform actions and reconsidering your actions when a tool returns an error:
             1. Analyze each construction rule in the proposed construction plan.
@@ -117,8 +145,8 @@ variants = {
         """,
         "tools": [
             get_approved_user_goal, get_approved_files,
-            get_proposed_construction_plan,
-            sample_file, search_file,
+            get_proposed_construction_plan, profile_csv_file, profile_json_file, search_json_file,
+            sample_file, sample_files, search_file, search_files, preview_relationship_join,
         ]
     }
 }
\ No newline at end of file
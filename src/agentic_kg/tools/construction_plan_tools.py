@@ -1,16 +1,39 @@
+from pathlib import Path
+
 from google.adk.tools import ToolContext
 from typing import Dict, Any
 
+from agentic_kg.common.join_preview import DEFAULT_MAX_KEYS, collect_node_keys, preview_join
+from agentic_kg.common.json_records import is_json_file, iter_flat_records
+from agentic_kg.common.property_types import check_property_types, infer_types
 from agentic_kg.common.neo4j_for_adk import get_graphdb
 from agentic_kg.common.tool_result import tool_success, tool_error
 
 graphdb = get_graphdb()
 
-from .file_tools import search_file
+from .cypher_tools import get_neo4j_import_dir
+from .file_tools import profile_csv_in_import_dir, search_file
+from .kg_construction_tools import ADAPTIVE_BATCH_SIZE, DUPLICATE_KEYS, check_batching, check_duplicates, check_loader
 
 PROPOSED_CONSTRUCTION_PLAN = "proposed_construction_plan"
 APPROVED_CONSTRUCTION_PLAN = "approved_construction_plan"
 
+def infer_property_types(approved_file: str, properties: list[str]) -> Dict[str, str]:
+    """The types of some columns of a file, from profiling it. Empty if the file can't be profiled."""
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error" or not properties:
+        return {}
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    if is_json_file(approved_file):
+        try:
+            return infer_types(iter_flat_records(import_dir / approved_file), properties)
+        except Exception:
+            return {}
+    profile_result = profile_csv_in_import_dir(import_dir, approved_file, properties)
+    if profile_result["status"] == "error":
+        return {}
+    return {column: statistics["type"] for column, statistics in profile_result["profile"]["columns"].items()}
+
 #  Tool: Propose Node Construction
 
 NODE_CONSTRUCTION = "node_construction"
@@ -26,6 +49,8 @@ def propose_node_construction(approved_file: str, proposed_label: str, unique_co
     - label: the proposed label of the node
     - unique_column_name: the name of the column that will be used to uniquely identify constructed nodes
     - properties: A list of property names for the node, derived from column names in the approved file
+    - property_types: The type of each property, inferred from the values of its column:
+      "int", "float", "currency", "bool", "date" or "string"
 
     Args:
         approved_file: The approved file to propose a node construction for
@@ -53,7 +78,9 @@ def propose_node_construction(approved_file: str, proposed_label: str, unique_co
         "source_file": approved_file,
         "label": proposed_label,
         "unique_column_name": unique_column_name,
-        "properties": proposed_properties
+        "properties": proposed_properties,
+        # the key stays text, so relationships match it as it appears in their files
+        "property_types": infer_property_types(approved_file, [p for p in proposed_properties if p != unique_column_name])
     }   
     construction_plan[proposed_label] = node_construction_rule
     tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
@@ -132,7 +159,10 @@ def propose_relationship_construction(approved_file: str, proposed_relationship_
         "from_node_column": from_node_column,
         "to_node_label": to_node_label,
         "to_node_column": to_node_column,
-        "properties": proposed_properties
+        "properties": proposed_properties,
+        "property_types": infer_property_types(
+            approved_file, [p for p in proposed_properties if p not in (from_node_column, to_node_column)]
+        )
     }   
     construction_plan[proposed_relationship_type] = relationship_construction_rule
     tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
@@ -164,6 +194,239 @@ def remove_relationship_construction(relationship_type: str, tool_context:ToolCo
     return tool_success("relationship_construction_removed", relationship_type) 
 
 
+# Tool: Set the loader of a construction rule
+
+def set_construction_loader(construction_key: str, loader: str, tool_context: ToolContext) -> dict:
+    """Choose how the rows of a construction rule are loaded into the graph.
+
+    - "load_csv": Neo4j reads the CSV file itself with LOAD CSV. The file must be in the Neo4j import directory.
+    - "client": the rows are streamed by the client and sent in batches. Works for CSV and JSON files anywhere
+      the agent can read, including absolute paths.
+    - "partitioned": like "client", for relationship rules only, but writing several transactions at once. Rows are
+      split by their node keys so concurrent transactions never lock the same node; rows of hub nodes (a node with
+      far more relationships than the rest) are written last, one transaction at a time.
+
+    Rules without a loader use LOAD CSV for CSV files in the import directory, and the client otherwise.
+
+    Args:
+        construction_key: The key of the rule in the proposed construction plan (a node label or relationship type)
+        loader: Either "load_csv", "client" or "partitioned"
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'construction_rule' key with the updated rule
+                If 'error', includes an 'error_message' key.
+    """
+    construction_plan = tool_context.state.get(PROPOSED_CONSTRUCTION_PLAN, {})
+    if construction_key not in construction_plan:
+        return tool_error(f"{construction_key} is not in the proposed construction plan.")
+    rule = construction_plan[construction_key]
+    loader_error = check_loader({**rule, "loader": loader})
+    if loader_error:
+        return loader_error
+    rule["loader"] = loader
+    tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
+    return tool_success("construction_rule", rule)
+
+
+# Tool: Set the property types of a construction rule
+
+def set_property_types(construction_key: str, property_types: Dict[str, str], tool_context: ToolContext) -> dict:
+    """Override the types of properties of a construction rule, which are inferred when the rule is proposed.
+
+    Values are converted to their property's type when imported, and values that are empty (or don't
+    fit the type) are not written at all. Key columns are always imported as text.
+
+    Args:
+        construction_key: The key of the rule in the proposed construction plan (a node label or relationship type)
+        property_types: The type of each property to change, one of "int", "float", "currency"
+                        (amounts like "$1,042.73", stored as numbers), "bool" (true/false, yes/no), "date"
+                        (ISO dates like 2024-05-31) or "string"
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'construction_rule' key with the updated rule
+                If 'error', includes an 'error_message' key.
+    """
+    construction_plan = tool_context.state.get(PROPOSED_CONSTRUCTION_PLAN, {})
+    if construction_key not in construction_plan:
+        return tool_error(f"{construction_key} is not in the proposed construction plan.")
+    rule = construction_plan[construction_key]
+    unknown = [column for column in property_types if column not in rule["properties"]]
+    if unknown:
+        return tool_error(f"{unknown} are not properties of {construction_key}. Its properties are {rule['properties']}.")
+    type_error = check_property_types(property_types)
+    if type_error:
+        return tool_error(type_error)
+    rule["property_types"] = {**rule.get("property_types", {}), **property_types}
+    tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
+    return tool_success("construction_rule", rule)
+
+
+# Tool: Set how a construction rule collapses duplicate keys
+
+def set_duplicate_keys(construction_key: str, policy: str, tool_context: ToolContext) -> dict:
+    """Choose how a construction rule imports rows that repeat a key: a node rule's unique column,
+    or a relationship rule's pair of from and to columns.
+
+    Before a rule is imported, its file is checked for repeated keys, and their rows are collapsed into one:
+    - "last": the values of the last row of each key (the default, like importing every row in turn)
+    - "first": the values of the first row of each key
+    - "aggregate": every value of each property, collected into a list
+
+    Args:
+        construction_key: The key of the rule in the proposed construction plan (a node label or relationship type)
+        policy: Either "last", "first" or "aggregate"
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'construction_rule' key with the updated rule
+                If 'error', includes an 'error_message' key.
+    """
+    construction_plan = tool_context.state.get(PROPOSED_CONSTRUCTION_PLAN, {})
+    if construction_key not in construction_plan:
+        return tool_error(f"{construction_key} is not in the proposed construction plan.")
+    rule = construction_plan[construction_key]
+    policy_error = check_duplicates({**rule, DUPLICATE_KEYS: policy})
+    if policy_error:
+        return policy_error
+    rule[DUPLICATE_KEYS] = policy
+    tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
+    return tool_success("construction_rule", rule)
+
+
+# Tool: Set the transaction batching of a construction rule
+
+def set_construction_batching(construction_key: str, tool_context: ToolContext, batch_size: int = 0, adaptive: bool = False,
+                              concurrency: int = 1, on_error: str = "fail") -> dict:
+    """Choose how a construction rule splits its import into transactions.
+
+    Args:
+        construction_key: The key of the rule in the proposed construction plan (a node label or relationship type)
+        batch_size: The number of rows written per transaction. 0 uses the default (1000 unless configured otherwise)
+        adaptive: Tune the batch size automatically from the rows/sec measured in earlier imports, instead of a fixed batch_size
+        concurrency: How many transactions to write at the same time. Only for node rules loaded with LOAD CSV,
+                     and relationship rules with the "partitioned" loader
+        on_error: What to do when a transaction of a node rule fails: "fail" the whole import (the default),
+                  "continue" with the next batch, or "break" off keeping the batches already written.
+                  Only for node rules loaded with LOAD CSV
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'construction_rule' key with the updated rule
+                If 'error', includes an 'error_message' key.
+    """
+    construction_plan = tool_context.state.get(PROPOSED_CONSTRUCTION_PLAN, {})
+    if construction_key not in construction_plan:
+        return tool_error(f"{construction_key} is not in the proposed construction plan.")
+    rule = construction_plan[construction_key]
+    batching = {
+        "batch_size": ADAPTIVE_BATCH_SIZE if adaptive else (batch_size or None),
+        "concurrency": concurrency,
+        "on_error": on_error,
+    }
+    batching_error = check_batching({**rule, **batching})
+    if batching_error:
+        return batching_error
+    rule.update(batching)
+    tool_context.state[PROPOSED_CONSTRUCTION_PLAN] = construction_plan
+    return tool_success("construction_rule", rule)
+
+
+# Tool: Preview Relationship Join
+
+JOIN_PREVIEWS = "join_previews"
+
+MIN_MATCH_RATE = 0.9
+
+def _node_rule_for(construction_plan: dict, label: str) -> dict | None:
+    for rule in construction_plan.values():
+        if rule.get("construction_type") == "node" and rule.get("label") == label:
+            return rule
+    return None
+
+def preview_relationship_join(relationship_type: str, tool_context: ToolContext, max_keys: int = DEFAULT_MAX_KEYS) -> dict:
+    """Preview how a proposed relationship construction will join its node files, before anything is imported.
+
+    Runs the same join the import will run, locally: each row of the relationship file is matched 
+    to from and to nodes by the values of its from_node_column and to_node_column.
+    Use this after proposing a relationship construction, to catch rules that would produce few relationships.
+
+    Args:
+        relationship_type: The type of a relationship construction in the proposed construction plan
+        tool_context: The tool context
+        max_keys: The most distinct keys to hold in memory; beyond that, results are estimated from a sample
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'join_preview' key with the relationship file 'rows', the number of
+                'relationships' that will be made, and 'from' and 'to' reports of each end with
+                'match_rate', 'orphan_keys' (keys without a node, with 'orphan_examples'), 'node_coverage'
+                (the fraction of nodes that get a relationship) and 'fan_out' (relationships per linked node).
+                'warnings' describes likely problems with the rule.
+                If 'error', includes an 'error_message' key.
+    """
+    construction_plan = tool_context.state.get(PROPOSED_CONSTRUCTION_PLAN, {})
+    rule = construction_plan.get(relationship_type)
+    if rule is None or rule.get("construction_type") != "relationship":
+        return tool_error(f"No relationship construction for {relationship_type} in the proposed construction plan.")
+
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    warnings = []
+    node_keys = {}
+    node_files = {}
+    for end in ("from", "to"):
+        label = rule[f"{end}_node_label"]
+        column = rule[f"{end}_node_column"]
+        node_rule = _node_rule_for(construction_plan, label)
+        if node_rule is None:
+            return tool_error(f"No node construction for the {end} node label {label}. Propose it first.")
+        if column != node_rule["unique_column_name"] and column not in node_rule["properties"]:
+            warnings.append(
+                f"{label} nodes will not have a '{column}' property, so no {end} node can match. "
+                f"Use a column that is imported as a {label} property, like '{node_rule['unique_column_name']}'."
+            )
+        try:
+            node_keys[end], node_files[end] = collect_node_keys(import_dir / node_rule["source_file"], column, max_keys)
+        except Exception as e:
+            return tool_error(f"Could not read the {end} node keys from {node_rule['source_file']}: {e}")
+        node_files[end]["source_file"] = node_rule["source_file"]
+        if node_files[end]["duplicate_keys"]:
+            warnings.append(f"{node_rule['source_file']} has {node_files[end]['duplicate_keys']} repeated '{column}' values; they merge into fewer {label} nodes.")
+
+    try:
+        preview = preview_join(import_dir / rule["source_file"], rule["from_node_column"], rule["to_node_column"],
+                               node_keys["from"], node_keys["to"], max_keys)
+    except Exception as e:
+        return tool_error(f"Could not preview the join for {rule['source_file']}: {e}")
+
+    for end in ("from", "to"):
+        report = preview[end]
+        report["node_file"] = node_files[end]
+        if report["match_rate"] < MIN_MATCH_RATE:
+            warnings.append(
+                f"Only {report['match_rate']:.0%} of '{rule[f'{end}_node_column']}' values match a "
+                f"{rule[f'{end}_node_label']} node, for example {report['orphan_examples'][:3]}."
+            )
+        if report["empty_keys"]:
+            warnings.append(f"{report['empty_keys']} rows have no '{rule[f'{end}_node_column']}' value and will be skipped.")
+    preview["warnings"] = warnings
+
+    join_previews = tool_context.state.get(JOIN_PREVIEWS, {})
+    join_previews[relationship_type] = preview
+    tool_context.state[JOIN_PREVIEWS] = join_previews
+    return tool_success("join_preview", preview)
+
+
 # Tool: Approve the proposed construction plan
 def approve_proposed_construction_plan(tool_context:ToolContext) -> dict:
     """Approve the proposed construction plan."""
@@ -136,7 +136,7 @@ def create_uniqueness_constraint(
         A dictionary with a status key ('success' or 'error').
         On error, includes an 'error_message' key.
     """
-    from agentic_kg.common.neo4j_for_adk import is_symbol
+    from agentic_kg.common.neo4j_for_adk import is_symbol, quote_symbol
 
     # Validate input to prevent injection attacks
     if not is_symbol(label):
@@ -145,14 +145,67 @@ def create_uniqueness_constraint(
     if not is_symbol(unique_property_key):
         return tool_error(f"Invalid property key: '{unique_property_key}'. Property keys cannot contain spaces or be Cypher keywords.")
 
-    # Use string formatting since Neo4j doesn't support parameterization of labels and property keys when creating a constraint
-    constraint_name = f"{label}_{unique_property_key}_constraint"
+    # Use string formatting since Neo4j doesn't support parameterization of labels and property keys when creating a constraint;
+    # names are backtick-quoted, since property keys may hold dots (like the flattened 'address.city')
+    constraint_name = quote_symbol(f"{label}_{unique_property_key}_constraint")
     query = f"""CREATE CONSTRAINT {constraint_name} IF NOT EXISTS
-    FOR (n:{label})
-    REQUIRE n.{unique_property_key} IS UNIQUE"""
+    FOR (n:{quote_symbol(label)})
+    REQUIRE n.{quote_symbol(unique_property_key)} IS UNIQUE"""
     results = graphdb.send_query(query)
     return results
 
+def create_property_index(
+    label: str,
+    property_key: str,
+) -> Dict[str, Any]:
+    """Creates a range index on a node label and property key, so that nodes can be found by that property
+    without scanning every node of the label.
+
+    Args:
+        label: The label of the nodes to index.
+        property_key: The property key to index.
+
+    Returns:
+        A dictionary with a status key ('success' or 'error').
+        On error, includes an 'error_message' key.
+    """
+    from agentic_kg.common.neo4j_for_adk import is_symbol, quote_symbol
+
+    if not is_symbol(label):
+        return tool_error(f"Invalid label: '{label}'. Labels cannot contain spaces or be Cypher keywords.")
+
+    if not is_symbol(property_key):
+        return tool_error(f"Invalid property key: '{property_key}'. Property keys cannot contain spaces or be Cypher keywords.")
+
+    index_name = quote_symbol(f"{label}_{property_key}_index")
+    query = f"""CREATE INDEX {index_name} IF NOT EXISTS
+    FOR (n:{quote_symbol(label)})
+    ON (n.{quote_symbol(property_key)})"""
+    return graphdb.send_query(query)
+
+
+def list_property_indexes() -> Dict[str, Any]:
+    """Lists the single-property node indexes (including those backing constraints) that equality lookups can use.
+
+    Returns:
+        A dictionary with a status key ('success' or 'error').
+        On success, includes an 'indexes' key with a list of {label, property, state, constraint} entries.
+    """
+    results = graphdb.send_query("""SHOW INDEXES
+    YIELD entityType, type, labelsOrTypes, properties, state, owningConstraint
+    WHERE entityType = 'NODE' AND type = 'RANGE' AND size(properties) = 1
+    RETURN labelsOrTypes[0] AS label, properties[0] AS property, state, owningConstraint IS NOT NULL AS constraint
+    """)
+    if results["status"] == "error":
+        return results
+    return tool_success("indexes", results["records"])
+
+
+def await_indexes(timeout_seconds: int = 300) -> Dict[str, Any]:
+    """Waits until all indexes are online (populated), or fails after the timeout."""
+    return graphdb.send_query("CALL db.awaitIndexes($timeout)", {"timeout": timeout_seconds})
+
+
 def merge_node_into_graph(label_name:str, id_property_name:str, properties: Dict[str, Any], tool_context:ToolContext) -> Dict[str, Any]:
     """Merges a node into the graph. The label_name/id_property_name pair will
     be used for the MERGE pattern to ensure uniqueness.
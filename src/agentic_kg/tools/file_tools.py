@@ -1,15 +1,30 @@
+import json
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import clevercsv
 from itertools import islice
 
 from google.adk.tools import ToolContext
-from typing import Dict, Any, List
-
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from agentic_kg.common.arrow_csv import search_csv
+from agentic_kg.common.byte_search import count_byte_matches, iter_byte_matches
+from agentic_kg.common.columnar_cache import (
+    column_statistics, find_columnar_copy, get_columnar_copy, read_column, read_header, row_count, search_columnar,
+)
+from agentic_kg.common.compression import compression_of, content_suffix, is_compressed, open_binary, open_text
+from agentic_kg.common.csv_files import read_csv_header
+from agentic_kg.common.file_catalog import is_catalog_path
+from agentic_kg.common.json_records import (
+    JSON_LINES_SUFFIXES, iter_flat_records, profile_records, sample_records, search_records,
+)
+from agentic_kg.common.sampling import SAMPLING_MODES, sample_head, sample_reservoir, sample_random_offsets
+from agentic_kg.common.search_index import get_search_index, verified_matches
 from agentic_kg.common.tool_result import tool_success, tool_error
 
 from .cypher_tools import get_neo4j_import_dir
+from .markdown_tools import ensure_markdown_constraints, import_markdown_document, import_markdown_documents
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +36,13 @@ def list_import_files(tool_context:ToolContext) -> dict:
     f"""Lists files available for knowledge graph construction.
     All files are relative to the import directory.
 
+    Compressed files (like 'orders.csv.gz') are read like the file inside them by every file tool.
+
     Returns:
         dict: A dictionary containing metadata about the content.
                 Includes a 'status' key ('success' or 'error').
-                If 'success', includes a {ALL_AVAILABLE_FILES} key with list of file names.
+                If 'success', includes a {ALL_AVAILABLE_FILES} key with list of file names,
+                and a 'compressed_files' key with the 'compression' and 'content_type' (like '.csv') of each compressed file.
                 If 'error', includes an 'error_message' key.
                 The 'error_message' may have instructions about how to handle the error.
     """
@@ -36,14 +54,20 @@ def list_import_files(tool_context:ToolContext) -> dict:
     import_dir = Path(result["neo4j_import_dir"])
 
     # get a list of relative file names, so files must be rooted at the import dir
+    # (skipping the file catalog, which only holds derived artifacts)
     file_names = [str(x.relative_to(import_dir)) 
                  for x in import_dir.rglob("*") 
-                 if x.is_file()]
+                 if x.is_file() and not is_catalog_path(x.relative_to(import_dir))]
 
     # save the list to state so we can inspect it later
     tool_context.state[ALL_AVAILABLE_FILES] = file_names
 
-    return tool_success(ALL_AVAILABLE_FILES, file_names)
+    result = tool_success(ALL_AVAILABLE_FILES, file_names)
+    result["compressed_files"] = {
+        name: {"compression": compression_of(Path(name)), "content_type": content_suffix(Path(name))}
+        for name in file_names if is_compressed(Path(name))
+    }
+    return result
 
 
 def set_suggested_files(suggest_files:List[str], tool_context:ToolContext) -> Dict[str, Any]:
@@ -83,14 +107,30 @@ def get_approved_files(tool_context:ToolContext) -> Dict[str, Any]:
 
     return tool_success(APPROVED_FILES, tool_context.state[APPROVED_FILES])
 
-def sample_file(file_path: str, tool_context: ToolContext) -> dict:
+DEFAULT_SAMPLE_LINES = 100
+DEFAULT_SAMPLE_BYTES = 64 * 1024
+
+def sample_file(file_path: str, tool_context: ToolContext, mode: str = "head",
+                max_lines: int = DEFAULT_SAMPLE_LINES, max_bytes: int = DEFAULT_SAMPLE_BYTES) -> dict:
     """Samples a file by reading its content as text.
     
-    Treats any file as text and reads up to a maximum of 100 lines.
+    Treats any file as text and reads up to a maximum of 100 lines, 
+    within a budget of 64KB. Overly long lines are cut short.
+    The header line of a CSV file is always included.
+    JSON and JSON Lines files are sampled as whole records instead, one per line, 
+    with nested objects flattened into dotted column names like 'address.city'.
+
+    Sampling modes:
+    - 'head': the first lines of the file (default)
+    - 'reservoir': a uniform random sample of lines from the whole file. Use this for sorted or clustered files.
+    - 'random': random lines found by jumping to random positions. Use this for very large files.
     
     Args:
       file_path: file to sample, relative to the import directory
       tool_context: ToolContext object
+      mode: the sampling mode, one of 'head', 'reservoir' or 'random' (default: 'head')
+      max_lines: the maximum number of lines to sample (default: 100)
+      max_bytes: the maximum size of the sampled content in bytes (default: 65536)
       
     Returns:
         dict: A dictionary containing metadata about the content,
@@ -102,57 +142,101 @@ def sample_file(file_path: str, tool_context: ToolContext) -> dict:
     import_dir_result = get_neo4j_import_dir() # chain tool call
     if import_dir_result["status"] == "error": return import_dir_result
     import_dir = Path(import_dir_result["neo4j_import_dir"])
+    return _sample_file(import_dir, file_path, mode, max_lines, max_bytes)
+
+def _sample_file(import_dir: Path, file_path: str, mode: str = "head",
+                 max_lines: int = DEFAULT_SAMPLE_LINES, max_bytes: int = DEFAULT_SAMPLE_BYTES) -> dict:
+    """Sample a file relative to an already resolved import directory."""
     p = import_dir / file_path
     
     if not p.exists():
         return tool_error(f"Path does not exist: {file_path}")
+    if mode not in SAMPLING_MODES:
+        return tool_error(f"Unknown sampling mode '{mode}'. Use one of {', '.join(SAMPLING_MODES)}.")
     
     # Set basic metadata
     result = {
         "metadata": {
             "path": file_path,
+            "sampling_mode": mode,
         },
         "annotations": []
     }
+    compression = compression_of(p)
+    if compression:
+        result["metadata"]["compression"] = compression
     
-    # Set mimetype based on extension
-    file_extension = p.suffix.lower()
+    # Set mimetype based on extension (of the content, for compressed files)
+    file_extension = content_suffix(p)
     if file_extension == '.csv':
         result["metadata"]["mimetype"] = "text/csv"
     elif file_extension == '.md':
         result["metadata"]["mimetype"] = "text/markdown"
+    elif file_extension == '.json':
+        result["metadata"]["mimetype"] = "application/json"
+    elif file_extension in JSON_LINES_SUFFIXES:
+        result["metadata"]["mimetype"] = "application/x-ndjson"
     else:
         result["metadata"]["mimetype"] = "text/plain"
+    keep_header = result["metadata"]["mimetype"] == "text/csv"
+    is_json = result["metadata"]["mimetype"] in ("application/json", "application/x-ndjson")
+
+    if mode == "random" and (compression or is_json):
+        # neither a compressed stream nor a stream of records can be jumped into, so read through it instead
+        mode = "reservoir"
+        result["annotations"].append("This file can't be sampled at random positions; used reservoir sampling instead.")
     
     try:
-        # Treat all files as text
-        with open(p, 'r', encoding='utf-8') as file:
-            # Read up to 100 lines
-            lines = list(islice(file, 100))
-            content = ''.join(lines)
-            result["content"] = content
+        if is_json:
+            # Sample whole records, flattened into columns, one JSON object per line
+            sample = sample_records(iter_flat_records(p), max_lines, max_bytes, mode)
+            result["metadata"]["columns"] = list(dict.fromkeys(
+                column for line in sample.lines for column in json.loads(line)
+            ))
+        else:
+            # Treat all other files as text, decompressing on the fly
+            with open_binary(p) as file:
+                if mode == "reservoir":
+                    sample = sample_reservoir(file, max_lines, max_bytes, keep_header)
+                elif mode == "random":
+                    sample = sample_random_offsets(file, max_lines, max_bytes, keep_header)
+                else:
+                    sample = sample_head(file, max_lines, max_bytes)
+        result["content"] = sample.content
     
     except Exception as e:
         return tool_error(f"Error reading or processing file {file_path}: {e}")
+
+    result["metadata"]["lines_sampled"] = len(sample.lines)
+    if sample.truncated_lines:
+        result["annotations"].append(f"{sample.truncated_lines} overly long lines were cut short.")
+    if sample.budget_exhausted:
+        result["annotations"].append(f"Sampling stopped at the budget of {max_bytes} bytes.")
     
     return tool_success("sample", result)
 
 
-def search_csv_file(file_path: str, query: str, tool_context: ToolContext, case_sensitive: bool = False) -> dict:
+def search_csv_file(file_path: str, query: str, tool_context: ToolContext, case_sensitive: bool = False,
+                    columns: Optional[List[str]] = None, match_mode: str = "substring", max_rows: int = 100) -> dict:
     """
-    Searches a CSV file for rows containing the given query string in any of its fields.
+    Searches a CSV file for rows where the given columns (by default, any column) match the query string.
 
     Args:
       file_path: Path to the CSV file, relative to the Neo4j import directory.
       query: The string to search for.
       tool_context: The ToolContext object.
       case_sensitive: Whether the search should be case-sensitive (default: False).
+      columns: Names of the columns to search. Searches all columns if not provided.
+      match_mode: How a field must match the query, one of 'exact', 'prefix', 'substring' or 'regex' (default: 'substring').
+      max_rows: The maximum number of matching rows to return (default: 100). All matching rows are still counted.
 
     Returns:
         dict: A dictionary with 'status' ('success' or 'error').
               If 'success', includes 'search_results' containing 'matching_rows'
               (a list of rows, where each row is a list of strings)
-              and 'metadata' (path, mimetype, query, case_sensitive, rows_found).
+              and 'metadata' (path, mimetype, query, case_sensitive, columns, match_mode, header, 
+              rows_found, total_rows_found).
+              'rows_found' is the number of returned rows, 'total_rows_found' counts every matching row.
               If 'error', includes an 'error_message'.
     """
     import_dir_result = get_neo4j_import_dir()
@@ -165,49 +249,22 @@ def search_csv_file(file_path: str, query: str, tool_context: ToolContext, case_
         return tool_error(f"CSV file does not exist: {file_path}")
     if not p.is_file():
         return tool_error(f"Path is not a file: {file_path}")
-    if not (p.suffix.lower() == ".csv"):
+    if not (content_suffix(p) == ".csv"):
         # Basic check, could be enhanced with mimetypes for more accuracy
         logger.warning(f"File {file_path} does not have a .csv extension, but attempting to process as CSV.")
 
-    matching_rows = []
-    search_query = query if case_sensitive else query.lower()
-    header_row = []
-
     try:
-        # Handle empty query - return no results
+        # Handle empty query - return no results, but we still read the header
         if not query:
-            with open(p, 'r', newline='', encoding='utf-8') as csvfile:
-                try:
-                    # Just read enough to get the header
-                    dialect = clevercsv.Sniffer().sniff(csvfile.read(2048))
-                    csvfile.seek(0)
-                    reader = clevercsv.reader(csvfile, dialect)
-                except clevercsv.Error:
-                    csvfile.seek(0)
-                    reader = clevercsv.reader(csvfile)
-                header_row = next(reader, [])
-                # Empty query returns no matches, but we still read the header
+            header_row, _ = read_csv_header(p)
+            search = {"header": header_row, "rows": [], "total_count": 0}
         else:
-            with open(p, 'r', newline='', encoding='utf-8') as csvfile:
-                try:
-                    # Read a chunk to sniff dialect, then rewind
-                    dialect = clevercsv.Sniffer().sniff(csvfile.read(2048))
-                    csvfile.seek(0)
-                    reader = clevercsv.reader(csvfile, dialect)
-                except clevercsv.Error:
-                    # Fallback if sniffing fails (e.g., empty or very small file, or not CSV)
-                    csvfile.seek(0)
-                    reader = clevercsv.reader(csvfile) # Use default dialect
-                    logger.warning(f"Could not sniff CSV dialect for {file_path}. Using default dialect.")
-                
-                header_row = next(reader, []) # Store header, or empty list if file is empty
-                
-                for row in reader:
-                    for field in row:
-                        field_to_check = str(field) if case_sensitive else str(field).lower()
-                        if search_query in field_to_check:
-                            matching_rows.append(row)
-                            break # Move to next row once a match is found
+            # prefer the cached columnar copy of the file, when there is a current one
+            columnar_copy = find_columnar_copy(import_dir, file_path)
+            if columnar_copy is not None:
+                search = search_columnar(columnar_copy, query, columns, match_mode, case_sensitive, max_rows)
+            else:
+                search = search_csv(p, query, columns, match_mode, case_sensitive, max_rows)
     except Exception as e:
         return tool_error(f"Error reading or searching CSV file {file_path}: {e}")
 
@@ -217,16 +274,236 @@ def search_csv_file(file_path: str, query: str, tool_context: ToolContext, case_
             "mimetype": "text/csv",
             "query": query,
             "case_sensitive": case_sensitive,
-            "header": header_row,
-            "rows_found": len(matching_rows)
+            "columns": columns or search["header"],
+            "match_mode": match_mode,
+            "header": search["header"],
+            "rows_found": len(search["rows"]),
+            "total_rows_found": search["total_count"]
         },
-        "matching_rows": matching_rows
+        "matching_rows": search["rows"]
     }
+    if search.get("irregular_rows"):
+        # rows with more or fewer fields than the header, padded or cut to it
+        result_data["metadata"]["irregular_rows"] = search["irregular_rows"]
     return tool_success("search_results", result_data)
 
+PROFILE = "profile"
+
+def profile_csv_file(file_path: str, columns: Optional[List[str]] = None) -> dict:
+    """Profiles the columns of a CSV file with summary statistics.
+
+    Useful for checking whether a column is a unique identifier, how many values are empty,
+    and what typical values look like, without reading through the file.
+
+    Args:
+      file_path: Path to the CSV file, relative to the Neo4j import directory.
+      columns: Names of the columns to profile. Profiles all columns if not provided.
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes a 'profile' key with 'path', 'row_count' and 'columns',
+              a dictionary from column name to statistics: 'non_empty', 'empty', 'distinct',
+              'is_unique', 'min', 'max', 'top_values' and 'type' (the property type all its values fit:
+              'int', 'float', 'currency', 'bool', 'date' or 'string').
+              If 'error', includes an 'error_message'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    return profile_csv_in_import_dir(import_dir, file_path, columns)
+
+def profile_csv_in_import_dir(import_dir: Path, file_path: str, columns: Optional[List[str]] = None) -> dict:
+    """Profile a CSV file relative to an already resolved import directory, like the 'profile_csv_file' tool.
+
+    For other tools that already know the import directory.
+    """
+    p = import_dir / file_path
+    if not p.is_file():
+        return tool_error(f"CSV file does not exist: {file_path}")
+
+    try:
+        columnar_copy = get_columnar_copy(import_dir, file_path)
+        header = read_header(columnar_copy)
+        unknown = [c for c in columns or [] if c not in header]
+        if unknown:
+            return tool_error(f"Unknown columns {unknown}. Available columns are {header}.")
+        statistics = {name: column_statistics(read_column(columnar_copy, name)) for name in columns or header}
+        rows = row_count(columnar_copy)
+    except Exception as e:
+        return tool_error(f"Error profiling CSV file {file_path}: {e}")
+
+    return tool_success(PROFILE, {
+        "path": file_path,
+        "row_count": rows,
+        "columns": statistics
+    })
+
+def search_json_file(file_path: str, query: str, case_sensitive: bool = False, columns: Optional[List[str]] = None,
+                     match_mode: str = "substring", max_records: int = 100) -> dict:
+    """
+    Searches a JSON or JSON Lines file for records where the given columns (by default, any column) match the query string.
+    Nested objects are flattened into dotted column names like 'address.city'; arrays are matched as JSON text.
+
+    Args:
+      file_path: Path to the JSON file, relative to the Neo4j import directory.
+      query: The string to search for.
+      case_sensitive: Whether the search should be case-sensitive (default: False).
+      columns: Names of the (flattened) columns to search. Searches all columns if not provided.
+      match_mode: How a value must match the query, one of 'exact', 'prefix', 'substring' or 'regex' (default: 'substring').
+      max_records: The maximum number of matching records to return (default: 100). All matching records are still counted.
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes 'search_results' containing 'matching_records'
+              (a list of flattened records) and 'metadata' (path, query, case_sensitive, columns, 
+              match_mode, records_found, total_records_found).
+              If 'error', includes an 'error_message'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    p = Path(import_dir_result["neo4j_import_dir"]) / file_path
+
+    if not p.is_file():
+        return tool_error(f"JSON file does not exist: {file_path}")
+
+    try:
+        if not query:
+            search = {"records": [], "total_count": 0}
+        else:
+            search = search_records(iter_flat_records(p), query, columns, match_mode, case_sensitive, max_records)
+    except Exception as e:
+        return tool_error(f"Error reading or searching JSON file {file_path}: {e}")
+
+    return tool_success("search_results", {
+        "metadata": {
+            "path": file_path,
+            "query": query,
+            "case_sensitive": case_sensitive,
+            "columns": columns,
+            "match_mode": match_mode,
+            "records_found": len(search["records"]),
+            "total_records_found": search["total_count"]
+        },
+        "matching_records": search["records"]
+    })
+
+def profile_json_file(file_path: str) -> dict:
+    """Profiles the records of a JSON or JSON Lines file in a single streaming pass.
+
+    Nested objects are flattened into dotted column names like 'address.city'.
+    Useful for finding the columns of the records, which are optional, and which could be unique identifiers.
+
+    Args:
+      file_path: Path to the JSON file, relative to the Neo4j import directory.
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes a 'profile' key with 'path', 'record_count' and 'columns',
+              a dictionary from column name to statistics: 'present', 'missing', 'non_empty', 
+              'types' (counts of JSON value types), 'distinct', 'is_unique' and 'top_values'.
+              If 'error', includes an 'error_message'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    p = Path(import_dir_result["neo4j_import_dir"]) / file_path
+
+    if not p.is_file():
+        return tool_error(f"JSON file does not exist: {file_path}")
+
+    try:
+        profile = profile_records(iter_flat_records(p))
+    except Exception as e:
+        return tool_error(f"Error profiling JSON file {file_path}: {e}")
+
+    return tool_success(PROFILE, {"path": file_path, **profile})
+
+COLUMNAR_CACHE = "columnar_cache"
+
+def cache_approved_files(tool_context: ToolContext) -> dict:
+    """Prepares the approved CSV files for fast analysis by caching a columnar copy of each.
+
+    Copies are only made once, and remade when a file changes. 
+    Searching and profiling the files afterwards is much faster.
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes a 'columnar_cache' key with 'cached_files' 
+              (a dictionary from file path to its row count) and 'errors' 
+              (a dictionary from file path to an error message).
+              If 'error', includes an 'error_message'.
+    """
+    if APPROVED_FILES not in tool_context.state:
+        return tool_error("Approved files have not been set.")
+
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    csv_files = [f for f in tool_context.state[APPROVED_FILES] if content_suffix(Path(f)) == ".csv"]
+
+    def cache_file(file_path: str) -> dict:
+        if not (import_dir / file_path).is_file():
+            return tool_error(f"CSV file does not exist: {file_path}")
+        columnar_copy = get_columnar_copy(import_dir, file_path)
+        return tool_success("row_count", row_count(columnar_copy))
+
+    cached, errors = _map_files(cache_file, csv_files, "row_count")
+    return tool_success(COLUMNAR_CACHE, {"cached_files": cached, "errors": errors})
+
 SEARCH_RESULTS = "search_results"
 
-def search_file(file_path: str, query: str) -> dict:
+DEFAULT_MAX_MATCHES = 100
+
+def _scan_lines(p: Path, query: str) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, line) for every line containing the query, by scanning the whole file."""
+    search_query = query.lower()
+    with open_text(p) as file:
+        # Process the file line by line
+        for i, line in enumerate(file, 1):
+            if search_query in line.lower():
+                yield i, line
+
+def _can_search_bytes(p: Path, query: str) -> bool:
+    # compressed files can't be memory-mapped, 
+    # and case folding of a bytes pattern is only equivalent to str.lower() for ASCII
+    return not is_compressed(p) and query.isascii() and "\n" not in query
+
+def _iter_matching_lines(import_dir: Path, file_path: str, query: str, use_index: bool) -> Iterator[Tuple[int, str]]:
+    """Lazily find lines containing the query, preferring the file's search index, then a memory-mapped byte scan."""
+    p = import_dir / file_path
+    if use_index and len(query) >= 3:
+        index = get_search_index(import_dir, file_path)
+        if index is not None:
+            return verified_matches(p, index, query)
+    if _can_search_bytes(p, query):
+        return ((i, line.decode("utf-8")) for i, line in iter_byte_matches(p, query))
+    return _scan_lines(p, query)
+
+def _count_matching_lines(import_dir: Path, file_path: str, query: str, use_index: bool) -> int:
+    """Count lines containing the query, without keeping any of them."""
+    if not use_index and _can_search_bytes(import_dir / file_path, query):
+        return count_byte_matches(import_dir / file_path, query)
+    return sum(1 for _ in _iter_matching_lines(import_dir, file_path, query, use_index))
+
+def _find_matching_lines(import_dir: Path, file_path: str, query: str, use_index: bool, max_matches: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """Find up to max_matches lines containing the query. Also returns whether the search stopped early."""
+    matches = _iter_matching_lines(import_dir, file_path, query, use_index)
+    matching_lines = [
+        {
+            "line_number": i,
+            "content": line.strip()  # Remove trailing newlines
+        }
+        for i, line in islice(matches, max_matches + 1)
+    ]
+    truncated = len(matching_lines) > max_matches
+    return matching_lines[:max_matches], truncated
+
+def search_file(file_path: str, query: str, use_index: bool = True, 
+                max_matches: int = DEFAULT_MAX_MATCHES, count_only: bool = False) -> dict:
     """
     Searches any text file (markdown, csv, txt)for lines containing the given query string.
     Simple grep-like functionality that works with any text file.
@@ -235,19 +512,29 @@ def search_file(file_path: str, query: str) -> dict:
     Args:
       file_path: Path to the file, relative to the Neo4j import directory.
       query: The string to search for.
-      tool_context: The ToolContext object.
+      use_index: Whether to use (and maintain) a search index for the file, 
+                 which makes repeated searches of the same file much faster (default: True).
+      max_matches: The maximum number of matching lines to return (default: 100).
+                   The search stops as soon as this many lines have been found.
+      count_only: Only count the matching lines, without returning them (default: False).
 
     Returns:
         dict: A dictionary with 'status' ('success' or 'error').
               If 'success', includes 'search_results' containing 'matching_lines'
               (a list of dictionaries with 'line_number' and 'content' keys)
               and basic metadata about the search.
+              The metadata 'truncated' is true when more than max_matches lines matched.
               If 'error', includes an 'error_message'.
     """
     import_dir_result = get_neo4j_import_dir()
     if import_dir_result["status"] == "error":
         return import_dir_result
     import_dir = Path(import_dir_result["neo4j_import_dir"])
+    return _search_file(import_dir, file_path, query, use_index, max_matches, count_only)
+
+def _search_file(import_dir: Path, file_path: str, query: str, use_index: bool = True,
+                 max_matches: int = DEFAULT_MAX_MATCHES, count_only: bool = False) -> dict:
+    """Search a file relative to an already resolved import directory."""
     p = import_dir / file_path
 
     if not p.exists():
@@ -256,7 +543,7 @@ def search_file(file_path: str, query: str) -> dict:
         return tool_error(f"Path is not a file: {file_path}")
 
     # Check if file has an acceptable extension
-    file_ext = p.suffix.lower()
+    file_ext = content_suffix(p)
     supported_extensions = {".csv", ".md", ".txt"}
     if file_ext not in supported_extensions:
         logger.warning(f"File {file_path} has an unsupported extension {file_ext}, but attempting to search anyway.")
@@ -267,25 +554,20 @@ def search_file(file_path: str, query: str) -> dict:
             "metadata": {
                 "path": file_path,
                 "query": query,
-                "lines_found": 0
+                "lines_found": 0,
+                "truncated": False
             },
             "matching_lines": []
         })
 
-    matching_lines = []
-    search_query = query.lower()
-    
     try:
-        with open(p, 'r', encoding='utf-8') as file:
-            # Process the file line by line
-            for i, line in enumerate(file, 1):
-                line_to_check = line.lower()
-                if search_query in line_to_check:
-                    matching_lines.append({
-                        "line_number": i,
-                        "content": line.strip()  # Remove trailing newlines
-                    })
-                        
+        if count_only:
+            matching_lines = []
+            lines_found = _count_matching_lines(import_dir, file_path, query, use_index)
+            truncated = False
+        else:
+            matching_lines, truncated = _find_matching_lines(import_dir, file_path, query, use_index, max_matches)
+            lines_found = len(matching_lines)
     except Exception as e:
         return tool_error(f"Error reading or searching file {file_path}: {e}")
 
@@ -293,7 +575,8 @@ def search_file(file_path: str, query: str) -> dict:
     metadata = {
         "path": file_path,
         "query": query,
-        "lines_found": len(matching_lines)
+        "lines_found": lines_found,
+        "truncated": truncated
     }
     
     result_data = {
@@ -302,51 +585,230 @@ def search_file(file_path: str, query: str) -> dict:
     }
     return tool_success("search_results", result_data)
 
-async def import_markdown_file(source_file: str, label_name: str, tool_context: ToolContext):
-    """Reads the content of a markdown file then creates a text node in Neo4j.
-    The node will only have two properties:
-    - content: the entire content of the markdown file
+def search_import_dir(query: str, file_pattern: str = "**/*", use_index: bool = True,
+                      max_matches_per_file: int = 20) -> dict:
+    """
+    Searches every text file in the import directory for lines containing the given query string.
+    Search is always case insensitive.
+
+    Args:
+      query: The string to search for.
+      file_pattern: A glob pattern selecting which files to search, relative to the import directory (default: all files).
+      use_index: Whether to use (and maintain) search indexes for the files (default: True).
+      max_matches_per_file: The maximum number of matching lines to return for each file (default: 20).
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes 'search_results' containing 'matching_files'
+              (a dictionary from file path to a list of matching lines, each with 'line_number' and 'content' keys),
+              'errors' (a dictionary from file path to an error message for files that could not be searched),
+              'truncated_files' (files with more matches than were returned)
+              and basic metadata about the search.
+              If 'error', includes an 'error_message'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    file_paths = _expand_file_paths(import_dir, [file_pattern])
+
+    matching_files = {}
+    truncated_files = []
+    errors = {}
+    if query:
+        results, errors = _map_files(
+            lambda file_path: _search_file(import_dir, file_path, query, use_index, max_matches_per_file),
+            file_paths, SEARCH_RESULTS
+        )
+        for file_path, search_results in results.items():
+            if search_results["matching_lines"]:
+                matching_files[file_path] = search_results["matching_lines"]
+            if search_results["metadata"]["truncated"]:
+                truncated_files.append(file_path)
+
+    return tool_success(SEARCH_RESULTS, {
+        "metadata": {
+            "file_pattern": file_pattern,
+            "query": query,
+            "files_searched": len(file_paths),
+            "lines_found": sum(len(lines) for lines in matching_files.values())
+        },
+        "matching_files": matching_files,
+        "truncated_files": truncated_files,
+        "errors": errors
+    })
+
+# Multi-file tools: fan the work for several files out over a bounded thread pool
+
+MAX_FILE_WORKERS = 8
+
+def _expand_file_paths(import_dir: Path, paths_or_globs: List[str]) -> List[str]:
+    """Expand glob patterns relative to the import directory, keeping plain paths as given (in order, without duplicates)."""
+    file_paths = []
+    for entry in paths_or_globs:
+        if any(c in entry for c in "*?["):
+            file_paths.extend(sorted(
+                str(x.relative_to(import_dir))
+                for x in import_dir.glob(entry)
+                if x.is_file() and not is_catalog_path(x.relative_to(import_dir))
+            ))
+        else:
+            file_paths.append(entry)
+    return list(dict.fromkeys(file_paths))
+
+def _map_files(f: Callable[[str], dict], file_paths: List[str], result_key: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Apply a per-file tool function concurrently. Returns per-file results and, separately, per-file error messages."""
+    results = {}
+    errors = {}
+    if not file_paths:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=min(MAX_FILE_WORKERS, len(file_paths))) as pool:
+        futures = {file_path: pool.submit(f, file_path) for file_path in file_paths}
+    for file_path, future in futures.items():
+        try:
+            result = future.result()
+        except Exception as e:
+            errors[file_path] = f"Error processing file {file_path}: {e}"
+            continue
+        if result["status"] == "error":
+            errors[file_path] = result["error_message"]
+        else:
+            results[file_path] = result[result_key]
+    return results, errors
+
+def search_files(file_paths: List[str], query: str, max_matches_per_file: int = 20) -> dict:
+    """
+    Searches several text files at once for lines containing the given query string.
+    Search is always case insensitive.
+
+    Args:
+      file_paths: Paths of the files to search, relative to the Neo4j import directory. 
+                  Glob patterns like 'product_reviews/*.md' are expanded.
+      query: The string to search for.
+      max_matches_per_file: The maximum number of matching lines to return for each file (default: 20).
+
+    Returns:
+        dict: A dictionary with 'status' ('success' or 'error').
+              If 'success', includes 'search_results' containing 'files'
+              (a dictionary from file path to that file's search results, as returned by 'search_file')
+              and 'errors' (a dictionary from file path to an error message for files that could not be searched).
+              If 'error', includes an 'error_message'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    expanded_paths = _expand_file_paths(import_dir, file_paths)
+    results, errors = _map_files(
+        lambda file_path: _search_file(import_dir, file_path, query, max_matches=max_matches_per_file),
+        expanded_paths, SEARCH_RESULTS
+    )
+    return tool_success(SEARCH_RESULTS, {"files": results, "errors": errors})
+
+def sample_files(file_paths: List[str], mode: str = "head", max_lines_per_file: int = 20) -> dict:
+    """Samples several files at once, as the 'sample_file' tool would for each of them.
+
+    Args:
+      file_paths: Paths of the files to sample, relative to the Neo4j import directory. 
+                  Glob patterns like 'product_reviews/*.md' are expanded.
+      mode: the sampling mode, one of 'head', 'reservoir' or 'random' (default: 'head')
+      max_lines_per_file: the maximum number of lines to sample from each file (default: 20)
+
+    Returns:
+        dict: A dictionary containing samples of every file.
+              Includes a 'status' key ('success' or 'error').
+              If 'success', includes a 'samples' key containing 'files'
+              (a dictionary from file path to that file's sample, as returned by 'sample_file')
+              and 'errors' (a dictionary from file path to an error message for files that could not be sampled).
+              If 'error', includes an 'error_message' key.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    expanded_paths = _expand_file_paths(import_dir, file_paths)
+    results, errors = _map_files(lambda file_path: _sample_file(import_dir, file_path, mode, max_lines_per_file), expanded_paths, "sample")
+    return tool_success("samples", {"files": results, "errors": errors})
+
+def import_markdown_file(source_file: str, label_name: str, tool_context: ToolContext):
+    """Imports a markdown file as a document node, with a chunk node for each of its sections.
+
+    The file is split into sections at its level 1 and 2 headings. The document node
+    (with the given label) has 'source_file', 'title' and 'source_url' properties.
+    Each section becomes a 'Chunk' node with 'id', 'index', 'heading', 'text' and 'start_line',
+    linked by a HAS_CHUNK relationship from the document. Review sections, like
+    '## Rating: ★★★★☆ (4/5)' ending with '- @author (City)', are also labeled 'Review'
+    and have 'rating', 'rating_scale', 'author' and 'city' properties.
 
     Args:
       source_file: path to the markdown file, relative to the import directory
-      label_name: the label applied to the created node
+      label_name: the label applied to the document node
       tool_context: ToolContext object.
 
     Returns:
         dict: A dictionary indicating success or failure.
               Includes a 'status' key ('success' or 'error').
+              If 'success', includes a 'markdown_import' key with the 'source_file', 
+              'title' and the number of 'chunks' and 'reviews' imported.
               If 'error', includes an 'error_message' key.
     """
-    from agentic_kg.sub_agents.cypher_agent.tools import create_uniqueness_constraint, write_neo4j_cypher
-    
-    # 1. Ensure that a property constraint has been created for label/source_file
-    constraint_result = await create_uniqueness_constraint(label_name, "source_file")
+    # 1. Ensure that constraints exist for documents (by source_file) and chunks (by id)
+    constraint_result = ensure_markdown_constraints(label_name)
     if constraint_result["status"] == "error":
         return constraint_result
     
-    # 2. Read the content of the markdown
+    # 2. Stream the sections of the markdown into the graph, in batches
     import_dir_result = get_neo4j_import_dir()
     if import_dir_result["status"] == "error":
         return import_dir_result
     
     import_dir = Path(import_dir_result["neo4j_import_dir"])
-    file_path = import_dir / source_file
-    
-    if not file_path.exists():
-        return tool_error(f"Markdown file does not exist: {source_file}")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as mdfile:
-            content = mdfile.read()
-    except Exception as e:
-        return tool_error(f"Error reading markdown file {source_file}: {e}")
-    
-    # 3. Create a node for the markdown using a parameterized cypher query
-    query = "MERGE (t:$($label_name) {source_file: $source_file}) SET t.content = $content"
-    properties = {
-        "label_name": label_name,
-        "source_file": source_file,
-        "content": content
-    }
-    return await write_neo4j_cypher(query, properties)
-    
\ No newline at end of file
+    return import_markdown_document(import_dir, source_file, label_name)
+
+MARKDOWN_SUFFIXES = (".md", ".markdown", ".txt")
+
+def import_markdown_files(path_or_pattern: str, label_name: str, tool_context: ToolContext, force: bool = False):
+    """Imports every markdown (or plain text) file in a directory, or matching a glob pattern, in bulk.
+
+    Each file is imported just like with the 'import_markdown_file' tool, but files are read
+    concurrently and written together in batches, so thousands of files take a single call.
+    Files that have not changed since they were last imported are skipped.
+    A file that fails to import is reported without stopping the others.
+
+    Args:
+      path_or_pattern: a directory (searched recursively) or a glob pattern like 'product_reviews/*.md',
+                       relative to the import directory
+      label_name: the label applied to the document nodes
+      tool_context: ToolContext object.
+      force: import files again even if they have not changed (default: False)
+
+    Returns:
+        dict: A dictionary indicating success or failure.
+              Includes a 'status' key ('success' or 'error').
+              If 'success', includes a 'markdown_import' key with the number of 'files_imported',
+              'files_unchanged', 'chunks' and 'reviews', and 'errors' (a dictionary from file path to an error message).
+              If 'error', includes an 'error_message' key.
+    """
+    constraint_result = ensure_markdown_constraints(label_name)
+    if constraint_result["status"] == "error":
+        return constraint_result
+
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    pattern = path_or_pattern
+    if (import_dir / path_or_pattern).is_dir():
+        pattern = str(Path(path_or_pattern) / "**" / "*")
+    file_paths = [
+        f for f in _expand_file_paths(import_dir, [pattern])
+        if content_suffix(Path(f)) in MARKDOWN_SUFFIXES
+    ]
+    if not file_paths:
+        return tool_error(f"No markdown or text files found for '{path_or_pattern}'.")
+
+    return import_markdown_documents(import_dir, file_paths, label_name, force=force)
@@ -0,0 +1,139 @@
+import logging
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+from google.adk.tools import ToolContext
+
+from agentic_kg.common.column_sketches import ColumnSketch, sketch_columns
+from agentic_kg.common.compression import content_suffix
+from agentic_kg.common.csv_files import open_csv_rows
+from agentic_kg.common.file_catalog import read_catalog_entry, write_catalog_entry
+from agentic_kg.common.tool_result import tool_success, tool_error
+
+from .cypher_tools import get_neo4j_import_dir
+from .file_tools import APPROVED_FILES
+
+logger = logging.getLogger(__name__)
+
+COLUMN_SKETCHES = "column_sketches"
+FOREIGN_KEY_CANDIDATES = "foreign_key_candidates"
+
+# a referenced column must look like a key: (almost) every value is distinct
+MIN_KEY_UNIQUENESS = 0.95
+
+
+def get_column_sketches(import_dir: Path, file_path: str) -> Dict[str, ColumnSketch]:
+    """Get sketches for every column of a CSV file, computing them only if the catalog has none for the current file."""
+    cached = read_catalog_entry(import_dir, COLUMN_SKETCHES, file_path)
+    if cached is not None:
+        return {column: ColumnSketch.from_dict(data) for column, data in cached.items()}
+
+    with open_csv_rows(import_dir / file_path) as (header, rows):
+        sketches = sketch_columns(header, rows)
+
+    write_catalog_entry(import_dir, COLUMN_SKETCHES, file_path,
+                        {column: sketch.to_dict() for column, sketch in sketches.items()})
+    return sketches
+
+
+def _names_match(from_column: str, to_column: str) -> bool:
+    from_name = from_column.lower().strip()
+    to_name = to_column.lower().strip()
+    return from_name == to_name or from_name.endswith("_" + to_name) or to_name.endswith("_" + from_name)
+
+
+def rank_foreign_key_candidates(
+    sketches_by_file: Dict[str, Dict[str, ColumnSketch]],
+    min_containment: float = 0.8,
+) -> List[Dict[str, Any]]:
+    """Rank column pairs (from -> to) where the values of 'from' are contained in the key-like column 'to'.
+
+    Args:
+        sketches_by_file: column sketches, keyed by file then by column name
+        min_containment: the minimum estimated fraction of 'from' values found in 'to'
+
+    Returns:
+        A list of candidate foreign keys, best first.
+    """
+    columns = [
+        (file_path, column, sketch)
+        for file_path, sketches in sketches_by_file.items()
+        for column, sketch in sketches.items()
+        if sketch.distinct_count() >= 2
+    ]
+    referenced = [c for c in columns if c[2].uniqueness() >= MIN_KEY_UNIQUENESS]
+
+    candidates = []
+    for to_file, to_column, to_sketch in referenced:
+        for from_file, from_column, from_sketch in columns:
+            if (from_file, from_column) == (to_file, to_column):
+                continue
+            containment = from_sketch.containment_in(to_sketch)
+            if containment < min_containment:
+                continue
+            candidates.append({
+                "from_file": from_file,
+                "from_column": from_column,
+                "to_file": to_file,
+                "to_column": to_column,
+                "containment": round(containment, 3),
+                "from_distinct": round(from_sketch.distinct_count()),
+                "to_distinct": round(to_sketch.distinct_count()),
+                "from_is_unique": from_sketch.uniqueness() >= MIN_KEY_UNIQUENESS,
+                "name_match": _names_match(from_column, to_column),
+            })
+
+    candidates.sort(key=lambda c: (c["containment"], c["name_match"], not c["from_is_unique"]), reverse=True)
+    return candidates
+
+
+def discover_foreign_keys(tool_context: ToolContext, min_containment: float = 0.8, max_candidates: int = 25) -> Dict[str, Any]:
+    """Discovers likely foreign-key links between columns of the approved files.
+
+    Every column of every approved CSV file is summarized once with compact sketches,
+    which are cached in the file catalog. Column pairs are then ranked by how many
+    values of the referencing column are contained in a key-like column of another file.
+
+    Args:
+        min_containment: the minimum fraction (0.0 - 1.0) of referencing values that must be found in the referenced column
+        max_candidates: the maximum number of candidates to return
+
+    Returns:
+        dict: A dictionary containing metadata about the content.
+                Includes a 'status' key ('success' or 'error').
+                If 'success', includes a 'foreign_key_candidates' key with a ranked 'candidates' list
+                and the 'skipped_files' that could not be analyzed. Each candidate has 'from_file', 'from_column', 'to_file', 'to_column' and a 'containment' score.
+                'from_is_unique' hints that the referencing column is itself a key (a one-to-one link).
+                If 'error', includes an 'error_message' key.
+    """
+    if APPROVED_FILES not in tool_context.state:
+        return tool_error("Approved files have not been set.")
+
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    sketches_by_file = {}
+    skipped = {}
+    for file_path in tool_context.state[APPROVED_FILES]:
+        if content_suffix(Path(file_path)) != ".csv":
+            skipped[file_path] = "not a CSV file"
+            continue
+        if not (import_dir / file_path).is_file():
+            skipped[file_path] = "file does not exist"
+            continue
+        try:
+            sketches_by_file[file_path] = get_column_sketches(import_dir, file_path)
+        except Exception as e:
+            logger.warning(f"Could not sketch columns of {file_path}: {e}")
+            skipped[file_path] = f"could not be read: {e}"
+
+    candidates = rank_foreign_key_candidates(sketches_by_file, min_containment)[:max_candidates]
+    tool_context.state[FOREIGN_KEY_CANDIDATES] = candidates
+
+    return tool_success(FOREIGN_KEY_CANDIDATES, {
+        "candidates": candidates,
+        "skipped_files": skipped,
+    })
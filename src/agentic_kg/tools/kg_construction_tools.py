@@ -1,10 +1,50 @@
+import csv
+import json
 import logging
+import pickle
+import queue
+import shlex
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
 from google.adk.tools import ToolContext
-from typing import Dict, Any, List
+from itertools import batched, islice
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 
-from agentic_kg.common.neo4j_for_adk import get_graphdb
-from agentic_kg.tools.cypher_tools import create_uniqueness_constraint
+from agentic_kg.common.build_checkpoints import CheckpointStore, source_fingerprint
+from agentic_kg.common.build_progress import ProgressRegistry, RuleProgress, estimate_row_count
+from agentic_kg.common.batch_tuning import next_batch_size, record_run
+from agentic_kg.common.bulk_import import (
+    check_bulk_name, bulk_value, import_command, node_header, relationship_header,
+)
+from agentic_kg.common.build_estimates import DEFAULT_ROWS_PER_SECOND, estimate_rule, read_plan, schedule_seconds
+from agentic_kg.common.columnar_cache import find_columnar_copy, row_count
+from agentic_kg.common.config import get_settings
+from agentic_kg.common.file_catalog import (
+    catalog_entry_exists, catalog_name, content_hash, read_catalog_entry, update_catalog_entry, write_catalog_entry,
+)
+from agentic_kg.common.row_delta import DeltaScan
+from agentic_kg.common.csv_files import open_csv_rows, read_csv_header
+from agentic_kg.common.compression import LOAD_CSV_COMPRESSIONS, compression_of, loadable_file
+from agentic_kg.common.duplicate_keys import (
+    DEFAULT_DUPLICATE_POLICY, DUPLICATE_POLICIES, collapse_duplicates, find_duplicate_keys,
+)
+from agentic_kg.common.json_records import is_json_file, iter_flat_records, to_property_value
+from agentic_kg.common.neo4j_for_adk import get_graphdb, quote_symbol
+from agentic_kg.common.plan_sample import PlanSample
+from agentic_kg.common.property_types import coerce_value, cypher_coercion
+from agentic_kg.common.relationship_partitions import RelationshipPartitions, endpoint_degrees
+from agentic_kg.tools.cypher_tools import (
+    await_indexes, create_property_index, create_uniqueness_constraint, get_neo4j_import_dir, list_property_indexes,
+)
 from agentic_kg.common.tool_result import tool_success, tool_error
 
 logger = logging.getLogger(__name__)
@@ -12,39 +52,211 @@ logger = logging.getLogger(__name__)
 graphdb = get_graphdb()
 
 APPROVED_CONSTRUCTION_PLAN = "approved_construction_plan"
+CONSTRUCTION_PROGRESS = "construction_progress"
+BULK_IMPORT = "bulk_import"
 
 def construct_node(construction_rule: dict) -> Dict[str, Any]:
     """Construct a node from the construction rule."""
-    batch_load_nodes_cypher = """
-    LOAD CSV WITH HEADERS FROM "file:///" + $import_file AS row
-    MERGE (n:$($label) {id: row[$unique_column_name]})
-    SET n += row
-    """
-    return graphdb.send_query(batch_load_nodes_cypher, {
-        "import_file": construction_rule["source_file"],
-        "label": construction_rule["label"],
-        "unique_column_name": construction_rule["unique_column_name"],
-        "properties": construction_rule["properties"]
-    })
+    return import_nodes(construction_rule)
 
 def construct_relationship(construction_rule: dict) -> Dict[str, Any]:
     """Construct a relationship from the construction rule."""
-    batch_load_relationships_cypher = """
-    LOAD CSV WITH HEADERS FROM "file:///" + $import_file AS row
-    MATCH (from_node:$($from_node_label) {id: row[$from_node_column]})
-    MATCH (to_node:$($to_node_label) {id: row[$to_node_column]})
-    MERGE (from_node)-[r:$($relationship_type)]->(to_node)
-    SET r += row
+    return import_relationships(construction_rule)
+
+
+# Transaction batching of construction rules
+
+ADAPTIVE_BATCH_SIZE = "adaptive"
+ON_ERROR_MODES = ("fail", "continue", "break")
+BATCH_TUNING = "batch_tuning"
+THROUGHPUT = "throughput"
+
+
+def check_batching(construction_rule: dict) -> Optional[Dict[str, Any]]:
+    """An error if the batching options of a rule are invalid, otherwise None.
+
+    Concurrent transactions are only supported for node rules loaded with LOAD CSV, where MERGE on a
+    constrained key is safe to run concurrently, and for relationship rules with the 'partitioned'
+    loader: otherwise concurrent relationship batches lock the same nodes and deadlock. Error modes
+    other than 'fail' are only supported with LOAD CSV.
     """
-    return graphdb.send_query(batch_load_relationships_cypher, {
-        "import_file": construction_rule["source_file"],
-        "from_node_label": construction_rule["from_node_label"],
-        "to_node_label": construction_rule["to_node_label"],
-        "from_node_column": construction_rule["from_node_column"],
-        "to_node_column": construction_rule["to_node_column"],
-        "relationship_type": construction_rule["relationship_type"],
-        "properties": construction_rule["properties"]
+    batch_size = construction_rule.get("batch_size")
+    if batch_size is not None and batch_size != ADAPTIVE_BATCH_SIZE and (not isinstance(batch_size, int) or batch_size < 1):
+        return tool_error(f"Batch size must be a positive number of rows or '{ADAPTIVE_BATCH_SIZE}', not {batch_size}.")
+    concurrency = construction_rule.get("concurrency", 1)
+    if not isinstance(concurrency, int) or concurrency < 1:
+        return tool_error(f"Concurrency must be a positive number of transactions, not {concurrency}.")
+    on_error = construction_rule.get("on_error", "fail")
+    if on_error not in ON_ERROR_MODES:
+        return tool_error(f"Unknown error mode '{on_error}'. Use one of {', '.join(ON_ERROR_MODES)}.")
+    is_load_csv_node_rule = construction_rule["construction_type"] == "node" and rule_loader(construction_rule) == LOAD_CSV_LOADER
+    is_partitioned = rule_loader(construction_rule) == PARTITIONED_LOADER
+    if on_error != "fail" and not is_load_csv_node_rule:
+        return tool_error("Error modes are only supported for node rules loaded with LOAD CSV.")
+    if concurrency > 1 and not (is_load_csv_node_rule or is_partitioned):
+        return tool_error(
+            "Concurrent transactions are only supported for node rules loaded with LOAD CSV, "
+            f"and relationship rules with the '{PARTITIONED_LOADER}' loader."
+        )
+    return None
+
+
+def _rule_name(construction_rule: dict) -> str:
+    return construction_rule.get("label") or construction_rule["relationship_type"]
+
+
+def _batch_tuning(source_file: str) -> Tuple[Optional[Path], Dict[str, Any]]:
+    """The import directory (None if unknown) and the batch tuning history of the rules loading a file."""
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return None, {}
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    # throughput is still a good guide after the file changes
+    return import_dir, read_catalog_entry(import_dir, BATCH_TUNING, source_file, allow_stale=True) or {}
+
+
+def rule_batch_size(construction_rule: dict) -> int:
+    """The batch size the next import of a rule will use."""
+    default_batch_size = get_settings().construction_batch_size
+    batch_size = construction_rule.get("batch_size") or default_batch_size
+    if batch_size == ADAPTIVE_BATCH_SIZE:
+        _, tuning = _batch_tuning(construction_rule["source_file"])
+        batch_size = next_batch_size(tuning.get(_rule_name(construction_rule)), default_batch_size)
+    return batch_size
+
+
+def _tuned_load(construction_rule: dict, load: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a load with the rule's batch size. An adaptive batch size is tuned from the throughput of earlier runs.
+
+    The throughput of every load is kept in the file catalog, to estimate the next build (see estimate_construction_plan).
+    """
+    adaptive = construction_rule.get("batch_size") == ADAPTIVE_BATCH_SIZE
+    batch_size = rule_batch_size(construction_rule)
+
+    started = time.perf_counter()
+    result = load(batch_size)
+    seconds = time.perf_counter() - started
+    if result["status"] == "error":
+        return result
+
+    rows = result["rows_loaded"]["rows_loaded"]
+    rows_per_second = round(rows / seconds, 1) if seconds > 0 else None
+    result["rows_loaded"].update({"batch_size": batch_size, "rows_per_second": rows_per_second})
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error" or not rows or not rows_per_second:
+        return result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    name = _rule_name(construction_rule)
+    # rules loading the same file share its entries, and may finish at the same time
+    if adaptive:
+        update_catalog_entry(import_dir, BATCH_TUNING, construction_rule["source_file"], lambda tuning: {
+            **(tuning or {}), name: record_run((tuning or {}).get(name), batch_size, rows, seconds)
+        })
+    update_catalog_entry(import_dir, THROUGHPUT, construction_rule["source_file"], lambda throughput: {
+        **(throughput or {}), name: {"rows_per_second": rows_per_second, "batch_size": batch_size}
     })
+    return result
+
+
+def _in_transactions(concurrency: int, on_error: str) -> Tuple[str, str]:
+    """The IN TRANSACTIONS clause of a LOAD CSV import, and the RETURN clause counting its rows."""
+    concurrent = "$concurrency CONCURRENT " if concurrency > 1 else ""
+    clause = f"IN {concurrent}TRANSACTIONS OF $batch_size ROWS"
+    # serially, a failure is caught with ON ERROR BREAK, so the rows committed before it are known
+    mode = "break" if on_error == "fail" and concurrency == 1 else on_error
+    if mode == "fail":
+        return clause, "RETURN count(*) AS rows, count(*) AS rows_committed, null AS error_message"
+    return (
+        f"{clause} ON ERROR {mode.upper()} REPORT STATUS AS status",
+        "RETURN count(*) AS rows, sum(CASE WHEN status.committed THEN 1 ELSE 0 END) AS rows_committed, "
+        "head(collect(status.errorMessage)) AS error_message"
+    )
+
+
+def _watch_entity_count(progress: Optional[RuleProgress], pattern: str) -> None:
+    """Let the progress of a LOAD CSV query estimate its rows from the growth of a label or relationship type count.
+
+    Counts by label and type come from the count store, so polling them is cheap. Rows that
+    update existing nodes or relationships aren't counted.
+    """
+    if progress is None:
+        return
+
+    def entity_count() -> Optional[int]:
+        result = graphdb.send_query(f"MATCH {pattern} RETURN count(*) AS count")
+        if result["status"] == "error" or not result["records"]:
+            return None
+        return result["records"][0]["count"]
+
+    baseline = entity_count()
+    if baseline is not None:
+        def live_rows() -> Optional[int]:
+            count = entity_count()
+            return None if count is None else max(0, count - baseline)
+        progress.live_rows = live_rows
+
+
+def _rows_loaded(result: Dict[str, Any], on_error: str, progress: Optional[RuleProgress]) -> Dict[str, Any]:
+    if result["status"] == "error":
+        return result
+    record = result["records"][0] if result["records"] else {"rows": 0, "rows_committed": 0, "error_message": None}
+    rows_committed = record["rows_committed"]
+    rows_failed = record["rows"] - rows_committed
+    if progress is not None and rows_committed:
+        progress.batch_committed(rows_committed, rows_committed)
+    if rows_failed and on_error == "fail":
+        return tool_error(f"Loading stopped after {rows_committed} rows: {record['error_message']}")
+    return tool_success("rows_loaded", {"rows_loaded": rows_committed, "rows_failed": rows_failed})
+
+
+# Property types: typed columns are converted when written, and empty values are never written
+
+def value_types(property_types: Optional[Dict[str, str]], key_columns: List[str]) -> Dict[str, str]:
+    """The declared (non-string) types of a rule's properties.
+
+    Key columns are left out: they are loaded as text, so relationships keep matching the keys of their nodes.
+    """
+    return {
+        column: property_type for column, property_type in (property_types or {}).items()
+        if column not in key_columns and property_type != "string"
+    }
+
+
+def _set_properties(variable: str, properties: List[str], types: Dict[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Cypher setting only the given properties from a LOAD CSV row, converting the typed ones, and its parameters.
+
+    LOAD CSV reads empty fields as null, and setting a property to null doesn't write it.
+    """
+    typed = [p for p in properties if p in types]
+    clauses = [f"FOREACH (k IN $properties | SET {variable}[k] = row[k])"]
+    for i, p in enumerate(typed):
+        value = cypher_coercion(f"row[$typed_properties[{i}]]", types[p])
+        clauses.append(f"SET {variable}[$typed_properties[{i}]] = {value}")
+    untyped = [p for p in properties if p not in types]
+    return "\n        ".join(clauses), {"properties": untyped, "typed_properties": typed}
+
+
+def nodes_from_csv_query(label: str, unique_column_name: str, properties: list[str], concurrency: int = 1,
+                         on_error: str = "fail", property_types: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, Any]]:
+    """The LOAD CSV query loading nodes, and its parameters apart from 'source_file', 'batch_size' and 'skip_rows'."""
+    in_transactions, returns = _in_transactions(concurrency, on_error)
+    set_properties, property_parameters = _set_properties("n", properties, value_types(property_types, [unique_column_name]))
+
+    # load nodes from CSV file by merging on the unique_column_name value
+    query = f"""LOAD CSV WITH HEADERS FROM "file:///" + $source_file AS row
+    WITH row SKIP $skip_rows
+    CALL (row) {{
+        MERGE (n:$($label) {{ {unique_column_name} : row[$unique_column_name] }})
+        {set_properties}
+    }} {in_transactions}
+    {returns}
+    """
+    return query, {
+        "label": label,
+        "unique_column_name": unique_column_name,
+        **property_parameters,
+        "concurrency": concurrency,
+    }
 
 
 def load_nodes_from_csv(
@@ -52,28 +264,591 @@ def load_nodes_from_csv(
     label: str,
     unique_column_name: str,
     properties: list[str],
+    batch_size: int = 1000,
+    concurrency: int = 1,
+    on_error: str = "fail",
+    progress: Optional[RuleProgress] = None,
+    property_types: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
-    """Batch loading of nodes from a CSV file"""
+    """Batch loading of nodes from a CSV file.
 
-    # load nodes from CSV file by merging on the unique_column_name value
+    Properties with a type in property_types are converted to it (see agentic_kg.common.property_types).
+
+    With a concurrency above 1, that many transactions are written at once, using the server's cores.
+    With on_error 'continue' (or 'break'), a failed batch is counted in 'rows_failed' and
+    the load goes on with the next batch (or stops), keeping the batches already written.
+    With progress, the rows committed by an earlier run are skipped, and the rows committed now are reported.
+    """
+    _watch_entity_count(progress, f"(:{quote_symbol(label)})")
+    query, parameters = nodes_from_csv_query(label, unique_column_name, properties, concurrency, on_error, property_types)
+    results = graphdb.send_query(query, {
+        "source_file": source_file,
+        **parameters,
+        "batch_size": batch_size,
+        "skip_rows": progress.skip_rows if progress else 0,
+    })
+    return _rows_loaded(results, on_error, progress)
+
+
+def relationships_from_csv_query(relationship_construction: dict) -> Tuple[str, Dict[str, Any]]:
+    """The LOAD CSV query loading relationships, and its parameters apart from 'source_file', 'batch_size' and 'skip_rows'."""
+    # match the endpoint nodes on the property named after the relationship file's columns
+    from_node_column = relationship_construction["from_node_column"]
+    to_node_column = relationship_construction["to_node_column"]
+    in_transactions, returns = _in_transactions(1, "fail")
+    set_properties, property_parameters = _set_properties("r", relationship_construction["properties"], value_types(
+        relationship_construction.get("property_types"), [from_node_column, to_node_column]
+    ))
     query = f"""LOAD CSV WITH HEADERS FROM "file:///" + $source_file AS row
+    WITH row SKIP $skip_rows
     CALL (row) {{
-        MERGE (n:$($label) {{ {unique_column_name} : row[$unique_column_name] }})
-        FOREACH (k IN $properties | SET n[k] = row[k])
-    }} IN TRANSACTIONS OF 1000 ROWS
+        MATCH (from_node:$($from_node_label) {{ {from_node_column} : row[$from_node_column] }}),
+              (to_node:$($to_node_label) {{ {to_node_column} : row[$to_node_column] }} )
+        MERGE (from_node)-[r:$($relationship_type)]->(to_node)
+        {set_properties}
+    }} {in_transactions}
+    {returns}
     """
+    return query, {
+        "from_node_label": relationship_construction["from_node_label"],
+        "from_node_column": from_node_column,
+        "to_node_label": relationship_construction["to_node_label"],
+        "to_node_column": to_node_column,
+        "relationship_type": relationship_construction["relationship_type"],
+        **property_parameters,
+    }
 
+
+def load_relationships_from_csv(source_file: str, relationship_construction: dict, batch_size: int = 1000,
+                                progress: Optional[RuleProgress] = None) -> Dict[str, Any]:
+    """Batch loading of relationships from a CSV file, one transaction at a time"""
+    _watch_entity_count(progress, f"()-[:{quote_symbol(relationship_construction['relationship_type'])}]->()")
+    query, parameters = relationships_from_csv_query(relationship_construction)
     results = graphdb.send_query(query, {
         "source_file": source_file,
-        "label": label,
-        "unique_column_name": unique_column_name,
-        "properties": properties
+        **parameters,
+        "batch_size": batch_size,
+        "skip_rows": progress.skip_rows if progress else 0,
     })
-    return results
+    return _rows_loaded(results, "fail", progress)
+
+
+def loadable_source_file(source_file: str) -> Dict[str, Any]:
+    """Resolve the file LOAD CSV should read for a source file.
+
+    LOAD CSV reads plain and gzip-compressed files directly; files with other
+    compressions are loaded from a gzip copy in the import directory.
+    """
+    if compression_of(source_file) in LOAD_CSV_COMPRESSIONS:
+        return tool_success("source_file", source_file)
+
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    try:
+        return tool_success("source_file", loadable_file(Path(import_dir_result["neo4j_import_dir"]), source_file))
+    except Exception as e:
+        return tool_error(f"Could not prepare compressed file {source_file} for loading: {e}")
+
+
+# Client-side loading: rows are streamed by the client and written with UNWIND $rows batches
+
+LOAD_CSV_LOADER = "load_csv"
+CLIENT_LOADER = "client"
+PARTITIONED_LOADER = "partitioned"
+LOADERS = (LOAD_CSV_LOADER, CLIENT_LOADER, PARTITIONED_LOADER)
+
+CLIENT_BATCH_SIZE = 1000
+PIPELINE_DEPTH = 2
+
+
+def rule_loader(construction_rule: dict) -> str:
+    """The loader of a construction rule: its 'loader' if set, otherwise LOAD CSV for the files it can read
+    (CSV files in the import directory) and the client for anything else."""
+    if construction_rule.get("loader"):
+        return construction_rule["loader"]
+    source_file = construction_rule["source_file"]
+    if is_json_file(source_file) or Path(source_file).is_absolute():
+        return CLIENT_LOADER
+    return LOAD_CSV_LOADER
+
+
+def check_loader(construction_rule: dict) -> Optional[Dict[str, Any]]:
+    """An error if the loader of a rule can't load its source file, otherwise None."""
+    loader = rule_loader(construction_rule)
+    source_file = construction_rule["source_file"]
+    if loader not in LOADERS:
+        return tool_error(f"Unknown loader '{loader}'. Use one of {', '.join(LOADERS)}.")
+    if loader == LOAD_CSV_LOADER and (is_json_file(source_file) or Path(source_file).is_absolute()):
+        return tool_error(f"LOAD CSV can only read CSV files in the import directory, not {source_file}. Use the '{CLIENT_LOADER}' loader.")
+    if loader == PARTITIONED_LOADER and construction_rule["construction_type"] != "relationship":
+        return tool_error(f"The '{PARTITIONED_LOADER}' loader is only for relationship rules.")
+    return None
+
+
+def _source_path(source_file: str) -> Dict[str, Any]:
+    """The path of a source file: absolute paths as they are, anything else relative to the import directory."""
+    path = Path(source_file)
+    if not path.is_absolute():
+        import_dir_result = get_neo4j_import_dir()
+        if import_dir_result["status"] == "error":
+            return import_dir_result
+        path = Path(import_dir_result["neo4j_import_dir"]) / source_file
+    if not path.is_file():
+        return tool_error(f"Source file does not exist: {source_file}")
+    return tool_success("path", path)
+
+
+def _csv_property_rows(path: Path, columns: List[str]) -> Iterator[Dict[str, Any]]:
+    # like LOAD CSV, empty fields are null
+    with open_csv_rows(path) as (header, rows):
+        positions = [(column, header.index(column)) for column in columns]
+        for row in rows:
+            yield {column: row[i] if i < len(row) and row[i] != "" else None for column, i in positions}
+
+
+def _typed_rows(rows: Iterator[Dict[str, Any]], key_columns: List[str], types: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    # values of the properties are converted to their types, and empty values dropped; keys stay as they are
+    for row in rows:
+        yield {
+            column: value if column in key_columns else coerce_value(value, types.get(column, "string"))
+            for column, value in row.items()
+        }
+
+
+def _property_rows(source_file: str, columns: List[str], key_columns: Optional[List[str]] = None,
+                   types: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Lazily read the given columns (flattened, for JSON) of every row of a CSV or JSON source file.
+
+    With key_columns, the values of the other columns are converted to their types, if any, and empty ones are None.
+    """
+    path_result = _source_path(source_file)
+    if path_result["status"] == "error":
+        return path_result
+    path = path_result["path"]
+    if is_json_file(path):
+        rows = (
+            {column: to_property_value(record.get(column)) for column in columns}
+            for record in iter_flat_records(path)
+        )
+        return tool_success("rows", rows if key_columns is None else _typed_rows(rows, key_columns, types or {}))
+    try:
+        header, _ = read_csv_header(path)
+    except Exception as e:
+        return tool_error(f"Could not read {source_file}: {e}")
+    missing = [column for column in columns if column not in header]
+    if missing:
+        return tool_error(f"{source_file} has no column(s) {missing}. Available columns are {header}.")
+    rows = _csv_property_rows(path, columns)
+    return tool_success("rows", rows if key_columns is None else _typed_rows(rows, key_columns, types or {}))
+
+
+def _prefetched(items: Iterator[Any], depth: int = PIPELINE_DEPTH) -> Iterator[Any]:
+    """Produce items on a background thread, up to `depth` ahead of the consumer.
+
+    Reading and transforming the next batch then overlaps with writing the current one.
+    Exceptions raised by the producer are re-raised to the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
 
-def import_nodes(node_construction: dict) -> dict:
-    """Import nodes as defined by a node construction rule."""
+    producer = threading.Thread(target=produce, name="construction-rows", daemon=True)
+    producer.start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        # the consumer may stop early, for example after a failed batch
+        stopped.set()
+        producer.join()
+
+
+def _send_batches(query: str, rows: Iterator[Dict[str, Any]], key_columns: List[str],
+                  parameters: Dict[str, Any], batch_size: int, progress: Optional[RuleProgress] = None) -> Dict[str, Any]:
+    """Send rows to an UNWIND $rows query in batches, one transaction per batch. Rows missing a key are skipped.
+
+    Rows are read and batched on a background thread while the previous batch is written.
+    With progress, the rows committed by an earlier run are skipped, and every committed batch is reported.
+    """
+    if progress is not None and progress.skip_rows:
+        rows = islice(rows, progress.skip_rows, None)
+
+    def keyed_batches():
+        for batch in batched(rows, batch_size):
+            keyed = [row for row in batch if all(row[column] is not None for column in key_columns)]
+            yield keyed, len(batch) - len(keyed)
+
+    rows_loaded = 0
+    rows_skipped = 0
+    batch_count = 0
+    pipeline = _prefetched(keyed_batches())
+    try:
+        for keyed, skipped in pipeline:
+            rows_skipped += skipped
+            if keyed:
+                result = graphdb.send_query(query, {**parameters, "rows": keyed})
+                if result["status"] == "error":
+                    return tool_error(f"Loading stopped after {rows_loaded} rows: {result['error_message']}")
+                rows_loaded += len(keyed)
+                batch_count += 1
+            if progress is not None:
+                progress.batch_committed(len(keyed) + skipped, len(keyed))
+    except Exception as e:
+        return tool_error(f"Loading stopped after {rows_loaded} rows: {e}")
+    finally:
+        pipeline.close()
+    return tool_success("rows_loaded", {"rows_loaded": rows_loaded, "rows_skipped": rows_skipped, "batches": batch_count})
+
+
+def nodes_from_client_query(label: str, unique_column_name: str, properties: list[str]) -> Tuple[str, Dict[str, Any]]:
+    """The UNWIND $rows query loading nodes, and its parameters apart from 'rows'."""
+    # column names may contain dots (flattened JSON) or spaces, so they are quoted
+    query = f"""UNWIND $rows AS row
+    MERGE (n:$($label) {{ `{unique_column_name}` : row[$unique_column_name] }})
+    FOREACH (k IN $properties | SET n[k] = row[k])
+    """
+    return query, {"label": label, "unique_column_name": unique_column_name, "properties": properties}
+
+
+def load_nodes_from_client(
+    source_file: str,
+    label: str,
+    unique_column_name: str,
+    properties: list[str],
+    batch_size: int = CLIENT_BATCH_SIZE,
+    row_filter: Optional[Callable[[Iterator[Dict[str, Any]]], Iterator[Dict[str, Any]]]] = None,
+    progress: Optional[RuleProgress] = None,
+    property_types: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Batch loading of nodes from a CSV or JSON file, streamed from the client in UNWIND batches.
+
+    A row_filter, if given, chooses which of the rows are loaded (see import_rule_delta).
+    Properties with a type in property_types are converted to it.
+    """
+    rows_result = _property_rows(
+        source_file, list(dict.fromkeys([unique_column_name, *properties])),
+        [unique_column_name], value_types(property_types, [unique_column_name])
+    )
+    if rows_result["status"] == "error":
+        return rows_result
+    rows = row_filter(rows_result["rows"]) if row_filter else rows_result["rows"]
+    query, parameters = nodes_from_client_query(label, unique_column_name, properties)
+    return _send_batches(query, rows, [unique_column_name], parameters, batch_size, progress)
+
+
+def relationships_from_client_query(relationship_construction: dict) -> Tuple[str, Dict[str, Any]]:
+    """The UNWIND $rows query loading relationships, and its parameters apart from 'rows'."""
+    from_node_column = relationship_construction["from_node_column"]
+    to_node_column = relationship_construction["to_node_column"]
+    query = f"""UNWIND $rows AS row
+    MATCH (from_node:$($from_node_label) {{ `{from_node_column}` : row[$from_node_column] }}),
+          (to_node:$($to_node_label) {{ `{to_node_column}` : row[$to_node_column] }} )
+    MERGE (from_node)-[r:$($relationship_type)]->(to_node)
+    FOREACH (k IN $properties | SET r[k] = row[k])
+    """
+    return query, {
+        "from_node_label": relationship_construction["from_node_label"],
+        "from_node_column": from_node_column,
+        "to_node_label": relationship_construction["to_node_label"],
+        "to_node_column": to_node_column,
+        "relationship_type": relationship_construction["relationship_type"],
+        "properties": relationship_construction["properties"]
+    }
+
+
+def load_relationships_from_client(
+    relationship_construction: dict,
+    batch_size: int = CLIENT_BATCH_SIZE,
+    row_filter: Optional[Callable[[Iterator[Dict[str, Any]]], Iterator[Dict[str, Any]]]] = None,
+    progress: Optional[RuleProgress] = None,
+) -> Dict[str, Any]:
+    """Batch loading of relationships from a CSV or JSON file, streamed from the client in UNWIND batches.
+
+    A row_filter, if given, chooses which of the rows are loaded (see import_rule_delta).
+    """
+    from_node_column = relationship_construction["from_node_column"]
+    to_node_column = relationship_construction["to_node_column"]
+    properties = relationship_construction["properties"]
+    key_columns = [from_node_column, to_node_column]
+    rows_result = _property_rows(
+        relationship_construction["source_file"],
+        list(dict.fromkeys([*key_columns, *properties])),
+        key_columns, value_types(relationship_construction.get("property_types"), key_columns)
+    )
+    if rows_result["status"] == "error":
+        return rows_result
+    rows = row_filter(rows_result["rows"]) if row_filter else rows_result["rows"]
+    query, parameters = relationships_from_client_query(relationship_construction)
+    return _send_batches(query, rows, key_columns, parameters, batch_size, progress)
+
+
+# Partitioned relationship loads: rows are split by their endpoint keys, so transactions sharing no node commit at once
+
+def _write_lanes(query: str, parameters: Dict[str, Any], rows: Iterator[Dict[str, Any]],
+                 lane_of: Callable[[Dict[str, Any]], Optional[int]], lanes: int, batch_size: int,
+                 committed: Callable[[int], None]) -> Optional[str]:
+    """Write rows to an UNWIND $rows query in concurrent lanes, one transaction per batch of a lane.
+
+    lane_of chooses the lane of a row, or None to leave it out. Each lane queues up to PIPELINE_DEPTH
+    batches, so memory stays bounded. After a failed batch the other lanes stop too.
+
+    Returns:
+        The error message of the first failed batch, or None.
+    """
+    batch_queues = [queue.Queue(maxsize=PIPELINE_DEPTH) for _ in range(lanes)]
+    errors: List[str] = []
+    failed = threading.Event()
+
+    def write(batches: queue.Queue) -> None:
+        # a lane keeps taking batches after a failure, so the reader is never blocked on a full queue
+        for batch in iter(batches.get, None):
+            if failed.is_set():
+                continue
+            try:
+                result = graphdb.send_query(query, {**parameters, "rows": batch})
+            except Exception as e:
+                result = tool_error(str(e))
+            if result["status"] == "error":
+                errors.append(result["error_message"])
+                failed.set()
+            else:
+                committed(len(batch))
+
+    with ThreadPoolExecutor(max_workers=lanes, thread_name_prefix="construction-lane") as executor:
+        for batches in batch_queues:
+            executor.submit(write, batches)
+        buffers: List[List[Dict[str, Any]]] = [[] for _ in range(lanes)]
+        try:
+            for row in rows:
+                if failed.is_set():
+                    break
+                lane = lane_of(row)
+                if lane is None:
+                    continue
+                buffers[lane].append(row)
+                if len(buffers[lane]) >= batch_size:
+                    batch_queues[lane].put(buffers[lane])
+                    buffers[lane] = []
+            for lane, buffer in enumerate(buffers):
+                if buffer and not failed.is_set():
+                    batch_queues[lane].put(buffer)
+        except Exception as e:
+            errors.append(str(e))
+            failed.set()
+        finally:
+            for batches in batch_queues:
+                batches.put(None)
+    return errors[0] if errors else None
+
+
+def load_relationships_partitioned(
+    relationship_construction: dict,
+    batch_size: int = CLIENT_BATCH_SIZE,
+    concurrency: Optional[int] = None,
+    row_filter: Optional[Callable[[Iterator[Dict[str, Any]]], Iterator[Dict[str, Any]]]] = None,
+    progress: Optional[RuleProgress] = None,
+) -> Dict[str, Any]:
+    """Batch loading of relationships in concurrent lanes whose transactions share no node (see relationship_partitions).
+
+    The source file is streamed once: while the relationships of every key are counted, each row is
+    spooled to a temporary file of the round its cell is written in. Each round then reads its spool,
+    setting aside the rows of hub nodes (known once every row was counted) for the serial lane, which
+    is written last. Lanes commit out of order, so a resumed build loads the rule again from its first
+    row, which MERGE makes safe.
+
+    Args:
+        concurrency: the number of partitions of each end (the most lanes at once); CONSTRUCTION_MAX_WORKERS by default
+        row_filter: chooses which of the rows are loaded
+    """
+    concurrency = concurrency or get_settings().construction_max_workers
+    from_node_column = relationship_construction["from_node_column"]
+    to_node_column = relationship_construction["to_node_column"]
+    key_columns = [from_node_column, to_node_column]
+    columns = list(dict.fromkeys([*key_columns, *relationship_construction["properties"]]))
+    types = value_types(relationship_construction.get("property_types"), key_columns)
+    same_label = relationship_construction["from_node_label"] == relationship_construction["to_node_label"]
+
+    rows_result = _property_rows(relationship_construction["source_file"], columns, key_columns, types)
+    if rows_result["status"] == "error":
+        return rows_result
+    rows = row_filter(rows_result["rows"]) if row_filter is not None else rows_result["rows"]
+
+    def keyed(row: Dict[str, Any]) -> bool:
+        return row[from_node_column] is not None and row[to_node_column] is not None
+
+    with tempfile.TemporaryDirectory(prefix="partitioned-") as spool_dir:
+        # the cells of rows don't depend on the hubs, so rows are spooled before the hubs are known
+        layout = RelationshipPartitions(concurrency, same_label, set(), set())
+        spool_paths = [Path(spool_dir) / f"round-{r}.pickle" for r in range(len(layout.rounds))]
+        hub_path = Path(spool_dir) / "hubs.pickle"
+
+        def spooled(rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            with ExitStack() as stack:
+                spools = [stack.enter_context(open(path, "wb")) for path in spool_paths]
+                for row in rows:
+                    if keyed(row):
+                        cell_round, _ = layout.lane(layout.cell(row[from_node_column], row[to_node_column]))
+                        pickle.dump(row, spools[cell_round])
+                    yield row
+
+        try:
+            degrees = endpoint_degrees(spooled(rows), from_node_column, to_node_column)
+        except Exception as e:
+            return tool_error(f"Could not read {relationship_construction['source_file']}: {e}")
+        partitions = RelationshipPartitions.from_degrees(degrees, concurrency, same_label)
+        query, parameters = relationships_from_client_query(relationship_construction)
+
+        lock = threading.Lock()
+        counts = {"rows_loaded": 0, "batches": 0, "hub_rows": 0}
+
+        def committed(rows: int) -> None:
+            with lock:
+                counts["rows_loaded"] += rows
+                counts["batches"] += 1
+
+        if progress is not None:
+            # there is no committed prefix of the file to resume after, and batches are counted as rows written
+            progress.skip_rows = 0
+            progress.live_rows = lambda: counts["rows_loaded"]
+
+        with open(hub_path, "wb") as hub_spool:
+            def lane_of(row: Dict[str, Any]) -> Optional[int]:
+                cell = partitions.cell(row[from_node_column], row[to_node_column])
+                if cell is None:
+                    pickle.dump(row, hub_spool)
+                    counts["hub_rows"] += 1
+                    return None
+                return partitions.lane(cell)[1]
+
+            for lanes, spool_path in zip(partitions.rounds, spool_paths):
+                error = _write_lanes(query, parameters, _unspooled(spool_path), lane_of, len(lanes), batch_size, committed)
+                if error:
+                    return tool_error(f"Loading stopped after {counts['rows_loaded']} rows: {error}")
+
+        error = _write_lanes(query, parameters, _unspooled(hub_path), lambda row: 0, 1, batch_size, committed)
+        if error:
+            return tool_error(f"Loading stopped after {counts['rows_loaded']} rows: {error}")
+    return tool_success("rows_loaded", {
+        **counts,
+        "rows_skipped": degrees["rows"] - degrees["keyed_rows"],
+        "partitions": concurrency,
+        "rounds": len(partitions.rounds),
+        "hub_nodes": partitions.hub_count,
+    })
+
+
+def _unspooled(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream back the rows spooled to a file."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+# Duplicate keys: repeated keys are found in a pre-pass, and their rows collapsed before they are written
+
+DUPLICATE_KEYS = "duplicate_keys"
+
+
+def check_duplicates(construction_rule: dict) -> Optional[Dict[str, Any]]:
+    """An error if the duplicate key policy of a rule is unknown, otherwise None."""
+    policy = construction_rule.get(DUPLICATE_KEYS)
+    if policy is not None and policy not in DUPLICATE_POLICIES:
+        return tool_error(f"Unknown duplicate key policy '{policy}'. Use one of {', '.join(DUPLICATE_POLICIES)}.")
+    return None
+
+
+def _find_duplicates(construction_rule: dict) -> Optional[Dict[str, Any]]:
+    """The duplicate keys of a rule's source file (see find_duplicate_keys), or None if the client can't read it.
+
+    LOAD CSV rules may load files the client can't read, for example from a remote server, and are then loaded as they are.
+    """
+    key_columns, columns = _rule_columns(construction_rule)
+    rows_result = _property_rows(construction_rule["source_file"], columns)
+    if rows_result["status"] == "error":
+        return None
+    try:
+        return find_duplicate_keys(rows_result["rows"], key_columns)
+    except Exception as e:
+        logger.warning(f"Could not check {construction_rule['source_file']} for duplicate keys: {e}")
+        return None
+
+
+def _import_duplicates(construction_rule: dict) -> Optional[Dict[str, Any]]:
+    """The duplicate keys of a rule about to be imported, or None if the pre-pass is skipped.
+
+    A LOAD CSV rule without a 'duplicate_keys' policy is left to MERGE, which keeps the last row of each key
+    like the default policy does, so its file isn't read an extra time.
+    """
+    if rule_loader(construction_rule) == LOAD_CSV_LOADER and not construction_rule.get(DUPLICATE_KEYS):
+        return None
+    return _find_duplicates(construction_rule)
+
+
+def _collapser(construction_rule: dict, found: Optional[Dict[str, Any]]):
+    """A row filter collapsing the rows of the rule's duplicate keys, or None if there are none."""
+    if not found or not found["duplicates"]:
+        return None
+    key_columns, _ = _rule_columns(construction_rule)
+    policy = construction_rule.get(DUPLICATE_KEYS) or DEFAULT_DUPLICATE_POLICY
+    return lambda rows: collapse_duplicates(rows, key_columns, found["duplicates"], policy)
+
+
+def _import_loader(construction_rule: dict, collapse) -> str:
+    """The loader of an import. LOAD CSV can't collapse duplicate rows, so unless it was chosen explicitly,
+    a rule with duplicate keys is loaded by the client instead."""
+    loader = rule_loader(construction_rule)
+    if (collapse is not None and loader == LOAD_CSV_LOADER and not construction_rule.get("loader")
+            and check_batching({**construction_rule, "loader": CLIENT_LOADER}) is None):
+        return CLIENT_LOADER
+    return loader
+
+
+def _with_duplicates(result: Dict[str, Any], construction_rule: dict, found: Optional[Dict[str, Any]], collapsed: bool) -> Dict[str, Any]:
+    """Add the duplicate keys of a rule to the report of its import."""
+    if result["status"] == "error" or found is None:
+        return result
+    report_key = "delta" if "delta" in result else "rows_loaded"
+    result[report_key]["duplicates"] = {
+        "policy": construction_rule.get(DUPLICATE_KEYS) or DEFAULT_DUPLICATE_POLICY,
+        "duplicate_keys": found["duplicate_keys"],
+        "duplicate_rows": found["duplicate_rows"],
+        "collapsed": collapsed,
+    }
+    return result
+
+
+def import_nodes(node_construction: dict, progress: Optional[RuleProgress] = None) -> dict:
+    """Import nodes as defined by a node construction rule.
+
+    Repeated keys are found first, and their rows collapsed by the rule's 'duplicate_keys' policy
+    ('last' by default), so each node is merged once.
+    """
 
     # create a uniqueness constraint for the unique_column
     uniqueness_result = create_uniqueness_constraint(
@@ -84,65 +859,1231 @@ def import_nodes(node_construction: dict) -> dict:
     if (uniqueness_result["status"] == "error"):
         return uniqueness_result
 
+    options_error = check_loader(node_construction) or check_batching(node_construction) or check_duplicates(node_construction)
+    if options_error:
+        return options_error
+    found = _import_duplicates(node_construction)
+    collapse = _collapser(node_construction, found)
+
+    # import nodes streamed by the client
+    if _import_loader(node_construction, collapse) == CLIENT_LOADER:
+        return _with_duplicates(_tuned_load(node_construction, lambda batch_size: load_nodes_from_client(
+            node_construction["source_file"],
+            node_construction["label"],
+            node_construction["unique_column_name"],
+            node_construction["properties"],
+            batch_size,
+            row_filter=collapse,
+            progress=progress,
+            property_types=node_construction.get("property_types")
+        )), node_construction, found, collapse is not None)
+
+    source_file_result = loadable_source_file(node_construction["source_file"])
+    if source_file_result["status"] == "error":
+        return source_file_result
+
     # import nodes from csv
-    load_nodes_result = load_nodes_from_csv(
-        node_construction["source_file"],
+    return _with_duplicates(_tuned_load(node_construction, lambda batch_size: load_nodes_from_csv(
+        source_file_result["source_file"],
         node_construction["label"],
         node_construction["unique_column_name"],
-        node_construction["properties"]
+        node_construction["properties"],
+        batch_size,
+        node_construction.get("concurrency", 1),
+        node_construction.get("on_error", "fail"),
+        progress,
+        node_construction.get("property_types")
+    )), node_construction, found, False)
+
+
+def import_relationships(relationship_construction: dict, progress: Optional[RuleProgress] = None) -> Dict[str, Any]:
+    """Import relationships as defined by a relationship construction rule.
+
+    Rows repeating a (from, to) pair are collapsed by the rule's 'duplicate_keys' policy, like those of node rules.
+    """
+
+    options_error = (check_loader(relationship_construction) or check_batching(relationship_construction)
+                     or check_duplicates(relationship_construction))
+    if options_error:
+        return options_error
+    found = _import_duplicates(relationship_construction)
+    collapse = _collapser(relationship_construction, found)
+
+    loader = _import_loader(relationship_construction, collapse)
+    if loader == CLIENT_LOADER:
+        return _with_duplicates(_tuned_load(relationship_construction, lambda batch_size: load_relationships_from_client(
+            relationship_construction, batch_size, row_filter=collapse, progress=progress
+        )), relationship_construction, found, collapse is not None)
+    if loader == PARTITIONED_LOADER:
+        return _with_duplicates(_tuned_load(relationship_construction, lambda batch_size: load_relationships_partitioned(
+            relationship_construction, batch_size, relationship_construction.get("concurrency"),
+            row_filter=collapse, progress=progress
+        )), relationship_construction, found, collapse is not None)
+
+    source_file_result = loadable_source_file(relationship_construction["source_file"])
+    if source_file_result["status"] == "error":
+        return source_file_result
+
+    return _with_duplicates(_tuned_load(relationship_construction, lambda batch_size: load_relationships_from_csv(
+        source_file_result["source_file"], relationship_construction, batch_size, progress
+    )), relationship_construction, found, False)
+
+
+def import_rule(construction_rule: dict, progress: Optional[RuleProgress] = None) -> Dict[str, Any]:
+    """Import the nodes or relationships of one construction rule."""
+    if construction_rule["construction_type"] == "node":
+        return import_nodes(construction_rule, progress)
+    if construction_rule["construction_type"] == "relationship":
+        return import_relationships(construction_rule, progress)
+    return tool_error(f"Unknown construction type {construction_rule['construction_type']}")
+
+
+# Delta imports: only the rows that changed since the last import are written
+
+ROW_FINGERPRINTS = "row_fingerprints"
+
+
+def _fingerprints_kind(construction_rule: dict) -> str:
+    """The catalog kind of a rule's row fingerprints. Labels and types may hold any character, like '/'."""
+    return f"{ROW_FINGERPRINTS}/{catalog_name(_rule_name(construction_rule))}"
+
+
+def _rule_columns(construction_rule: dict) -> Tuple[List[str], List[str]]:
+    """The key columns of a rule, and all the columns it loads."""
+    if construction_rule["construction_type"] == "node":
+        key_columns = [construction_rule["unique_column_name"]]
+    else:
+        key_columns = [construction_rule["from_node_column"], construction_rule["to_node_column"]]
+    return key_columns, list(dict.fromkeys([*key_columns, *construction_rule["properties"]]))
+
+
+def _delete_rows(construction_rule: dict, keys: List[List[Any]], batch_size: int) -> Dict[str, Any]:
+    """Delete the nodes (or relationships) of a rule with the given key values."""
+    rows = iter([{"key": key} for key in keys])
+    if construction_rule["construction_type"] == "node":
+        query = f"""UNWIND $rows AS row
+        MATCH (n:$($label) {{ `{construction_rule["unique_column_name"]}` : row.key[0] }})
+        DETACH DELETE n
+        """
+        return _send_batches(query, rows, ["key"], {"label": construction_rule["label"]}, batch_size)
+    query = f"""UNWIND $rows AS row
+    MATCH (:$($from_node_label) {{ `{construction_rule["from_node_column"]}` : row.key[0] }})
+          -[r:$($relationship_type)]->
+          (:$($to_node_label) {{ `{construction_rule["to_node_column"]}` : row.key[1] }})
+    DELETE r
+    """
+    return _send_batches(query, rows, ["key"], {
+        "from_node_label": construction_rule["from_node_label"],
+        "to_node_label": construction_rule["to_node_label"],
+        "relationship_type": construction_rule["relationship_type"],
+    }, batch_size)
+
+
+def import_rule_delta(construction_rule: dict, delete_missing: bool = False,
+                      progress: Optional[RuleProgress] = None, dependents: Optional[List[dict]] = None) -> Dict[str, Any]:
+    """Import only the rows of a rule that were inserted or updated since its last import.
+
+    The rows of the source file are always streamed by the client, which fingerprints each of
+    them, in a single lane: deltas are small, so a rule's concurrency and error mode only apply to
+    its full imports. Fingerprints are kept in the file catalog, and only replaced once the delta is written,
+    so a failed delta import is simply repeated next time. The first delta import of a rule
+    loads every row.
+
+    Deleted nodes take their relationships with them, and relationship rows written while their node
+    was missing matched nothing, so the fingerprints of the dependents' rows ending at inserted or
+    deleted nodes are forgotten (see forget_relationship_fingerprints).
+
+    Args:
+        construction_rule: a node or relationship construction rule
+        delete_missing: also delete the nodes (or relationships) whose rows were removed from the file
+        dependents: for a node rule, the relationship rules that end at its nodes
+
+    Returns:
+        A dictionary with a 'delta' key counting the rows 'inserted', 'updated', 'unchanged',
+        'deleted' and 'rows_skipped' (missing a key), and whether the whole file was 'file_unchanged'.
+    """
+    serial_rule = {**construction_rule, "loader": CLIENT_LOADER, "concurrency": 1, "on_error": "fail"}
+    options_error = check_batching(serial_rule) or check_duplicates(construction_rule)
+    if options_error:
+        return options_error
+    source_file = construction_rule["source_file"]
+    path_result = _source_path(source_file)
+    if path_result["status"] == "error":
+        return path_result
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+
+    kind = _fingerprints_kind(construction_rule)
+    key_columns, columns = _rule_columns(construction_rule)
+    previous = read_catalog_entry(import_dir, kind, source_file, allow_stale=True) or {}
+    file_hash = content_hash(path_result["path"])
+    # unless removed rows kept in the graph are now to be deleted
+    pending_deletes = delete_missing and previous.get("retained", 0) > 0
+    types = value_types(construction_rule.get("property_types"), key_columns)
+    policy = construction_rule.get(DUPLICATE_KEYS) or DEFAULT_DUPLICATE_POLICY
+    same_rule = (previous.get("columns") == columns and previous.get("property_types", {}) == types
+                 and previous.get(DUPLICATE_KEYS, DEFAULT_DUPLICATE_POLICY) == policy)
+    if previous.get("content_hash") == file_hash and same_rule and not pending_deletes:
+        return tool_success("delta", {
+            "inserted": 0, "updated": 0, "unchanged": len(previous["rows"]) - previous.get("retained", 0), "deleted": 0,
+            "rows_skipped": 0, "file_unchanged": True
+        })
+
+    if construction_rule["construction_type"] == "node":
+        create_result = create_uniqueness_constraint(construction_rule["label"], construction_rule["unique_column_name"])
+        if create_result["status"] == "error":
+            return create_result
+
+    # only worth remembering the inserted keys if a dependent remembers rows that may end at them
+    track_inserts = bool(dependents) and any(
+        catalog_entry_exists(import_dir, _fingerprints_kind(rule), rule["source_file"]) for rule in dependents
     )
+    scan = DeltaScan(previous.get("rows", {}), key_columns, columns, reload=not same_rule, track_inserts=track_inserts)
+    # each key is fingerprinted once, after its duplicate rows are collapsed
+    found = _find_duplicates(construction_rule)
+    collapse = _collapser(construction_rule, found)
+    row_filter = (lambda rows: scan.changed_rows(collapse(rows))) if collapse else scan.changed_rows
+    batch_size = construction_rule.get("batch_size")
+    if not isinstance(batch_size, int):
+        batch_size = get_settings().construction_batch_size
+    if construction_rule["construction_type"] == "node":
+        load_rows = lambda: load_nodes_from_client(
+            source_file, construction_rule["label"], construction_rule["unique_column_name"],
+            construction_rule["properties"], batch_size, row_filter=row_filter, progress=progress,
+            property_types=construction_rule.get("property_types")
+        )
+    else:
+        load_rows = lambda: load_relationships_from_client(construction_rule, batch_size, row_filter=row_filter, progress=progress)
+    load_result = load_rows()
+    if load_result["status"] == "error":
+        return load_result
 
-    return load_nodes_result
+    deleted_keys = scan.deleted_keys()
+    if delete_missing and deleted_keys:
+        delete_result = _delete_rows(construction_rule, deleted_keys, batch_size)
+        if delete_result["status"] == "error":
+            return delete_result
+    if dependents:
+        changed_keys = (scan.inserted_keys or []) + (deleted_keys if delete_missing else [])
+        forget_relationship_fingerprints(construction_rule, dependents, [key[0] for key in changed_keys])
 
+    # rows removed from the file but kept in the graph stay fingerprinted, so they can still be deleted later
+    retained = {} if delete_missing else {k: v for k, v in scan.previous.items() if k not in scan.fingerprints}
+    write_catalog_entry(import_dir, kind, source_file, {
+        "content_hash": file_hash,
+        "columns": columns,
+        "property_types": types,
+        DUPLICATE_KEYS: policy,
+        "rows": {**retained, **scan.fingerprints},
+        "retained": len(retained),
+    })
+    return _with_duplicates(tool_success("delta", {
+        **scan.counts(),
+        "deleted": len(deleted_keys) if delete_missing else 0,
+        "rows_skipped": load_result["rows_loaded"]["rows_skipped"],
+        "file_unchanged": False
+    }), construction_rule, found, collapse is not None)
 
-def import_relationships(relationship_construction: dict) -> Dict[str, Any]:
-    """Import relationships as defined by a relationship construction rule."""
 
-    # load nodes from CSV file by merging on the unique_column_name value 
-    from_node_column = relationship_construction["from_node_column"]
-    to_node_column = relationship_construction["to_node_column"]
-    query = f"""LOAD CSV WITH HEADERS FROM "file:///" + $source_file AS row
-    CALL (row) {{
-        MATCH (from_node:$($from_node_label) {{ {from_node_column} : row[$from_node_column] }}),
-              (to_node:$($to_node_label) {{ {to_node_column} : row[$to_node_column] }} )
-        MERGE (from_node)-[r:$($relationship_type)]->(to_node)
-        FOREACH (k IN $properties | SET r[k] = row[k])
-    }} IN TRANSACTIONS OF 1000 ROWS
+def forget_relationship_fingerprints(node_construction: dict, relationship_rules: List[dict], keys: List[Any]) -> List[str]:
+    """Forget the row fingerprints of relationship rows ending at the nodes of a node rule with the given keys.
+
+    DETACH DELETE of nodes also deletes their relationships, and a relationship row whose node was missing
+    matched nothing; either way its fingerprint would wrongly count it as written. The next delta import of
+    those relationship rules writes the forgotten rows again. A rule that finds the nodes by another property
+    than their key can't tell which of its rows are affected, and forgets all of them.
+
+    Returns:
+        The relationship types whose fingerprints were (partly) forgotten.
     """
-    
-    results = graphdb.send_query(query, {
-        "source_file": relationship_construction["source_file"],
-        "from_node_label": relationship_construction["from_node_label"],
-        "from_node_column": relationship_construction["from_node_column"],
-        "to_node_label": relationship_construction["to_node_label"],
-        "to_node_column": relationship_construction["to_node_column"],
-        "relationship_type": relationship_construction["relationship_type"],
-        "properties": relationship_construction["properties"]
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error" or not keys:
+        return []
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    changed = {str(key) for key in keys}
+    forgotten = []
+    for rule in relationship_rules:
+        # node rules ending the same relationship rule may forget its rows at the same time
+        forget = lambda entry, rule=rule: _forget_rows(entry, rule, node_construction, changed)
+        if update_catalog_entry(import_dir, _fingerprints_kind(rule), rule["source_file"], forget):
+            forgotten.append(rule["relationship_type"])
+    return forgotten
+
+
+def _forget_rows(entry: Optional[Dict[str, Any]], rule: dict, node_construction: dict, changed: set) -> Optional[Dict[str, Any]]:
+    """A relationship rule's fingerprints without its rows ending at changed node keys, or None if none do."""
+    if not entry:
+        return None
+    key_columns, _ = _rule_columns(rule)
+    ends = [
+        position for position, label in enumerate([rule["from_node_label"], rule["to_node_label"]])
+        if label == node_construction["label"]
+    ]
+    if any(key_columns[position] != node_construction["unique_column_name"] for position in ends):
+        rows = {}
+    else:
+        rows = {
+            row_key: fingerprint for row_key, fingerprint in entry["rows"].items()
+            if not any(str(json.loads(row_key)[position]) in changed for position in ends)
+        }
+    if len(rows) == len(entry["rows"]):
+        return None
+    # the file's content hash no longer stands for what was written
+    return {**entry, "rows": rows, "content_hash": None}
+
+
+def rule_dependencies(construction_plan: dict) -> Dict[str, List[str]]:
+    """The rules each rule must wait for: a relationship rule waits for the node rules of both its endpoint labels.
+
+    Endpoint labels without a node rule in the plan are assumed to be in the graph already.
+    """
+    node_rule_by_label = {
+        rule["label"]: key for key, rule in construction_plan.items() if rule["construction_type"] == "node"
+    }
+    dependencies = {}
+    for key, rule in construction_plan.items():
+        if rule["construction_type"] == "relationship":
+            labels = [rule["from_node_label"], rule["to_node_label"]]
+            dependencies[key] = list(dict.fromkeys(node_rule_by_label[l] for l in labels if l in node_rule_by_label))
+        else:
+            dependencies[key] = []
+    return dependencies
+
+
+# Index pre-flight: every node lookup of the plan is indexed before anything is imported
+
+INDEX_ONLINE_TIMEOUT_SECONDS = 300
+
+
+def lookup_keys(construction_plan: dict) -> Dict[Tuple[str, str], str]:
+    """Every (label, property) the plan finds nodes by, and how to index it.
+
+    Node rules MERGE on their unique column, which gets a uniqueness 'constraint'. Relationship
+    rules MATCH their endpoints on the property named after their columns, which gets a plain
+    'index' unless it is also the unique column of a node rule.
+    """
+    keys: Dict[Tuple[str, str], str] = {}
+    for rule in construction_plan.values():
+        if rule["construction_type"] == "node":
+            keys[(rule["label"], rule["unique_column_name"])] = "constraint"
+    for rule in construction_plan.values():
+        if rule["construction_type"] == "relationship":
+            for label, column in [(rule["from_node_label"], rule["from_node_column"]), (rule["to_node_label"], rule["to_node_column"])]:
+                keys.setdefault((label, column), "index")
+    return keys
+
+
+def untyped_lookup_keys(construction_plan: dict) -> dict:
+    """The plan, with the property types dropped from the node properties that relationships look nodes up by.
+
+    Relationship rules match on the text of their key columns, so the nodes must store those properties as text.
+    """
+    keys = lookup_keys(construction_plan)
+    plan = {}
+    for key, rule in construction_plan.items():
+        if rule["construction_type"] == "node" and rule.get("property_types"):
+            rule = {**rule, "property_types": {
+                column: property_type for column, property_type in rule["property_types"].items()
+                if (rule["label"], column) not in keys
+            }}
+        plan[key] = rule
+    return plan
+
+
+def provision_indexes(construction_plan: dict) -> Dict[str, Any]:
+    """Create the constraints and indexes the plan's lookups need, in one pass before any import.
+
+    Returns:
+        A dictionary with an 'indexes' key listing the 'created' indexes (label, property and kind)
+        and the number that were 'existing' already.
+    """
+    existing_result = list_property_indexes()
+    if existing_result["status"] == "error":
+        return existing_result
+    existing = {(index["label"], index["property"]) for index in existing_result["indexes"]}
+
+    created = []
+    for (label, key), kind in lookup_keys(construction_plan).items():
+        if (label, key) in existing:
+            continue
+        create = create_uniqueness_constraint if kind == "constraint" else create_property_index
+        result = create(label, key)
+        if result["status"] == "error":
+            return tool_error(f"Could not create the {kind} on {label}.{key}: {result['error_message']}")
+        created.append({"label": label, "property": key, "kind": kind})
+    return tool_success("indexes", {"created": created, "existing": len(existing)})
+
+
+# Estimates of a build, before it runs
+
+LONG_BUILD_SECONDS = 3600
+
+
+def construction_query(construction_rule: dict) -> Tuple[str, Dict[str, Any]]:
+    """The query that imports a rule, with its loader, and parameters good enough to plan it with EXPLAIN."""
+    if rule_loader(construction_rule) in (CLIENT_LOADER, PARTITIONED_LOADER):
+        if construction_rule["construction_type"] == "node":
+            query, parameters = nodes_from_client_query(
+                construction_rule["label"], construction_rule["unique_column_name"], construction_rule["properties"]
+            )
+        else:
+            query, parameters = relationships_from_client_query(construction_rule)
+        return query, {**parameters, "rows": []}
+    if construction_rule["construction_type"] == "node":
+        query, parameters = nodes_from_csv_query(
+            construction_rule["label"], construction_rule["unique_column_name"], construction_rule["properties"],
+            construction_rule.get("concurrency", 1), construction_rule.get("on_error", "fail"),
+            construction_rule.get("property_types")
+        )
+    else:
+        query, parameters = relationships_from_csv_query(construction_rule)
+    return query, {**parameters, "source_file": construction_rule["source_file"], "batch_size": 1000, "skip_rows": 0}
+
+
+def _row_count(import_dir: Path, source_file: str) -> Tuple[Optional[int], str]:
+    """The rows of a source file, and how they were counted: from its columnar copy ('profile'),
+    a 'line_count' estimate, or by reading the whole file ('count'), which compressed files and JSON documents need."""
+    path = import_dir / source_file
+    copy_path = find_columnar_copy(import_dir, source_file)
+    if copy_path is not None:
+        return row_count(copy_path), "profile"
+    estimate = estimate_row_count(path)
+    if estimate is not None:
+        return estimate, "line_count"
+    try:
+        if is_json_file(path):
+            return sum(1 for _ in iter_flat_records(path)), "count"
+        with open_csv_rows(path) as (_, rows):
+            return sum(1 for _ in rows), "count"
+    except Exception:
+        return None, "unknown"
+
+
+def _rule_keys(construction_rule: dict) -> List[Tuple[str, str]]:
+    """The (label, property) pairs a rule looks nodes up by."""
+    if construction_rule["construction_type"] == "node":
+        return [(construction_rule["label"], construction_rule["unique_column_name"])]
+    return [(construction_rule["from_node_label"], construction_rule["from_node_column"]),
+            (construction_rule["to_node_label"], construction_rule["to_node_column"])]
+
+
+def estimate_construction_plan(construction_plan: dict, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Estimate the runtime and transactions of building a plan, and flag slow query plans, without writing anything.
+
+    Rows are counted from each file's profile or a fast line count, and each rule's query is planned
+    with EXPLAIN (see agentic_kg.common.build_estimates). Lookups without an index yet are listed in
+    'indexes_to_create': the build creates them first, so the estimate assumes they exist. A label scan
+    despite an existing index is a real problem, and its cost is included.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    max_workers = max_workers or get_settings().construction_max_workers
+    existing_result = list_property_indexes()
+    if existing_result["status"] == "error":
+        return existing_result
+    existing = {(index["label"], index["property"]) for index in existing_result["indexes"]}
+
+    construction_plan = untyped_lookup_keys(construction_plan)
+    row_counts = {key: _row_count(import_dir, rule["source_file"]) for key, rule in construction_plan.items()}
+    label_rows: Dict[str, int] = {}
+    for key, rule in construction_plan.items():
+        if rule["construction_type"] == "node":
+            label_rows[rule["label"]] = label_rows.get(rule["label"], 0) + (row_counts[key][0] or 0)
+
+    rules = {}
+    for key, rule in construction_plan.items():
+        rows, counted_by = row_counts[key]
+        batch_size = rule_batch_size(rule)
+        throughput = (read_catalog_entry(import_dir, THROUGHPUT, rule["source_file"], allow_stale=True) or {}).get(_rule_name(rule))
+        rows_per_second = throughput["rows_per_second"] if throughput else DEFAULT_ROWS_PER_SECOND[rule["construction_type"]]
+
+        warnings = []
+        missing = [f"{label}.{column}" for label, column in _rule_keys(rule) if (label, column) not in existing]
+        query, parameters = construction_query(rule)
+        plan_result = graphdb.explain_query(query, parameters)
+        if plan_result["status"] == "error":
+            warnings.append(f"Could not EXPLAIN the import query: {plan_result['error_message']}")
+            plan = read_plan(None)
+        else:
+            plan = read_plan(plan_result["plan"])
+        scanned_nodes = 0
+        if plan["label_scans"] and not missing:
+            scanned_nodes = sum(label_rows.get(label, 0) for label, _ in _rule_keys(rule))
+            warnings.append(f"The import scans every node of a label for each row ({', '.join(plan['label_scans'])}) "
+                            f"although the lookups are indexed.")
+        if plan["eager"]:
+            warnings.append("The import plan is eager: every row is read into memory before any is written.")
+        if rows is None:
+            warnings.append(f"Could not count the rows of {rule['source_file']}.")
+
+        estimate = estimate_rule(rows or 0, batch_size, rows_per_second, scanned_nodes)
+        rules[key] = {
+            "rows": rows,
+            "rows_counted_by": counted_by,
+            "loader": rule_loader(rule),
+            "batch_size": batch_size,
+            "transactions": estimate["transactions"],
+            "rows_per_second": rows_per_second,
+            "throughput": "measured" if throughput else "default",
+            "seconds": estimate["seconds"],
+            "operators": plan["operators"],
+            "label_scans": plan["label_scans"],
+            "eager": plan["eager"],
+            "indexes_to_create": missing,
+            "warnings": warnings,
+        }
+
+    seconds = schedule_seconds({key: r["seconds"] for key, r in rules.items()}, rule_dependencies(construction_plan), max_workers)
+    warnings = [f"{key}: {warning}" for key, r in rules.items() for warning in r["warnings"]]
+    if seconds > LONG_BUILD_SECONDS:
+        warnings.append(f"The build is estimated to take {seconds / 3600:.1f} hours.")
+    return tool_success("construction_estimate", {
+        "rules": rules,
+        "indexes_to_create": sorted({index for r in rules.values() for index in r["indexes_to_create"]}),
+        "transactions": sum(r["transactions"] for r in rules.values()),
+        "seconds": seconds,
+        "max_workers": max_workers,
+        "warnings": warnings,
+    })
+
+
+# Dry runs: a sample of every file is built into a throwaway label namespace, reported on, then removed
+
+DRY_RUN_SAMPLE_ROWS = 1000
+
+
+def _namespaced(construction_rule: dict, namespace: str) -> dict:
+    """A rule writing to labels prefixed with the namespace. Relationships only join namespaced nodes."""
+    if construction_rule["construction_type"] == "node":
+        return {**construction_rule, "label": namespace + construction_rule["label"]}
+    return {
+        **construction_rule,
+        "from_node_label": namespace + construction_rule["from_node_label"],
+        "to_node_label": namespace + construction_rule["to_node_label"],
+    }
+
+
+def _count(query: str, parameters: Dict[str, Any]) -> Optional[int]:
+    result = graphdb.send_query(query, parameters)
+    return result["records"][0]["count"] if result["status"] == "success" and result["records"] else None
+
+
+def _drop_namespace(labels: List[str]) -> Dict[str, Any]:
+    """Delete every node (and its relationships) with one of the labels."""
+    for label in labels:
+        result = graphdb.send_query(
+            "MATCH (n:$($label)) CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS", {"label": label}
+        )
+        if result["status"] == "error":
+            return result
+    return tool_success("dropped", labels)
+
+
+def dry_run_plan(construction_plan: dict, sample_rows: int = DRY_RUN_SAMPLE_ROWS) -> Dict[str, Any]:
+    """Build a sample of a plan into a throwaway label namespace, report on the graph it makes, and remove it.
+
+    Every label gets a prefix unique to the run, like 'DryRun1f2e3d4c_Part', so the sample never touches
+    the real graph. Node files are sampled by key, and relationship rows only where both endpoints were
+    sampled (see agentic_kg.common.plan_sample). Rows are streamed by the client, without creating any
+    index or constraint, so nothing is left behind once the namespace is dropped.
+
+    Returns:
+        A dictionary with a 'dry_run' key with the 'namespace', 'rules' (for node rules the 'rows_sampled',
+        'nodes' and 'isolated_nodes' without any relationship; for relationship rules the 'rows_sampled',
+        distinct 'pairs', 'relationships' made and 'unmatched_pairs' whose nodes weren't found; with the
+        'seconds' of each), 'warnings', total 'seconds' and whether the sample was 'cleaned_up'.
+    """
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        return import_dir_result
+    import_dir = Path(import_dir_result["neo4j_import_dir"])
+    construction_plan = untyped_lookup_keys(construction_plan)
+    namespace = f"DryRun{uuid.uuid4().hex[:8]}_"
+    sample = PlanSample(sample_rows, [key for key, kind in lookup_keys(construction_plan).items() if kind == "index"])
+    node_keys = [key for key, rule in construction_plan.items() if rule["construction_type"] == "node"]
+    relationship_keys = [key for key in construction_plan if key not in node_keys]
+    labels = sorted({namespace + construction_plan[key]["label"] for key in node_keys})
+    started = time.perf_counter()
+    rules: Dict[str, Dict[str, Any]] = {}
+    try:
+        for key in node_keys:
+            rule = _namespaced(construction_plan[key], namespace)
+            rule_started = time.perf_counter()
+            result = load_nodes_from_client(
+                rule["source_file"], rule["label"], rule["unique_column_name"], rule["properties"],
+                row_filter=sample.node_filter(key, construction_plan[key]["label"], rule["unique_column_name"],
+                                              _row_count(import_dir, rule["source_file"])[0]),
+                property_types=rule.get("property_types")
+            )
+            if result["status"] == "error":
+                return tool_error(f"Dry run of {key} failed: {result['error_message']}")
+            rules[key] = {"rows_sampled": sample.rows[key], "seconds": round(time.perf_counter() - rule_started, 3)}
+        for key in relationship_keys:
+            plan_rule = construction_plan[key]
+            rule = _namespaced(plan_rule, namespace)
+            rule_started = time.perf_counter()
+            result = load_relationships_from_client(rule, row_filter=sample.relationship_filter(
+                key, (plan_rule["from_node_label"], plan_rule["from_node_column"]),
+                (plan_rule["to_node_label"], plan_rule["to_node_column"])
+            ))
+            if result["status"] == "error":
+                return tool_error(f"Dry run of {key} failed: {result['error_message']}")
+            relationships = _count(
+                "MATCH (:$($from_node_label))-[r:$($relationship_type)]->(:$($to_node_label)) RETURN count(r) AS count",
+                {"from_node_label": rule["from_node_label"], "to_node_label": rule["to_node_label"],
+                 "relationship_type": rule["relationship_type"]}
+            )
+            pairs = len(sample.pairs[key])
+            rules[key] = {
+                "rows_sampled": sample.rows[key],
+                "pairs": pairs,
+                "relationships": relationships,
+                "unmatched_pairs": pairs - relationships if relationships is not None else None,
+                "seconds": round(time.perf_counter() - rule_started, 3),
+            }
+        for key in node_keys:
+            label = namespace + construction_plan[key]["label"]
+            rules[key]["nodes"] = _count("MATCH (n:$($label)) RETURN count(n) AS count", {"label": label})
+            rules[key]["isolated_nodes"] = _count(
+                "MATCH (n:$($label)) WHERE NOT EXISTS { (n)--() } RETURN count(n) AS count", {"label": label}
+            )
+    finally:
+        cleanup = _drop_namespace(labels)
+        if cleanup["status"] == "error":
+            logger.warning(f"Could not remove the dry run sample {namespace}*: {cleanup['error_message']}")
+
+    warnings = []
+    for key, report in rules.items():
+        rule = construction_plan[key]
+        if rule["construction_type"] == "node":
+            if report["nodes"] and report["isolated_nodes"] == report["nodes"] and relationship_keys:
+                warnings.append(f"{key}: none of the sampled {rule['label']} nodes has a relationship.")
+            continue
+        if not report["rows_sampled"]:
+            warnings.append(f"{key}: no row has both its endpoints in the sample; check the endpoint columns.")
+        elif report["unmatched_pairs"]:
+            missing = [end for end in ("from", "to") if not sample.has_node_rule(rule[f"{end}_node_label"])]
+            reason = f" ({' and '.join(missing)} nodes have no node rule)" if missing else ""
+            warnings.append(f"{key}: {report['unmatched_pairs']} of {report['pairs']} sampled pairs found no nodes{reason}.")
+    return tool_success("dry_run", {
+        "namespace": namespace,
+        "sample_rows": sample_rows,
+        "rules": rules,
+        "warnings": warnings,
+        "seconds": round(time.perf_counter() - started, 3),
+        "cleaned_up": cleanup["status"] == "success",
+    })
+
+
+# Bulk import: a first build compiled for the offline importer, neo4j-admin database import
+
+BULK_IMPORT_DIR = "bulk_import"
+BULK_IMPORT_OUTPUT_LINES = 20
+
+
+def _write_bulk_file(path: Path, rows: Iterator[List[str]]) -> Tuple[int, bool]:
+    """Write rows to a CSV file. Returns the rows written, and whether any value spans lines."""
+    count = 0
+    multiline = False
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for row in rows:
+            multiline = multiline or any("\n" in value or "\r" in value for value in row)
+            writer.writerow(row)
+            count += 1
+    return count, multiline
+
+
+def _node_keys_by(node_rule: dict, column: str) -> Dict[str, Any]:
+    """The keys of a node rule's nodes, by the value of another of their columns, read from its source file.
+
+    The map holds every node of the label, so callers reuse it for every relationship rule that needs it.
+    """
+    unique_column_name = node_rule["unique_column_name"]
+    rows_result = _property_rows(node_rule["source_file"], list(dict.fromkeys([unique_column_name, column])))
+    if rows_result["status"] == "error":
+        return rows_result
+    keys: Dict[Any, List[Any]] = {}
+    for row in rows_result["rows"]:
+        value, key = row[column], row[unique_column_name]
+        if isinstance(value, (str, int, float)) and key is not None:
+            keys.setdefault(value, []).append(key)
+    return tool_success("keys", keys)
+
+
+def compile_bulk_import(construction_plan: dict, output_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Compile a construction plan into the inputs of `neo4j-admin database import full` (see bulk_import).
+
+    Each rule's rows are streamed once, as an import would: values converted to their property types
+    and the rows of duplicate keys collapsed. They are written with a header file to output_dir (a
+    'bulk_import' directory in the import directory by default). Relationships that find their nodes
+    by a property other than the node rule's key are resolved to the key through the node file.
+
+    Returns:
+        A dictionary with a 'bulk_import' key: the 'output_dir', the 'files' and 'rows' of each rule, the
+        'nodes' and 'relationships' arguments, the 'command', the 'schema_statements' to run once the
+        new database has started, and 'warnings'.
+    """
+    plan = untyped_lookup_keys(construction_plan)
+    if output_dir is None:
+        import_dir_result = get_neo4j_import_dir()
+        if import_dir_result["status"] == "error":
+            return import_dir_result
+        output_dir = str(Path(import_dir_result["neo4j_import_dir"]) / BULK_IMPORT_DIR)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    node_rules = {rule["label"]: rule for rule in plan.values() if rule["construction_type"] == "node"}
+    files: Dict[str, Any] = {}
+    nodes: List[List[str]] = []
+    relationships: List[List[str]] = []
+    warnings: List[str] = []
+    # the node keys by another column, read once for all the relationship rules that find nodes by it
+    node_keys: Dict[Tuple[str, str], Dict[Any, List[Any]]] = {}
+    multiline_fields = False
+    for key, rule in plan.items():
+        options_error = check_duplicates(rule)
+        if options_error:
+            return options_error
+        key_columns, columns = _rule_columns(rule)
+        if rule["construction_type"] == "node":
+            names = [(rule["label"], "Label")]
+        else:
+            names = [(rule["relationship_type"], "Relationship type"),
+                     (rule["from_node_label"], "Label"), (rule["to_node_label"], "Label")]
+        name_error = next(filter(None, (check_bulk_name(name, kind) for name, kind in
+                                        names + [(column, "Column") for column in columns])), None)
+        if name_error:
+            return tool_error(f"{key}: {name_error}")
+        types = value_types(rule.get("property_types"), key_columns)
+        rows_result = _property_rows(rule["source_file"], columns, key_columns, types)
+        if rows_result["status"] == "error":
+            return tool_error(f"{key}: {rows_result['error_message']}")
+        found = _find_duplicates(rule)
+        collapse = _collapser(rule, found)
+        rows = collapse(rows_result["rows"]) if collapse else rows_result["rows"]
+        # collapsed rows keep their values as lists, so the properties are arrays
+        arrays = collapse is not None and rule.get(DUPLICATE_KEYS) == "aggregate"
+        header_path, data_path = output / f"{key}.header.csv", output / f"{key}.csv"
+
+        if rule["construction_type"] == "node":
+            unique_column_name = rule["unique_column_name"]
+            properties = [column for column in rule["properties"] if column != unique_column_name]
+            header = node_header(unique_column_name, properties, types, rule["label"], arrays)
+            data = (
+                [bulk_value(row[unique_column_name]), *[bulk_value(row[column]) for column in properties]]
+                for row in rows if row[unique_column_name] is not None
+            )
+            nodes.append([rule["label"], str(header_path), str(data_path)])
+        else:
+            ends = []
+            for label, column in [(rule["from_node_label"], rule["from_node_column"]), (rule["to_node_label"], rule["to_node_column"])]:
+                node_rule = node_rules.get(label)
+                if node_rule is None:
+                    ends.append(None)
+                elif column == node_rule["unique_column_name"]:
+                    ends.append(lambda value: [value])
+                else:
+                    if (label, column) not in node_keys:
+                        keys_result = _node_keys_by(node_rule, column)
+                        if keys_result["status"] == "error":
+                            return tool_error(f"{key}: {keys_result['error_message']}")
+                        node_keys[(label, column)] = keys_result["keys"]
+                    ends.append(lambda value, keys=node_keys[(label, column)]: keys.get(value, []))
+            if None in ends:
+                warnings.append(f"{key} was left out: no node rule creates the nodes at both of its ends.")
+                continue
+            from_keys, to_keys = ends
+            from_column, to_column = key_columns
+            properties = rule["properties"]
+            header = relationship_header(properties, types, rule["from_node_label"], rule["to_node_label"], arrays)
+            data = (
+                [bulk_value(start), bulk_value(end), *[bulk_value(row[column]) for column in properties]]
+                for row in rows if row[from_column] is not None and row[to_column] is not None
+                for start in from_keys(row[from_column]) for end in to_keys(row[to_column])
+            )
+            relationships.append([rule["relationship_type"], str(header_path), str(data_path)])
+
+        _write_bulk_file(header_path, iter([header]))
+        try:
+            rows_written, multiline = _write_bulk_file(data_path, data)
+        except Exception as e:
+            return tool_error(f"Could not write the bulk import file of {key}: {e}")
+        multiline_fields = multiline_fields or multiline
+        files[key] = {"header": str(header_path), "data": str(data_path), "rows": rows_written}
+
+    schema_statements = [
+        f"CREATE CONSTRAINT {quote_symbol(f'{label}_{column}_constraint')} IF NOT EXISTS "
+        f"FOR (n:{quote_symbol(label)}) REQUIRE n.{quote_symbol(column)} IS UNIQUE"
+        if kind == "constraint" else
+        f"CREATE INDEX {quote_symbol(f'{label}_{column}_index')} IF NOT EXISTS "
+        f"FOR (n:{quote_symbol(label)}) ON (n.{quote_symbol(column)})"
+        for (label, column), kind in lookup_keys({key: rule for key, rule in plan.items() if key in files}).items()
+    ]
+    (output / "schema.cypher").write_text("".join(f"{statement};\n" for statement in schema_statements), encoding="utf-8")
+    database = graphdb.get_config().database or "neo4j"
+    command = import_command(get_settings().neo4j_admin, database, nodes, relationships, multiline_fields)
+    return tool_success(BULK_IMPORT, {
+        "output_dir": str(output),
+        "files": files,
+        "database": database,
+        "nodes": nodes,
+        "relationships": relationships,
+        "multiline_fields": multiline_fields,
+        "command": shlex.join(command),
+        "schema_statements": schema_statements,
+        "warnings": warnings,
+    })
+
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def _is_local_host(host: str) -> bool:
+    return host in LOCAL_HOSTS or host in (socket.gethostname(), socket.getfqdn())
+
+
+def execute_bulk_import(bulk_import: Dict[str, Any], overwrite: bool = False) -> Dict[str, Any]:
+    """Run the neo4j-admin import compiled by compile_bulk_import, into its (stopped, local) database.
+
+    The importer writes a new database: it refuses to replace an existing one, unless overwrite.
+    """
+    database = bulk_import["database"]
+    host = graphdb.get_config().host
+    if not _is_local_host(host):
+        return tool_error(f"Neo4j runs on '{host}'. neo4j-admin writes the database files directly, "
+                          "so a bulk import can only be run on the machine that hosts the database.")
+    available_result = graphdb.check_available()
+    if available_result["status"] == "error":
+        return tool_error(f"Could not tell whether the database '{database}' is stopped: {available_result['error_message']}")
+    if available_result["available"]:
+        return tool_error(f"The database '{database}' is running. Stop it (for example with `neo4j stop`) before a bulk import.")
+    settings = get_settings()
+    neo4j_admin = shutil.which(settings.neo4j_admin)
+    if neo4j_admin is None:
+        return tool_error(f"{settings.neo4j_admin} was not found. Set NEO4J_ADMIN to the path of neo4j-admin.")
+    command = import_command(
+        neo4j_admin, database, bulk_import["nodes"], bulk_import["relationships"], bulk_import["multiline_fields"], overwrite
+    )
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=settings.neo4j_admin_timeout)
+    except subprocess.TimeoutExpired:
+        return tool_error(f"neo4j-admin was stopped after {settings.neo4j_admin_timeout}s (NEO4J_ADMIN_TIMEOUT). "
+                          "The database it was writing is incomplete; run the import again with overwrite.")
+    except OSError as e:
+        return tool_error(f"Could not run {neo4j_admin}: {e}")
+    output = (completed.stdout + completed.stderr).strip().splitlines()[-BULK_IMPORT_OUTPUT_LINES:]
+    if completed.returncode != 0:
+        return tool_error(f"neo4j-admin failed with exit code {completed.returncode}: " + "\n".join(output))
+    return tool_success("bulk_import_run", {
+        "command": shlex.join(command),
+        "seconds": round(time.perf_counter() - started, 1),
+        "output": output,
     })
-    return results
 
-def construct_domain_graph(construction_plan: dict) -> Dict[str, Any]:
-    """Construct a domain graph according to a construction plan."""
 
+def _rule_fingerprint(construction_rule: dict) -> Optional[Dict[str, int]]:
+    path_result = _source_path(construction_rule["source_file"])
+    return source_fingerprint(path_result["path"]) if path_result["status"] == "success" else None
+
+
+def _checkpoint_store(construction_plan: dict, resume: bool) -> Optional[CheckpointStore]:
+    """The checkpoints of a plan, kept in the file catalog. None (no checkpoints) if the import directory is unknown."""
+    import_dir_result = get_neo4j_import_dir()
+    if import_dir_result["status"] == "error":
+        logger.warning(f"Building without checkpoints: {import_dir_result['error_message']}")
+        return None
+    return CheckpointStore.for_plan(Path(import_dir_result["neo4j_import_dir"]), construction_plan, resume)
+
+
+def _timed_import(key: str, construction_rule: dict, delta: bool = False, delete_missing: bool = False,
+                  checkpoints: Optional[CheckpointStore] = None, fingerprint: Optional[Dict[str, int]] = None,
+                  registry: Optional[ProgressRegistry] = None, dependents: Optional[List[dict]] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    progress = checkpoints.begin(key, fingerprint) if checkpoints is not None else RuleProgress()
+    if delta:
+        # a delta import diffs the whole file, so it doesn't resume part way
+        progress = RuleProgress()
+    if registry is not None:
+        path_result = _source_path(construction_rule["source_file"])
+        total_rows = estimate_row_count(path_result["path"]) if path_result["status"] == "success" else None
+        registry.rule_started(key, progress, total_rows)
+    try:
+        if delta:
+            result = import_rule_delta(construction_rule, delete_missing, progress, dependents)
+        else:
+            result = import_rule(construction_rule, progress)
+    except Exception as e:
+        result = tool_error(str(e))
+    if checkpoints is not None:
+        checkpoints.finish(key, result)
+    result = {**result, "seconds": round(time.perf_counter() - started, 3)}
+    if progress.skip_rows:
+        result["resumed_after_rows"] = progress.skip_rows
+    if registry is not None:
+        registry.rule_finished(key, result)
+    if result["status"] == "error":
+        logger.error(f"Construction rule {key} failed: {result['error_message']}")
+    else:
+        logger.info(f"Construction rule {key} finished in {result['seconds']}s")
+    return result
+
+
+# Progress of the latest build, for get_construction_progress
+
+PROGRESS_INTERVAL_SECONDS = 10.0
+
+_latest_build: Optional[ProgressRegistry] = None
+# the build started by start_construction: its 'build_id', and its 'result' once it finished
+_background_build: Optional[Dict[str, Any]] = None
+_background_lock = threading.Lock()
+
+
+def construction_progress() -> Optional[Dict[str, Any]]:
+    """A snapshot of the progress of the running (or last) build, or None if nothing was built yet."""
+    registry = _latest_build
+    return registry.snapshot() if registry is not None else None
+
+
+def start_construction(construction_plan: dict, delta: bool = False, delete_missing: bool = False,
+                       resume: bool = False) -> Dict[str, Any]:
+    """Start construct_domain_graph on a background thread, and return at once with the 'build_id' of the build.
+
+    Its progress is read with construction_progress(), and its result with background_build(). Only one
+    build runs in the background at a time.
+    """
+    global _background_build, _latest_build
+    with _background_lock:
+        running_error = _running_build_error()
+        if running_error:
+            return running_error
+        build: Dict[str, Any] = {"build_id": uuid.uuid4().hex[:8], "result": None}
+
+        def run() -> None:
+            try:
+                result = construct_domain_graph(construction_plan, delta=delta, delete_missing=delete_missing, resume=resume)
+            except Exception as e:
+                result = tool_error(f"The build failed: {e}")
+            # a build that failed before importing any rule never replaced the placeholder
+            placeholder.build_finished()
+            build["result"] = result
+
+        # until the build creates its own, its rules are all pending
+        placeholder = _latest_build = ProgressRegistry(list(construction_plan))
+        _background_build = build
+        threading.Thread(target=run, name=f"construction-build-{build['build_id']}", daemon=True).start()
+    return tool_success("construction_started", {"build_id": build["build_id"]})
+
+
+def _running_build_error() -> Optional[Dict[str, Any]]:
+    if _background_build is not None and _background_build["result"] is None:
+        return tool_error(f"Build {_background_build['build_id']} is still running.")
+    return None
+
+
+def start_foreground_build() -> Optional[Dict[str, Any]]:
+    """An error if a build is running in the background, otherwise forget the last one, since a new build replaces its progress."""
+    global _background_build
+    with _background_lock:
+        running_error = _running_build_error()
+        if running_error:
+            return running_error
+        _background_build = None
+    return None
+
+
+def background_build() -> Optional[Dict[str, Any]]:
+    """The 'build_id' of the last build started in the background, and its 'result' (None while it runs)."""
+    build = _background_build
+    return None if build is None else {"build_id": build["build_id"], "result": build["result"]}
+
+
+def _log_progress(snapshot: Dict[str, Any]) -> None:
+    for key in snapshot["rules_running"]:
+        rule = snapshot["rules"][key]
+        eta = f", ETA {rule['eta_seconds']}s" if rule.get("eta_seconds") is not None else ""
+        logger.info(
+            f"Construction rule {key}: {rule.get('rows_processed', 0)} rows, {rule.get('rows_per_second')} rows/s, "
+            f"{rule.get('batches', 0)} batches{eta}, last batch {rule.get('seconds_since_last_batch')}s ago"
+        )
+
+
+def _monitor(registry: ProgressRegistry, stopped: threading.Event,
+             on_progress: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    while not stopped.wait(PROGRESS_INTERVAL_SECONDS):
+        snapshot = registry.snapshot()
+        _log_progress(snapshot)
+        if on_progress is not None:
+            try:
+                on_progress(snapshot)
+            except Exception as e:
+                logger.warning(f"Progress listener failed: {e}")
+
+
+def construct_domain_graph(construction_plan: dict, max_workers: Optional[int] = None,
+                           delta: bool = False, delete_missing: bool = False, resume: bool = False,
+                           on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Construct a domain graph according to a construction plan.
+
+    First, every property the plan looks nodes up by gets an index or constraint. Then rules run as
+    a dependency graph on a bounded pool of workers: node rules start right away, and each
+    relationship rule starts as soon as the node rules for both of its endpoints succeed (and the
+    indexes are online). A relationship rule whose endpoint failed is skipped.
+
+    In delta mode, each rule only writes the rows that changed since its last import (see
+    import_rule_delta), and with delete_missing also deletes what was removed from its file.
+
+    Progress is checkpointed per rule and per committed batch. With resume, a build of the same
+    plan over the same files skips the rules an earlier build completed, and restarts the others
+    after their last committed batch.
+
+    While the build runs, its progress can be read with construction_progress(). It is also logged,
+    and passed to on_progress, every PROGRESS_INTERVAL_SECONDS.
+    """
+    global _latest_build
     logger.debug(f"Building domain graph from approved construction plan: {construction_plan}")
+    construction_plan = untyped_lookup_keys(construction_plan)
+
+    max_workers = max_workers or get_settings().construction_max_workers
+    indexes_result = provision_indexes(construction_plan)
+    if indexes_result["status"] == "error":
+        return indexes_result
+    indexes_online: Optional[Dict[str, Any]] = None
+
+    checkpoints = _checkpoint_store(construction_plan, resume)
+    fingerprints = {key: _rule_fingerprint(rule) for key, rule in construction_plan.items()} if checkpoints else {}
+
+    dependencies = rule_dependencies(construction_plan)
+    # the relationship rules waiting for each node rule
+    dependents = {
+        key: [construction_plan[waiting] for waiting, waits_for in dependencies.items() if key in waits_for]
+        for key in construction_plan
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = dict(dependencies)
+    started = time.perf_counter()
+    registry = _latest_build = ProgressRegistry(list(construction_plan))
+    stopped = threading.Event()
+    monitor = threading.Thread(target=_monitor, args=(registry, stopped, on_progress), name="construction-progress", daemon=True)
+    monitor.start()
+
+    def settle(key: str, result: Dict[str, Any]) -> None:
+        results[key] = result
+        registry.rule_finished(key, result)
 
-    # first, import nodes
-    node_constructions = [value for value in construction_plan.values() if value['construction_type'] == 'node']
-    for node_construction in node_constructions:
-        import_nodes(node_construction)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running: Dict[Future, str] = {}
 
-    # second, import relationships
-    relationship_constructions = [value for value in construction_plan.values() if value['construction_type'] == 'relationship']
-    for relationship_construction in relationship_constructions:
-        import_relationships(relationship_construction)
+        def submit_ready() -> None:
+            nonlocal indexes_online
+            for key, waits_for in list(pending.items()):
+                failed = [d for d in waits_for if d in results and results[d]["status"] == "error"]
+                if failed:
+                    del pending[key]
+                    settle(key, {**tool_error(f"Skipped because {', '.join(failed)} failed"), "seconds": 0.0})
+                elif resume and checkpoints is not None and checkpoints.is_done(key, fingerprints[key]):
+                    del pending[key]
+                    settle(key, {**tool_success("resumed", "completed by an earlier build"), "seconds": 0.0})
+                elif all(d in results for d in waits_for):
+                    if construction_plan[key]["construction_type"] == "relationship" and indexes_online is None:
+                        # relationships look up their endpoints, which must not fall back to label scans
+                        indexes_online = await_indexes(INDEX_ONLINE_TIMEOUT_SECONDS)
+                    del pending[key]
+                    if construction_plan[key]["construction_type"] == "relationship" and indexes_online["status"] == "error":
+                        settle(key, {**tool_error(f"Indexes did not come online: {indexes_online['error_message']}"), "seconds": 0.0})
+                        continue
+                    running[pool.submit(
+                        _timed_import, key, construction_plan[key], delta, delete_missing, checkpoints, fingerprints.get(key),
+                        registry, dependents.get(key)
+                    )] = key
 
-    return tool_success("domain_graph_constructed", construction_plan)
+        try:
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+                submit_ready()
+        finally:
+            registry.build_finished()
+            stopped.set()
 
-def build_graph_from_construction_rules(tool_context: ToolContext) -> Dict[str, Any]:
-    """Build a graph from the approved construction rules."""
+    # keep the order of the plan
+    rule_results = {
+        key: {"construction_type": construction_plan[key]["construction_type"], **results[key]}
+        for key in construction_plan
+    }
+    duplicates = {}
+    for key, result in rule_results.items():
+        report = (result.get("rows_loaded") or result.get("delta") or {}).get("duplicates")
+        if report and report["duplicate_rows"]:
+            duplicates[key] = report
+    return tool_success("domain_graph_constructed", {
+        "rules": rule_results,
+        "failed_rules": [key for key, result in rule_results.items() if result["status"] == "error"],
+        "duplicates": duplicates,
+        "indexes": indexes_result["indexes"],
+        "seconds": round(time.perf_counter() - started, 3)
+    })
+
+def build_graph_from_construction_rules(tool_context: ToolContext, delta: bool = False, delete_missing: bool = False,
+                                        resume: bool = False, background: bool = False) -> Dict[str, Any]:
+    """Build a graph from the approved construction rules.
+
+    Constraints and indexes for every node lookup are created first. Independent rules are then
+    imported in parallel; relationships are imported once their nodes are.
+
+    A long build can run in the background: the tool then returns at once with a 'build_id', and the
+    'get_construction_progress' tool reports how the build is going, and its result once it is done.
+
+    Args:
+        delta: Only write the rows that were added or changed since the graph was last built with delta=True.
+               Use this to refresh a graph after its files were updated
+        delete_missing: With delta, also delete the nodes and relationships whose rows were removed from their files
+        resume: Continue an earlier build of the same plan that failed or was interrupted: rules it completed
+                are skipped, and the others restart after their last committed batch
+        background: Start the build and return at once, instead of waiting until it is done
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'domain_graph_constructed' key with 'rules' (the result
+              and duration in 'seconds' of each construction rule), 'failed_rules', the 'indexes' that were
+              created and the total 'seconds'. In the background, includes a 'construction_started' key
+              with the 'build_id' instead.
+              If 'error', includes an 'error_message' key.
+    """
     if not APPROVED_CONSTRUCTION_PLAN in tool_context.state:
         return tool_error(f"{APPROVED_CONSTRUCTION_PLAN} not set.")  
 
     approved_construction_plan = tool_context.state[APPROVED_CONSTRUCTION_PLAN]
-    
-    return construct_domain_graph(approved_construction_plan)
\ No newline at end of file
+    if background:
+        return start_construction(approved_construction_plan, delta=delta, delete_missing=delete_missing, resume=resume)
+    running_error = start_foreground_build()
+    if running_error:
+        return running_error
+
+    result = construct_domain_graph(approved_construction_plan, delta=delta, delete_missing=delete_missing, resume=resume)
+    # state is saved when a tool returns, so progress is only kept in it here, not while the build runs
+    final_progress = construction_progress()
+    if final_progress is not None:
+        tool_context.state[CONSTRUCTION_PROGRESS] = final_progress
+    return result
+
+
+def dry_run_graph_construction(tool_context: ToolContext, sample_rows: int = DRY_RUN_SAMPLE_ROWS) -> Dict[str, Any]:
+    """Try the approved construction rules on a small sample of every file, without changing the graph.
+
+    The sample is built into temporary labels, counted, and deleted again, in seconds rather than
+    the time of a full build. Use this to check that the rules make a connected, sensible graph.
+
+    Args:
+        sample_rows: The most rows to sample from each file
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'dry_run' key with 'rules', giving each node rule's sampled
+              'nodes' and 'isolated_nodes' (without relationships), and each relationship rule's
+              'relationships' and 'unmatched_pairs' (rows whose nodes weren't found), 'warnings'
+              about likely problems, the 'seconds' taken and whether the sample was 'cleaned_up'.
+              If 'error', includes an 'error_message' key.
+    """
+    if not APPROVED_CONSTRUCTION_PLAN in tool_context.state:
+        return tool_error(f"{APPROVED_CONSTRUCTION_PLAN} not set.")
+    return dry_run_plan(tool_context.state[APPROVED_CONSTRUCTION_PLAN], sample_rows)
+
+
+def estimate_graph_construction(tool_context: ToolContext) -> Dict[str, Any]:
+    """Estimate how long building the graph from the approved construction rules will take, without building it.
+
+    Use this before building, to warn the user about a long build or about rules whose import
+    would be slow, and to reconsider those rules.
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'construction_estimate' key with the estimated total 'seconds'
+              and 'transactions', the 'indexes_to_create' before importing, 'warnings', and 'rules',
+              giving each rule's 'rows', 'batch_size', 'transactions', 'rows_per_second' ('measured'
+              by an earlier import or a 'default'), 'seconds', and the query plan's 'label_scans'
+              and 'eager' operators.
+              If 'error', includes an 'error_message' key.
+    """
+    if not APPROVED_CONSTRUCTION_PLAN in tool_context.state:
+        return tool_error(f"{APPROVED_CONSTRUCTION_PLAN} not set.")
+    return estimate_construction_plan(tool_context.state[APPROVED_CONSTRUCTION_PLAN])
+
+
+def prepare_bulk_import(tool_context: ToolContext, output_dir: str = "") -> Dict[str, Any]:
+    """Compile the approved construction rules into the files and command of the offline bulk importer,
+    `neo4j-admin database import full`, for a first build of a large graph into a new, empty database.
+
+    A bulk import is much faster than building the graph with Cypher, but it replaces the whole database,
+    so it is only for first builds. Nothing is imported yet: the database must be stopped first, then
+    the import is run with the 'run_bulk_import' tool.
+
+    Args:
+        output_dir: Where to write the files. By default, a 'bulk_import' directory in the import directory
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'bulk_import' key with the 'files' (header, data and rows) of each rule,
+              the 'command' to run, the 'schema_statements' (constraints and indexes) to run once the new
+              database has started, also written to schema.cypher, and 'warnings' about rules left out.
+              If 'error', includes an 'error_message' key.
+    """
+    if not APPROVED_CONSTRUCTION_PLAN in tool_context.state:
+        return tool_error(f"{APPROVED_CONSTRUCTION_PLAN} not set.")
+    result = compile_bulk_import(tool_context.state[APPROVED_CONSTRUCTION_PLAN], output_dir or None)
+    if result["status"] == "success":
+        tool_context.state[BULK_IMPORT] = result[BULK_IMPORT]
+    return result
+
+
+def run_bulk_import(tool_context: ToolContext, overwrite: bool = False) -> Dict[str, Any]:
+    """Run the bulk import prepared by the 'prepare_bulk_import' tool against the local Neo4j database,
+    which must be stopped. Only run it when the user has confirmed.
+
+    Args:
+        overwrite: Replace the database if it already exists. This deletes the existing graph,
+                   so only set it when the user has explicitly agreed
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'bulk_import_run' key with the 'command' that ran, its 'seconds',
+              and the last lines of its 'output'.
+              If 'error', includes an 'error_message' key.
+    """
+    if not BULK_IMPORT in tool_context.state:
+        return tool_error("No bulk import has been prepared. Use the 'prepare_bulk_import' tool first.")
+    return execute_bulk_import(tool_context.state[BULK_IMPORT], overwrite)
+
+
+def get_construction_progress(tool_context: ToolContext) -> Dict[str, Any]:
+    """Get the progress of the graph build that is running, or of the last one.
+
+    Returns:
+        dict: A dictionary with a 'status' key ('success' or 'error').
+              If 'success', includes a 'construction_progress' key with whether the build is 'running',
+              its 'seconds' so far, 'rules_done', 'rules_failed', the 'rules_running', and per rule its 'state'
+              (pending, running, done or failed), 'rows_processed', 'rows_per_second', 'eta_seconds',
+              'batches' and 'seconds_since_last_batch' (a long time means the load may have stalled).
+              For a build in the background, also includes its 'build_id', and its 'result' once it is done
+              (like the result of the 'build_graph_from_construction_rules' tool).
+              If 'error', includes an 'error_message' key.
+    """
+    snapshot = construction_progress()
+    if snapshot is None:
+        snapshot = tool_context.state.get(CONSTRUCTION_PROGRESS)
+    if snapshot is None:
+        return tool_error("No graph has been built yet.")
+    build = background_build()
+    if build is not None:
+        snapshot = {**snapshot, "build_id": build["build_id"]}
+        if build["result"] is not None:
+            snapshot["result"] = build["result"]
+    tool_context.state[CONSTRUCTION_PROGRESS] = snapshot
+    return tool_success(CONSTRUCTION_PROGRESS, snapshot)
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""Import markdown documents into the graph as a document node with section chunks.
+
+Each markdown file becomes a node (with the caller's label) keyed by its
+`source_file`, linked to one `Chunk` node per section:
+
+    (:Document {source_file, title, source_url})-[:HAS_CHUNK]->(:Chunk {id, index, heading, text, start_line})
+
+Sections that are reviews are also labeled `Review`, with 'rating',
+'rating_scale', 'author' and 'city' properties. A single file is streamed one
+line at a time; a whole directory of (small) files is read concurrently and
+written several files per batch, each batch in one transaction. Either way,
+chunks are written with batched UNWIND queries.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched, chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agentic_kg.common.compression import open_text
+from agentic_kg.common.file_catalog import content_hash
+from agentic_kg.common.markdown_sections import Section, document_title, iter_sections
+from agentic_kg.common.neo4j_for_adk import get_graphdb
+from agentic_kg.common.tool_result import tool_success, tool_error
+
+from .cypher_tools import create_uniqueness_constraint
+
+logger = logging.getLogger(__name__)
+
+graphdb = get_graphdb()
+
+CHUNK_LABEL = "Chunk"
+REVIEW_LABEL = "Review"
+
+MARKDOWN_BATCH_SIZE = 500
+
+REVIEW_FIELDS = ("rating", "rating_scale", "author", "city")
+
+
+def ensure_markdown_constraints(label_name: str) -> Dict[str, Any]:
+    """Uniqueness constraints for documents (by source_file) and chunks (by id)."""
+    for label, key in [(label_name, "source_file"), (CHUNK_LABEL, "id")]:
+        result = create_uniqueness_constraint(label, key)
+        if result["status"] == "error":
+            return result
+    return tool_success("constraints", [label_name, CHUNK_LABEL])
+
+
+def chunk_row(source_file: str, section: Section) -> Dict[str, Any]:
+    """The parameters of one chunk, as written by write_chunks."""
+    row = {
+        "id": f"{source_file}#{section.index}",
+        "source_file": source_file,
+        "index": section.index,
+        "heading": section.heading,
+        "text": section.text,
+        "start_line": section.start_line,
+    }
+    for key in REVIEW_FIELDS:
+        row[key] = section.fields.get(key)
+    return row
+
+
+def documents_query(label_name: str, documents: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """The query (and its parameters) merging document nodes, each a dictionary with 'source_file' and its other properties."""
+    query = """UNWIND $documents AS document
+    MERGE (d:$($label_name) {source_file: document.source_file})
+    SET d += document
+    """
+    return query, {"label_name": label_name, "documents": documents}
+
+
+def write_documents(label_name: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge document nodes, each a dictionary with 'source_file' and its other properties."""
+    return graphdb.send_query(*documents_query(label_name, documents))
+
+
+def chunks_query(label_name: str, chunks: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """The query (and its parameters) merging chunks (as made by chunk_row) and linking them to their documents.
+
+    A re-imported chunk that is no longer a review loses the Review label, and review fields it lost are removed.
+    """
+    query = """UNWIND $chunks AS chunk
+    MATCH (d:$($label_name) {source_file: chunk.source_file})
+    MERGE (c:$($chunk_label) {id: chunk.id})
+    SET c.source_file = chunk.source_file, c.index = chunk.index, c.heading = chunk.heading,
+        c.text = chunk.text, c.start_line = chunk.start_line,
+        c.rating = chunk.rating, c.rating_scale = chunk.rating_scale, c.author = chunk.author, c.city = chunk.city
+    MERGE (d)-[:HAS_CHUNK]->(c)
+    WITH c, chunk.rating IS NOT NULL OR chunk.author IS NOT NULL AS is_review
+    FOREACH (_ IN CASE WHEN is_review THEN [1] ELSE [] END | SET c:$($review_label))
+    FOREACH (_ IN CASE WHEN is_review THEN [] ELSE [1] END | REMOVE c:$($review_label))
+    """
+    return query, {
+        "label_name": label_name,
+        "chunk_label": CHUNK_LABEL,
+        "review_label": REVIEW_LABEL,
+        "chunks": chunks
+    }
+
+
+def write_chunks(label_name: str, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge chunks (as made by chunk_row) and link them to their documents, in one transaction."""
+    return graphdb.send_query(*chunks_query(label_name, chunks))
+
+
+def stale_chunks_query(label_name: str, chunk_counts: Dict[str, int]) -> Tuple[str, Dict[str, Any]]:
+    """The query (and its parameters) removing chunks left over from an earlier, longer version of each document."""
+    query = """UNWIND keys($chunk_counts) AS source_file
+    MATCH (:$($label_name) {source_file: source_file})-[:HAS_CHUNK]->(c:$($chunk_label))
+    WHERE c.index >= $chunk_counts[source_file]
+    DETACH DELETE c
+    """
+    return query, {
+        "label_name": label_name,
+        "chunk_label": CHUNK_LABEL,
+        "chunk_counts": chunk_counts
+    }
+
+
+def remove_stale_chunks(label_name: str, chunk_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Remove chunks left over from an earlier, longer version of each document."""
+    return graphdb.send_query(*stale_chunks_query(label_name, chunk_counts))
+
+
+def import_markdown_document(import_dir: Path, source_file: str, label_name: str,
+                             batch_size: int = MARKDOWN_BATCH_SIZE) -> Dict[str, Any]:
+    """Stream one markdown file into a document node and its chunks. Assumes the constraints exist."""
+    file_path = Path(import_dir) / source_file
+    if not file_path.is_file():
+        return tool_error(f"Markdown file does not exist: {source_file}")
+
+    chunk_count = 0
+    review_count = 0
+    try:
+        with open_text(file_path) as mdfile:
+            sections = iter_sections(mdfile)
+            first = next(sections, None)
+            # cleared until the import completes, see import_markdown_documents
+            document = {"source_file": source_file, "title": document_title(first), "content_hash": None}
+            if first is not None and "source_url" in first.fields:
+                document["source_url"] = first.fields["source_url"]
+            result = write_documents(label_name, [document])
+            if result["status"] == "error":
+                return result
+
+            rows = (chunk_row(source_file, section) for section in chain([first] if first else [], sections))
+            for batch in batched(rows, batch_size):
+                result = write_chunks(label_name, list(batch))
+                if result["status"] == "error":
+                    return tool_error(f"Import of {source_file} stopped after {chunk_count} chunks: {result['error_message']}")
+                chunk_count += len(batch)
+                review_count += sum(1 for row in batch if row["rating"] is not None or row["author"] is not None)
+    except Exception as e:
+        return tool_error(f"Error reading markdown file {source_file}: {e}")
+
+    result = remove_stale_chunks(label_name, {source_file: chunk_count})
+    if result["status"] == "error":
+        return result
+    result = write_documents(label_name, [{"source_file": source_file, "content_hash": content_hash(file_path)}])
+    if result["status"] == "error":
+        return result
+
+    return tool_success("markdown_import", {
+        "source_file": source_file,
+        "title": document["title"],
+        "chunks": chunk_count,
+        "reviews": review_count
+    })
+
+
+# Bulk import: many (small) files per transaction
+
+MAX_READ_WORKERS = 8
+
+
+def read_markdown_document(import_dir: Path, source_file: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Parse a whole markdown file into its document properties and chunk rows, without writing anything."""
+    file_path = Path(import_dir) / source_file
+    if not file_path.is_file():
+        raise FileNotFoundError(f"Markdown file does not exist: {source_file}")
+    with open_text(file_path) as mdfile:
+        sections = list(iter_sections(mdfile))
+    document = {"source_file": source_file, "title": document_title(sections[0] if sections else None)}
+    if sections and "source_url" in sections[0].fields:
+        document["source_url"] = sections[0].fields["source_url"]
+    return document, [chunk_row(source_file, section) for section in sections]
+
+
+def imported_content_hashes(label_name: str, source_files: List[str]) -> Dict[str, Any]:
+    """The content hash each document had when it was last imported completely."""
+    query = """MATCH (d:$($label_name)) WHERE d.source_file IN $source_files AND d.content_hash IS NOT NULL
+    RETURN d.source_file AS source_file, d.content_hash AS content_hash
+    """
+    result = graphdb.send_query(query, {"label_name": label_name, "source_files": source_files})
+    if result["status"] == "error":
+        return result
+    return tool_success("content_hashes", {r["source_file"]: r["content_hash"] for r in result["records"]})
+
+
+def _write_batch(label_name: str, documents: List[Dict[str, Any]], chunks: List[Dict[str, Any]],
+                 content_hashes: Dict[str, str]) -> Dict[str, Any]:
+    # one transaction, so the content hash is only recorded with everything else, and a failed batch is retried next time
+    queries = [documents_query(label_name, [{**d, "content_hash": content_hashes[d["source_file"]]} for d in documents])]
+    if chunks:
+        queries.append(chunks_query(label_name, chunks))
+    queries.append(stale_chunks_query(label_name, {
+        d["source_file"]: sum(1 for c in chunks if c["source_file"] == d["source_file"]) for d in documents
+    }))
+    return graphdb.send_queries(queries)
+
+
+def import_markdown_documents(import_dir: Path, source_files: List[str], label_name: str,
+                              batch_size: int = MARKDOWN_BATCH_SIZE, force: bool = False) -> Dict[str, Any]:
+    """Import many markdown files, reading them concurrently and writing the chunks of several files per batch.
+
+    Files whose content is unchanged since their last complete import are skipped, unless forced.
+    A file that can't be read or written is reported in 'errors' without stopping the others.
+    Assumes the constraints exist.
+    """
+    import_dir = Path(import_dir)
+    errors: Dict[str, str] = {}
+
+    def hash_file(source_file: str) -> Optional[str]:
+        try:
+            return content_hash(import_dir / source_file)
+        except OSError as e:
+            errors[source_file] = f"Could not read {source_file}: {e}"
+            return None
+
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as pool:
+        hashes = {f: h for f, h in zip(source_files, pool.map(hash_file, source_files)) if h is not None}
+
+        previous_hashes = {}
+        if not force:
+            previous = imported_content_hashes(label_name, list(hashes))
+            if previous["status"] == "error":
+                return previous
+            previous_hashes = previous["content_hashes"]
+        skipped = [f for f, h in hashes.items() if previous_hashes.get(f) == h]
+        to_import = [f for f in hashes if f not in skipped]
+
+        def read_file(source_file: str):
+            try:
+                return read_markdown_document(import_dir, source_file)
+            except Exception as e:
+                errors[source_file] = f"Error reading markdown file {source_file}: {e}"
+                return None
+
+        imported: List[str] = []
+        chunk_count = 0
+        review_count = 0
+        documents: List[Dict[str, Any]] = []
+        chunks: List[Dict[str, Any]] = []
+
+        def flush() -> None:
+            nonlocal chunk_count, review_count
+            if not documents:
+                return
+            result = _write_batch(label_name, documents, chunks, hashes)
+            files = [d["source_file"] for d in documents]
+            if result["status"] == "error":
+                for f in files:
+                    errors[f] = f"Error writing {f}: {result['error_message']}"
+            else:
+                imported.extend(files)
+                chunk_count += len(chunks)
+                review_count += sum(1 for c in chunks if c["rating"] is not None or c["author"] is not None)
+            documents.clear()
+            chunks.clear()
+
+        # files are never split across batches, so a batch may hold more than batch_size chunks
+        for parsed in pool.map(read_file, to_import):
+            if parsed is None:
+                continue
+            document, rows = parsed
+            documents.append(document)
+            chunks.extend(rows)
+            if len(chunks) >= batch_size:
+                flush()
+        flush()
+
+    return tool_success("markdown_import", {
+        "files_imported": len(imported),
+        "files_unchanged": len(skipped),
+        "chunks": chunk_count,
+        "reviews": review_count,
+        "errors": errors
+    })
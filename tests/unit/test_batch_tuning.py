@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from agentic_kg.common.batch_tuning import MAX_BATCH_SIZE, next_batch_size, record_run
+from agentic_kg.common.file_catalog import read_catalog_entry, update_catalog_entry
+
+
+def tune(throughput, runs=12, default=1000):
+    """Run the tuner against a throughput curve (rows/sec by batch size), returning the batch sizes it tried."""
+    history = None
+    tried = []
+    for _ in range(runs):
+        batch_size = next_batch_size(history, default)
+        tried.append(batch_size)
+        rows = 100_000
+        history = record_run(history, batch_size, rows, rows / throughput(batch_size))
+    return tried, history
+
+
+def test_tuning_converges_on_the_best_batch_size():
+    # throughput peaks at 8000 rows per transaction
+    tried, history = tune(lambda size: 50_000 - abs(8000 - size))
+    assert tried[:4] == [1000, 2000, 4000, 8000]
+    assert history["best_batch_size"] == 8000
+    assert history["step"] == 1.0
+    assert tried[-1] == 8000
+
+
+def test_tuning_turns_around_when_bigger_batches_are_slower():
+    tried, history = tune(lambda size: 10_000_000 / size)
+    assert tried[:3] == [1000, 2000, 707]
+    assert history["best_batch_size"] < 1000
+
+
+def test_tuning_stays_within_limits_and_ignores_small_runs():
+    tried, history = tune(lambda size: size, default=MAX_BATCH_SIZE)
+    assert max(tried) == MAX_BATCH_SIZE
+    assert history["best_batch_size"] == MAX_BATCH_SIZE
+    assert record_run(None, 1000, 10, 0.1) is None
+
+
+def test_concurrent_catalog_updates_are_not_lost(tmp_path):
+    (tmp_path / "parts.csv").write_text("part_id\nP1\n")
+
+    def record(i):
+        update_catalog_entry(tmp_path, "throughput", "parts.csv", lambda entry: {**(entry or {}), f"rule{i}": i})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(40)))
+    assert read_catalog_entry(tmp_path, "throughput", "parts.csv") == {f"rule{i}": i for i in range(40)}
+    # no temporary files are left behind
+    assert not list(tmp_path.rglob("*.tmp"))
@@ -0,0 +1,33 @@
+from agentic_kg.common.build_estimates import estimate_rule, read_plan, schedule_seconds
+
+SCAN_PLAN = {
+    "operatorType": "ProduceResults@neo4j", "arguments": {}, "children": [
+        {"operatorType": "Eager@neo4j", "arguments": {}, "children": [
+            {"operatorType": "NodeByLabelScan@neo4j", "arguments": {"Details": "from_node:Part"}, "children": []},
+            {"operatorType": "NodeUniqueIndexSeek@neo4j", "arguments": {"Details": "UNIQUE to_node:Supplier(supplier_id)"}},
+        ]},
+    ],
+}
+
+
+def test_plans_are_read_for_label_scans_and_eager_operators():
+    plan = read_plan(SCAN_PLAN)
+    assert plan["operators"] == ["ProduceResults", "Eager", "NodeByLabelScan", "NodeUniqueIndexSeek"]
+    assert plan["label_scans"] == ["from_node:Part"]
+    assert plan["eager"] is True
+    assert read_plan(None) == {"operators": [], "label_scans": [], "eager": False}
+
+
+def test_rule_estimates_count_transactions_and_scans():
+    assert estimate_rule(2500, 1000, 10_000) == {"transactions": 3, "seconds": 0.3}
+    # every row reads a million scanned nodes
+    assert estimate_rule(2000, 1000, 10_000, scanned_nodes_per_row=1_000_000)["seconds"] == 1000.2
+    assert estimate_rule(0, 1000, 10_000) == {"transactions": 0, "seconds": 0.0}
+
+
+def test_schedule_runs_rules_after_their_dependencies_on_the_workers():
+    seconds = {"A": 10, "B": 20, "C": 5, "AB": 3}
+    dependencies = {"A": [], "B": [], "C": [], "AB": ["A", "B"]}
+    assert schedule_seconds(seconds, dependencies, max_workers=3) == 23
+    # with one worker, everything runs in turn
+    assert schedule_seconds(seconds, dependencies, max_workers=1) == 38
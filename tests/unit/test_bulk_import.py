@@ -0,0 +1,27 @@
+import datetime
+
+import pytest
+
+from agentic_kg.common.bulk_import import bulk_value, check_bulk_name, node_header, relationship_header
+
+
+def test_headers_name_id_spaces_and_property_types():
+    assert node_header("part_id", ["name", "price", "added"], {"price": "currency", "added": "date"}, "Part") == [
+        "part_id:ID(Part)", "name", "price:double", "added:date"
+    ]
+    assert relationship_header(["quantity"], {"quantity": "int"}, "Part", "Supplier", arrays=True) == [
+        ":START_ID(Part)", ":END_ID(Supplier)", "quantity:long[]"
+    ]
+    assert check_bulk_name("a b") is None and check_bulk_name("address.city") is None
+    for name in ["a:b", "a,b", "a=b", "Part(1)", 'a"b', "a\nb", " a", ""]:
+        assert check_bulk_name(name) is not None, name
+
+
+def test_values_are_written_in_the_importer_formats():
+    assert bulk_value(None) == ""
+    assert bulk_value(True) == "true" and bulk_value(False) == "false"
+    assert bulk_value(datetime.date(2024, 5, 31)) == "2024-05-31"
+    assert bulk_value(["wood", None, "glass"]) == "wood;glass"
+    with pytest.raises(ValueError):
+        bulk_value(["wood;glass", "metal"])
+    assert bulk_value(1042.5) == "1042.5"
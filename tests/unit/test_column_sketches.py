@@ -0,0 +1,68 @@
+import shutil
+from pathlib import Path
+
+from agentic_kg.common.column_sketches import ColumnSketch, HyperLogLog, hash_value
+
+BOM_DIR = Path(__file__).resolve().parents[2] / "data" / "bom"
+
+
+def _sketch(values):
+    sketch = ColumnSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def test_small_columns_are_exact():
+    sketch = _sketch(["a", "b", "b", "", "c"])
+    assert sketch.row_count == 5
+    assert sketch.non_empty_count == 4
+    assert sketch.distinct_count() == 3
+    assert sketch.uniqueness() == 0.75
+
+    assert _sketch(["a", "b"]).containment_in(sketch) == 1.0
+    assert _sketch(["a", "z"]).containment_in(sketch) == 0.5
+
+
+def test_hyperloglog_estimate_is_close():
+    hll = HyperLogLog()
+    for i in range(50_000):
+        hll.add_hash(hash_value(f"value-{i}"))
+    assert abs(hll.estimate() - 50_000) / 50_000 < 0.05
+
+
+def test_containment_estimate_for_large_columns():
+    referenced = _sketch(f"K-{i}" for i in range(20_000))
+    contained = _sketch(f"K-{i}" for i in range(0, 20_000, 4))
+    disjoint = _sketch(f"X-{i}" for i in range(5_000))
+
+    assert contained.containment_in(referenced) > 0.85
+    assert disjoint.containment_in(referenced) < 0.05
+
+
+def test_sketch_round_trip():
+    sketch = _sketch(f"K-{i}" for i in range(1_000))
+    restored = ColumnSketch.from_dict(sketch.to_dict())
+    assert restored.distinct_count() == sketch.distinct_count()
+    assert restored.containment_in(sketch) == 1.0
+
+
+def test_discovers_bom_foreign_keys(tmp_path):
+    from agentic_kg.tools.foreign_key_tools import get_column_sketches, rank_foreign_key_candidates
+
+    files = ["assemblies.csv", "components.csv", "part_supplier_mapping.csv", "products.csv", "suppliers.csv"]
+    for file_name in files:
+        shutil.copy(BOM_DIR / file_name, tmp_path / file_name)
+
+    sketches = {file_name: get_column_sketches(tmp_path, file_name) for file_name in files}
+    links = {
+        (c["from_file"], c["from_column"], c["to_file"], c["to_column"])
+        for c in rank_foreign_key_candidates(sketches)
+    }
+
+    assert ("assemblies.csv", "product_id", "products.csv", "product_id") in links
+    assert ("part_supplier_mapping.csv", "supplier_id", "suppliers.csv", "supplier_id") in links
+    assert ("components.csv", "assembly_id", "assemblies.csv", "assembly_id") in links
+
+    # sketches were cached in the file catalog and are reused
+    assert get_column_sketches(tmp_path, "products.csv")["product_id"].distinct_count() == 10
@@ -0,0 +1,51 @@
+from agentic_kg.common.column_sketches import hash_value
+from agentic_kg.common.duplicate_keys import collapse_duplicates, find_duplicate_keys
+from agentic_kg.common.row_delta import row_key
+
+ROWS = [
+    {"part_id": "P1", "supplier": "S1", "cost": 3.0},
+    {"part_id": "P2", "supplier": "S1", "cost": 4.0},
+    {"part_id": "P1", "supplier": "S2", "cost": None},
+    {"part_id": None, "supplier": "S3", "cost": 1.0},
+    {"part_id": "P1", "supplier": "S4", "cost": 5.0},
+    {"part_id": "P3", "supplier": 7, "cost": 2.0},
+    {"part_id": "P3", "supplier": "S5", "cost": 2.5},
+]
+
+
+def collapse(policy):
+    found = find_duplicate_keys(ROWS, ["part_id"])
+    return list(collapse_duplicates(iter(ROWS), ["part_id"], found["duplicates"], policy))
+
+
+def test_duplicate_keys_are_counted_in_a_pre_pass():
+    found = find_duplicate_keys(ROWS, ["part_id"])
+    assert found["rows"] == 7
+    assert found["duplicate_keys"] == 2 and found["duplicate_rows"] == 3
+    # pairs of columns are keys too
+    assert find_duplicate_keys(ROWS, ["part_id", "supplier"])["duplicate_rows"] == 0
+
+
+def test_duplicate_rows_are_collapsed_by_policy():
+    first = collapse("first")
+    assert [row["part_id"] for row in first] == ["P1", "P2", None, "P3"]
+    assert first[0]["supplier"] == "S1"
+
+    last = collapse("last")
+    # unique keys stream through in place, collapsed keys follow
+    assert [row["part_id"] for row in last] == ["P2", None, "P1", "P3"]
+    assert last[2]["supplier"] == "S4" and last[3]["cost"] == 2.5
+
+    aggregate = {row["part_id"]: row for row in collapse("aggregate")}
+    assert aggregate["P1"] == {"part_id": "P1", "supplier": ["S1", "S2", "S4"], "cost": [3.0, 5.0]}
+    # a list holds one type of value
+    assert aggregate["P3"]["supplier"] == ["7", "S5"]
+    assert aggregate["P2"]["supplier"] == "S1"
+
+
+def test_keys_whose_hashes_collide_are_not_merged():
+    rows = [{"part_id": "P1", "cost": 1.0}, {"part_id": "P2", "cost": 2.0}, {"part_id": "P1", "cost": 3.0}]
+    # as if every key hashed the same
+    duplicates = {hash_value(row_key(row, ["part_id"])) for row in rows}
+    collapsed = list(collapse_duplicates(iter(rows), ["part_id"], duplicates, "last"))
+    assert sorted((row["part_id"], row["cost"]) for row in collapsed) == [("P1", 3.0), ("P2", 2.0)]
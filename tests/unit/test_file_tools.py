@@ -0,0 +1,256 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_kg.common import arrow_csv, search_index
+from agentic_kg.common.tool_result import tool_success
+from agentic_kg.tools import file_tools
+
+BOM_DIR = Path(__file__).resolve().parents[2] / "data" / "bom"
+
+
+@pytest.fixture
+def import_dir(tmp_path, monkeypatch):
+    """A copy of the sample BOM data, standing in for the Neo4j import directory."""
+    shutil.copytree(BOM_DIR, tmp_path, dirs_exist_ok=True)
+    monkeypatch.setattr(file_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    return tmp_path
+
+
+@pytest.mark.parametrize("query", ["SUP-011", "drawer", "wood industries", "42"])
+def test_indexed_search_matches_scan(import_dir, query):
+    scanned = file_tools.search_file("part_supplier_mapping.csv", query, use_index=False)
+    indexed = file_tools.search_file("part_supplier_mapping.csv", query)
+    again = file_tools.search_file("part_supplier_mapping.csv", query)
+
+    assert scanned["status"] == "success"
+    assert scanned["search_results"]["metadata"]["lines_found"] > 0
+    assert indexed == scanned
+    assert again == scanned
+
+
+def test_byte_search_matches_text_scan(import_dir):
+    for query in ["SUP-0", "drawer", "$4"]:
+        expected = [
+            {"line_number": i, "content": line.strip()}
+            for i, line in file_tools._scan_lines(import_dir / "part_supplier_mapping.csv", query)
+        ]
+        result = file_tools.search_file("part_supplier_mapping.csv", query, use_index=False, max_matches=1000)
+        assert result["search_results"]["matching_lines"] == expected
+
+
+def test_max_matches_and_count_only(import_dir):
+    limited = file_tools.search_file("part_supplier_mapping.csv", "S-1", use_index=False, max_matches=5)
+    assert limited["search_results"]["metadata"]["lines_found"] == 5
+    assert limited["search_results"]["metadata"]["truncated"] is True
+    assert [m["line_number"] for m in limited["search_results"]["matching_lines"]] == [2, 3, 4, 5, 6]
+
+    for use_index in (True, False):
+        counted = file_tools.search_file("part_supplier_mapping.csv", "S-1", use_index=use_index, count_only=True)
+        assert counted["search_results"]["metadata"]["lines_found"] == 176
+        assert counted["search_results"]["matching_lines"] == []
+
+
+def test_index_is_rebuilt_when_file_changes(import_dir):
+    assert file_tools.search_file("products.csv", "Trollhattan")["search_results"]["metadata"]["lines_found"] == 0
+
+    with open(import_dir / "products.csv", "a", encoding="utf-8") as f:
+        f.write("Trollhattan Stool,$99,A brand new stool,P-2000\n")
+
+    result = file_tools.search_file("products.csv", "trollhattan")
+    assert result["search_results"]["matching_lines"] == [
+        {"line_number": 12, "content": "Trollhattan Stool,$99,A brand new stool,P-2000"}
+    ]
+
+
+def test_loaded_index_is_reused_until_file_changes(import_dir, monkeypatch):
+    reads = []
+    read_catalog_entry = search_index.read_catalog_entry
+    monkeypatch.setattr(search_index, "read_catalog_entry", lambda *args: reads.append(args) or read_catalog_entry(*args))
+
+    file_tools.search_file("products.csv", "stool")
+    file_tools.search_file("products.csv", "chair")
+    assert len(reads) == 1
+
+    with open(import_dir / "products.csv", "a", encoding="utf-8") as f:
+        f.write("Trollhattan Stool,$99,A brand new stool,P-2000\n")
+    assert file_tools.search_file("products.csv", "trollhattan")["search_results"]["metadata"]["lines_found"] == 1
+    assert len(reads) == 2
+
+
+def test_search_import_dir(import_dir):
+    result = file_tools.search_import_dir("allen key", "product_reviews/*.md")
+    search_results = result["search_results"]
+
+    assert search_results["metadata"]["files_searched"] == 10
+    assert "product_reviews/stockholm_chair_reviews.md" in search_results["matching_files"]
+    assert search_results["errors"] == {}
+
+    # the file catalog is never searched or listed
+    everything = file_tools.search_import_dir("allen key")["search_results"]
+    assert all(not path.startswith(".agentic_kg") for path in everything["matching_files"])
+    assert everything["metadata"]["files_searched"] == 15
+
+
+def test_search_csv_file_match_modes(import_dir):
+    def search(query, **kwargs):
+        result = file_tools.search_csv_file("part_supplier_mapping.csv", query, tool_context=None, **kwargs)
+        assert result["status"] == "success", result
+        return result["search_results"]
+
+    substring = search("drawer front")
+    assert substring["metadata"]["header"][0] == "part_id"
+    assert substring["metadata"]["total_rows_found"] == 4
+    assert substring["matching_rows"][0][:3] == ["S-1074", "Drawer Front", "SUP-001"]
+
+    assert search("SUP-01", columns=["supplier_id"], match_mode="prefix")["metadata"]["total_rows_found"] > 0
+    assert search("SUP-01", columns=["part_name"], match_mode="prefix")["metadata"]["total_rows_found"] == 0
+    assert search("sup-001", columns=["supplier_id"], match_mode="exact")["metadata"]["total_rows_found"] > 0
+    assert search("sup-001", columns=["supplier_id"], match_mode="exact", case_sensitive=True)["metadata"]["total_rows_found"] == 0
+    assert search(r"^\$4\d\.", columns=["unit_cost"], match_mode="regex")["metadata"]["total_rows_found"] > 0
+
+    limited = search("yes", columns=["preferred_supplier"], match_mode="exact", max_rows=3)
+    assert limited["metadata"]["rows_found"] == 3
+    assert limited["metadata"]["total_rows_found"] > 3
+
+
+def test_search_csv_file_reads_quoted_newlines(import_dir, monkeypatch):
+    rows = "".join(f'P{i},"line {i}\nsecond line"\n' for i in range(50))
+    (import_dir / "notes.csv").write_text("part_id,note\n" + rows)
+    # small blocks, so that some of them start inside a quoted value
+    monkeypatch.setattr(arrow_csv, "BLOCK_SIZE", 64)
+    result = file_tools.search_csv_file("notes.csv", "line 42", tool_context=None)
+    assert result["status"] == "success", result
+    assert result["search_results"]["matching_rows"] == [["P42", "line 42\nsecond line"]]
+
+
+def test_search_csv_file_reads_ragged_rows(import_dir):
+    (import_dir / "people.csv").write_text("id,name,city\n1,Alice,Paris\n2,Bob\n3,Carol,Rome,extra\n")
+    result = file_tools.search_csv_file("people.csv", "o", tool_context=None)
+    assert result["status"] == "success", result
+    assert result["search_results"]["matching_rows"] == [["2", "Bob", ""], ["3", "Carol", "Rome"]]
+    assert result["search_results"]["metadata"]["irregular_rows"] == 2
+
+    profile = file_tools.profile_csv_file("people.csv")
+    assert profile["status"] == "success", profile
+    assert profile["profile"]["row_count"] == 3
+    assert file_tools.search_csv_file("people.csv", "bob", tool_context=None)["search_results"]["metadata"]["total_rows_found"] == 1
+
+
+def test_search_csv_file_rejects_unknown_columns(import_dir):
+    result = file_tools.search_csv_file("products.csv", "chair", tool_context=None, columns=["nope"])
+    assert result["status"] == "error"
+    assert "nope" in result["error_message"]
+
+
+def test_multi_file_tools_keep_per_file_errors_separate(import_dir):
+    samples = file_tools.sample_files(["product_reviews/*.md", "products.csv", "missing.csv"])["samples"]
+    assert len(samples["files"]) == 11
+    assert samples["files"]["products.csv"]["metadata"]["mimetype"] == "text/csv"
+    assert list(samples["errors"]) == ["missing.csv"]
+
+    searched = file_tools.search_files(["product_reviews/*.md", "missing.csv"], "allen key", max_matches_per_file=1)
+    search_results = searched["search_results"]
+    assert len(search_results["files"]) == 10
+    assert list(search_results["errors"]) == ["missing.csv"]
+    stockholm = search_results["files"]["product_reviews/stockholm_chair_reviews.md"]
+    assert stockholm["metadata"]["lines_found"] == 1
+
+
+def test_columnar_cache_profiles_and_searches(import_dir):
+    from agentic_kg.common.columnar_cache import find_columnar_copy
+
+    def search():
+        return file_tools.search_csv_file("suppliers.csv", "sweden", tool_context=None, columns=["country"], match_mode="exact")
+
+    assert find_columnar_copy(import_dir, "suppliers.csv") is None
+    from_csv = search()
+
+    profile = file_tools.profile_csv_file("suppliers.csv")["profile"]
+    assert profile["row_count"] == 20
+    assert profile["columns"]["supplier_id"]["is_unique"] is True
+    assert profile["columns"]["specialty"]["is_unique"] is False
+    assert profile["columns"]["specialty"]["type"] == "string"
+    costs = file_tools.profile_csv_file("part_supplier_mapping.csv")["profile"]["columns"]
+    assert [costs[c]["type"] for c in ("lead_time_days", "unit_cost", "preferred_supplier")] == ["int", "currency", "bool"]
+    copy = find_columnar_copy(import_dir, "suppliers.csv")
+    assert copy is not None
+
+    from_copy = search()
+    assert from_copy == from_csv
+    assert from_copy["search_results"]["metadata"]["total_rows_found"] == 1
+
+    # a changed source file invalidates its copy
+    with open(import_dir / "suppliers.csv", "a", encoding="utf-8") as f:
+        f.write("SUP-999,Gotland Glass,Glass,Visby,Sweden,www.gotland.se,hi@gotland.se\n")
+    assert find_columnar_copy(import_dir, "suppliers.csv") is None
+    assert file_tools.profile_csv_file("suppliers.csv")["profile"]["row_count"] == 21
+    assert not copy.exists()
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz", ".zst"])
+def test_compressed_files_are_read_transparently(import_dir, suffix, monkeypatch):
+    import bz2, gzip, lzma
+    from agentic_kg.common.compression import compression_of, loadable_file, open_binary
+
+    compressors = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+    if suffix == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        compressors[".zst"] = zstandard.ZstdCompressor().compress
+    plain = (import_dir / "part_supplier_mapping.csv").read_bytes()
+    compressed = f"part_supplier_mapping.csv{suffix}"
+    (import_dir / compressed).write_bytes(compressors[suffix](plain))
+
+    sample = file_tools.sample_file(compressed, tool_context=None, mode="random", max_lines=5)["sample"]
+    assert sample["metadata"]["mimetype"] == "text/csv"
+    assert sample["metadata"]["compression"]
+    assert sample["content"].startswith("part_id,")
+
+    def matching(file_path):
+        return file_tools.search_file(file_path, "drawer", max_matches=1000)["search_results"]["matching_lines"]
+    assert matching(compressed) == matching("part_supplier_mapping.csv")
+
+    opened = []
+
+    def recording_open_binary(path):
+        opened.append(open_binary(path))
+        return opened[-1]
+
+    def rows(file_path):
+        return file_tools.search_csv_file(file_path, "SUP-011", tool_context=None, columns=["supplier_id"])["search_results"]
+    monkeypatch.setattr(arrow_csv, "open_binary", recording_open_binary)
+    assert rows(compressed) == {**rows("part_supplier_mapping.csv"), "metadata": {**rows("part_supplier_mapping.csv")["metadata"], "path": compressed}}
+    assert opened and all(f.closed for f in opened)
+
+    listed = file_tools.list_import_files(SimpleNamespace(state={}))
+    assert compressed in listed["all_available_files"]
+    assert listed["compressed_files"] == {compressed: {"compression": compression_of(Path(compressed)), "content_type": ".csv"}}
+
+    # LOAD CSV reads gzip natively, other compressions are recompressed once
+    loadable = loadable_file(import_dir, compressed)
+    assert (loadable == compressed) == (suffix == ".gz")
+    assert loadable_file(import_dir, compressed) == loadable
+    with open_binary(import_dir / loadable) as f:
+        assert f.read() == plain
+
+
+def test_json_files_are_sampled_searched_and_profiled_as_records(import_dir):
+    import gzip, json
+    records = [{"id": f"R-{i}", "product": {"id": f"P-{i % 4}"}, "stars": i % 5} for i in range(30)]
+    (import_dir / "reviews.json").write_text(json.dumps(records, indent=2), encoding="utf-8")
+    (import_dir / "reviews.jsonl.gz").write_bytes(gzip.compress("\n".join(json.dumps(r) for r in records).encode()))
+
+    for file_path, mimetype in [("reviews.json", "application/json"), ("reviews.jsonl.gz", "application/x-ndjson")]:
+        sample = file_tools.sample_file(file_path, tool_context=None, max_lines=3)["sample"]
+        assert sample["metadata"]["mimetype"] == mimetype
+        assert sample["metadata"]["columns"] == ["id", "product.id", "stars"]
+        assert sample["content"].splitlines()[0] == '{"id": "R-0", "product.id": "P-0", "stars": 0}'
+
+        found = file_tools.search_json_file(file_path, "P-1", columns=["product.id"], match_mode="exact")
+        assert found["search_results"]["metadata"]["total_records_found"] == 8
+
+        profile = file_tools.profile_json_file(file_path)["profile"]
+        assert profile["record_count"] == 30
+        assert profile["columns"]["id"]["is_unique"] is True
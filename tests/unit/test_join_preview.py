@@ -0,0 +1,75 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_kg.common.join_preview import collect_node_keys, preview_join
+from agentic_kg.common.tool_result import tool_success
+from agentic_kg.tools import construction_plan_tools
+
+BOM_DIR = Path(__file__).resolve().parents[2] / "data" / "bom"
+
+PLAN = {
+    "Part": {"construction_type": "node", "source_file": "components.csv", "label": "Part",
+             "unique_column_name": "part_id", "properties": ["part_name"]},
+    "Supplier": {"construction_type": "node", "source_file": "suppliers.csv", "label": "Supplier",
+                 "unique_column_name": "supplier_id", "properties": ["name"]},
+    "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv",
+                    "relationship_type": "SUPPLIED_BY", "from_node_label": "Part", "from_node_column": "part_id",
+                    "to_node_label": "Supplier", "to_node_column": "supplier_id", "properties": []},
+}
+
+
+def test_join_preview_reports_matches_and_fan_out(monkeypatch):
+    monkeypatch.setattr(construction_plan_tools, "get_neo4j_import_dir",
+                        lambda: tool_success("neo4j_import_dir", str(BOM_DIR)))
+    tool_context = SimpleNamespace(state={construction_plan_tools.PROPOSED_CONSTRUCTION_PLAN: PLAN})
+
+    preview = construction_plan_tools.preview_relationship_join("SUPPLIED_BY", tool_context)["join_preview"]
+
+    assert preview["estimated"] is False
+    assert preview["relationships"] == preview["rows"]
+    assert preview["from"]["match_rate"] == preview["to"]["match_rate"] == 1.0
+    assert preview["to"]["orphan_keys"] == 0
+    assert preview["to"]["fan_out"]["max"] > 1
+    assert preview["from"]["node_file"]["duplicate_keys"] == 0
+    assert tool_context.state[construction_plan_tools.JOIN_PREVIEWS]["SUPPLIED_BY"] == preview
+
+
+def test_join_preview_warns_about_unmatched_keys(tmp_path, monkeypatch):
+    shutil.copytree(BOM_DIR, tmp_path, dirs_exist_ok=True)
+    monkeypatch.setattr(construction_plan_tools, "get_neo4j_import_dir",
+                        lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    # only the first five suppliers are left
+    lines = (tmp_path / "suppliers.csv").read_text(encoding="utf-8").splitlines(keepends=True)
+    (tmp_path / "suppliers.csv").write_text("".join(lines[:6]), encoding="utf-8")
+    # and the relationship doesn't use a column the Part nodes get as a property
+    plan = {**PLAN, "Part": {**PLAN["Part"], "unique_column_name": "part_name", "properties": []}}
+    tool_context = SimpleNamespace(state={construction_plan_tools.PROPOSED_CONSTRUCTION_PLAN: plan})
+
+    preview = construction_plan_tools.preview_relationship_join("SUPPLIED_BY", tool_context)["join_preview"]
+
+    assert 0 < preview["relationships"] < preview["rows"]
+    assert preview["to"]["match_rate"] < 0.9
+    assert "SUP-011" in preview["to"]["orphan_examples"]
+    assert any("Part nodes will not have a 'part_id' property" in warning for warning in preview["warnings"])
+    assert any(warning.startswith("Only ") for warning in preview["warnings"])
+
+
+@pytest.mark.parametrize("max_keys", [1_000_000, 256])
+def test_sampled_join_estimates_the_exact_join(tmp_path, max_keys):
+    nodes = tmp_path / "nodes.csv"
+    nodes.write_text("id\n" + "".join(f"N-{i}\n" for i in range(0, 2000, 2)), encoding="utf-8")
+    rels = tmp_path / "rels.csv"
+    rels.write_text("a,b\n" + "".join(f"N-{i},N-{(i * 7) % 2000}\n" for i in range(2000)), encoding="utf-8")
+
+    from_keys, node_file = collect_node_keys(nodes, "id", max_keys)
+    to_keys, _ = collect_node_keys(nodes, "id", max_keys)
+    preview = preview_join(rels, "a", "b", from_keys, to_keys, max_keys)
+
+    assert node_file["rows"] == 1000
+    assert preview["estimated"] == (max_keys == 256)
+    # half the from keys exist; to keys (i * 7) % 2000 are even exactly when i is even
+    assert preview["from"]["match_rate"] == pytest.approx(0.5, abs=0.25)
+    assert preview["relationships"] == pytest.approx(1000, rel=0.5)
@@ -0,0 +1,66 @@
+import io
+import json
+
+from agentic_kg.common import json_records
+from agentic_kg.common.json_records import (
+    flatten_record, iter_json_records, profile_records, sample_records, search_records, to_property_value,
+)
+
+RECORDS = [
+    {"id": f"P-{i}", "name": f"Product {i}", "price": i * 1.5,
+     "supplier": {"id": f"SUP-{i % 3}", "address": {"city": "Malmö" if i % 2 else "Oslo"}},
+     "tags": ["sofa", "blue"] if i % 2 else []}
+    for i in range(40)
+]
+
+
+def test_json_array_is_decoded_across_small_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_records, "_READ_CHUNK", 7)
+    path = tmp_path / "products.json"
+    path.write_text(json.dumps(RECORDS, indent=2), encoding="utf-8")
+    assert list(iter_json_records(path)) == RECORDS
+
+    numbers = tmp_path / "numbers.json"
+    numbers.write_text("[1, 22, 333, 4444444]", encoding="utf-8")
+    assert list(iter_json_records(numbers)) == [1, 22, 333, 4444444]
+
+
+def test_json_lines_and_single_objects(tmp_path):
+    lines = tmp_path / "products.jsonl"
+    lines.write_text("\n".join(json.dumps(r) for r in RECORDS[:3]) + "\n\n", encoding="utf-8")
+    assert list(iter_json_records(lines)) == RECORDS[:3]
+
+    single = tmp_path / "product.json"
+    single.write_text(json.dumps(RECORDS[0]), encoding="utf-8")
+    assert list(iter_json_records(single)) == RECORDS[:1]
+
+
+def test_nested_objects_are_flattened_but_arrays_are_not():
+    flat = flatten_record(RECORDS[1])
+    assert flat == {"id": "P-1", "name": "Product 1", "price": 1.5, "supplier.id": "SUP-1",
+                    "supplier.address.city": "Malmö", "tags": ["sofa", "blue"]}
+    assert to_property_value(["a", "b"]) == ["a", "b"]
+    assert to_property_value([{"a": 1}]) == '[{"a": 1}]'
+
+
+def test_search_and_profile_flattened_records():
+    flat = [flatten_record(r) for r in RECORDS]
+    found = search_records(iter(flat), "malmö", columns=["supplier.address.city"], match_mode="exact", limit=5)
+    assert found["total_count"] == 20
+    assert len(found["records"]) == 5
+    assert search_records(iter(flat), "sofa")["total_count"] == 20
+
+    profile = profile_records(iter(flat))
+    assert profile["record_count"] == 40
+    assert profile["columns"]["id"]["is_unique"] is True
+    assert profile["columns"]["supplier.id"]["is_unique"] is False
+    assert profile["columns"]["supplier.id"]["distinct"] == 3
+    assert profile["columns"]["price"]["types"] == {"number": 40}
+
+
+def test_sampled_records_keep_file_order():
+    flat = [flatten_record(r) for r in RECORDS]
+    sample = sample_records(iter(flat), max_records=10, max_bytes=100_000, mode="reservoir")
+    ids = [int(json.loads(line)["id"][2:]) for line in sample.lines]
+    assert len(ids) == 10
+    assert ids == sorted(ids)
@@ -0,0 +1,753 @@
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+from agentic_kg.common.build_progress import RuleProgress
+from agentic_kg.common.file_catalog import get_catalog_dir
+from agentic_kg.common.tool_result import tool_error, tool_success
+from agentic_kg.tools import cypher_tools, kg_construction_tools
+
+PLAN = {
+    "Product": {"construction_type": "node", "label": "Product", "source_file": "products.csv", "unique_column_name": "product_id"},
+    "Assembly": {"construction_type": "node", "label": "Assembly", "source_file": "assemblies.csv", "unique_column_name": "assembly_id"},
+    "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv", "unique_column_name": "part_id"},
+    "Supplier": {"construction_type": "node", "label": "Supplier", "source_file": "suppliers.csv", "unique_column_name": "supplier_id"},
+    "CONTAINS": {"construction_type": "relationship", "source_file": "assemblies.csv",
+                 "from_node_label": "Product", "from_node_column": "product_id",
+                 "to_node_label": "Assembly", "to_node_column": "assembly_id"},
+    "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv",
+                    "from_node_label": "Part", "from_node_column": "part_id",
+                    "to_node_label": "Supplier", "to_node_column": "supplier_name"},
+    "IS_PART_OF": {"construction_type": "relationship", "source_file": "parts.csv",
+                   "from_node_label": "Part", "from_node_column": "part_id",
+                   "to_node_label": "Assembly", "to_node_column": "assembly_id"},
+}
+
+
+class FakeSchema:
+    """Answers the index pre-flight queries, recording what was created and when indexes were awaited."""
+
+    def __init__(self, existing=()):
+        self.existing = [{"label": l, "property": p, "state": "ONLINE", "constraint": False} for l, p in existing]
+        self.created = []
+        self.awaited = 0
+
+    def send_query(self, query, parameters=None):
+        if "dbms.listConfig" in query:
+            return tool_error("no import directory")
+        if query.startswith("SHOW INDEXES"):
+            return tool_success("records", self.existing)
+        if query.startswith("CREATE"):
+            self.created.append(" ".join(query.split()))
+        elif "db.awaitIndexes" in query:
+            self.awaited += 1
+        return tool_success("records", [])
+
+
+def test_dependencies_follow_endpoint_labels():
+    dependencies = kg_construction_tools.rule_dependencies(PLAN)
+    assert dependencies["Product"] == []
+    assert dependencies["SUPPLIED_BY"] == ["Part", "Supplier"]
+    # an endpoint without a node rule is assumed to exist already
+    plan = {**PLAN, "MADE_IN": {"construction_type": "relationship", "from_node_label": "Part", "to_node_label": "Country"}}
+    assert kg_construction_tools.rule_dependencies(plan)["MADE_IN"] == ["Part"]
+
+
+def test_rules_run_in_parallel_after_their_dependencies(monkeypatch):
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", FakeSchema().send_query)
+    finished = {}
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+    spans = []
+
+    def import_rule(rule, progress=None):
+        nonlocal running, most_running
+        key = rule["label"] if rule["construction_type"] == "node" else rule["source_file"]
+        started = time.perf_counter()
+        with lock:
+            running += 1
+            most_running = max(most_running, running)
+            if rule["construction_type"] == "relationship":
+                assert rule["from_node_label"] in finished and rule["to_node_label"] in finished
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+            finished[key] = time.perf_counter()
+            spans.append((started, finished[key]))
+        if rule.get("label") == "Supplier":
+            return tool_error("boom")
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools, "import_rule", import_rule)
+    result = kg_construction_tools.construct_domain_graph(PLAN, max_workers=3)["domain_graph_constructed"]
+
+    assert most_running == 3
+    assert list(result["rules"]) == list(PLAN)
+    assert result["failed_rules"] == ["Supplier", "SUPPLIED_BY"]
+    assert result["rules"]["SUPPLIED_BY"]["error_message"] == "Skipped because Supplier failed"
+    assert result["rules"]["CONTAINS"]["status"] == "success"
+    assert result["rules"]["CONTAINS"]["seconds"] >= 0.05
+    # the imports overlapped: some started before another had finished
+    spans.sort()
+    assert any(start < end for (_, end), (start, _) in zip(spans, spans[1:]))
+
+
+def test_client_loader_streams_csv_rows_in_batches(tmp_path, monkeypatch):
+    source = tmp_path / "parts.csv"
+    source.write_text("part_id,name,weight\n" + "".join(f"P{i},part {i},{i if i % 2 else ''}\n" for i in range(10)) + ",nameless,1\n")
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append(parameters["rows"])
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(kg_construction_tools, "create_uniqueness_constraint", lambda label, key: tool_success("constraint", key))
+    rule = {"construction_type": "node", "source_file": str(source), "label": "Part",
+            "unique_column_name": "part_id", "properties": ["name", "weight"]}
+    # absolute paths can't be read by LOAD CSV
+    assert kg_construction_tools.rule_loader(rule) == kg_construction_tools.CLIENT_LOADER
+    assert kg_construction_tools.check_loader({**rule, "loader": "load_csv"})["status"] == "error"
+
+    result = kg_construction_tools.load_nodes_from_client(str(source), "Part", "part_id", ["name", "weight"], batch_size=4)
+    assert result["rows_loaded"] == {"rows_loaded": 10, "rows_skipped": 1, "batches": 3}
+    assert [len(batch) for batch in sent] == [4, 4, 2]
+    assert sent[0][0] == {"part_id": "P0", "name": "part 0", "weight": None}
+    assert sent[0][1] == {"part_id": "P1", "name": "part 1", "weight": "1"}
+
+    missing = kg_construction_tools.load_nodes_from_client(str(source), "Part", "part_id", ["colour"])
+    assert "colour" in missing["error_message"]
+
+
+def test_client_loader_stops_at_a_failed_batch(tmp_path, monkeypatch):
+    source = tmp_path / "supplied_by.csv"
+    source.write_text("part_id,supplier_id\n" + "".join(f"P{i},S{i % 3}\n" for i in range(50)))
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append(parameters["rows"])
+        return tool_error("deadlock") if len(sent) == 2 else tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    rule = {"construction_type": "relationship", "source_file": str(source), "relationship_type": "SUPPLIED_BY",
+            "from_node_label": "Part", "from_node_column": "part_id",
+            "to_node_label": "Supplier", "to_node_column": "supplier_id", "properties": []}
+    result = kg_construction_tools.load_relationships_from_client(rule, batch_size=5)
+    assert result["error_message"] == "Loading stopped after 5 rows: deadlock"
+    assert len(sent) == 2
+
+
+def test_node_rules_can_write_concurrent_transactions(monkeypatch):
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append((query, parameters))
+        return tool_success("records", [{"rows": 20, "rows_committed": 17, "error_message": "deadlock"}])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(kg_construction_tools, "create_uniqueness_constraint", lambda label, key: tool_success("constraint", key))
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_error("no import directory"))
+    rule = {"construction_type": "node", "source_file": "suppliers.csv", "label": "Supplier",
+            "unique_column_name": "supplier_id", "properties": ["name"],
+            "batch_size": 500, "concurrency": 4, "on_error": "continue"}
+    result = kg_construction_tools.import_nodes(rule)["rows_loaded"]
+    assert result["rows_loaded"] == 17 and result["rows_failed"] == 3 and result["batch_size"] == 500
+    query, parameters = sent[0]
+    assert "IN $concurrency CONCURRENT TRANSACTIONS OF $batch_size ROWS ON ERROR CONTINUE REPORT STATUS AS status" in query
+    assert parameters["concurrency"] == 4 and parameters["batch_size"] == 500
+
+    # relationship batches would lock the same nodes
+    relationship_rule = {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv", "concurrency": 4}
+    assert "only supported for node rules" in kg_construction_tools.check_batching(relationship_rule)["error_message"]
+    assert kg_construction_tools.check_batching({**rule, "batch_size": 0})["status"] == "error"
+
+
+def test_adaptive_batch_size_is_tuned_between_runs(tmp_path, monkeypatch):
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append(parameters["batch_size"])
+        return tool_success("records", [{"rows": 100_000, "rows_committed": 100_000, "error_message": None}])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    (tmp_path / "part_supplier_mapping.csv").write_text("part_id,supplier_id\n")
+    rule = {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv", "relationship_type": "SUPPLIED_BY",
+            "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier",
+            "to_node_column": "supplier_id", "properties": [], "batch_size": "adaptive"}
+    for _ in range(3):
+        assert kg_construction_tools.import_relationships(rule)["status"] == "success"
+    assert sent[:2] == [1000, 2000]
+    assert len(set(sent)) == 3
+
+
+def test_lookup_keys_are_indexed_before_relationships_are_imported(monkeypatch):
+    schema = FakeSchema(existing=[("Product", "product_id")])
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", schema.send_query)
+    indexes_awaited = {}
+
+    def import_rule(rule, progress=None):
+        if rule["construction_type"] == "relationship":
+            indexes_awaited[rule["relationship_type"] if "relationship_type" in rule else rule["source_file"]] = schema.awaited
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools, "import_rule", import_rule)
+
+    keys = kg_construction_tools.lookup_keys(PLAN)
+    assert keys[("Part", "part_id")] == "constraint"
+    assert keys[("Supplier", "supplier_name")] == "index"
+
+    result = kg_construction_tools.construct_domain_graph(PLAN, max_workers=2)["domain_graph_constructed"]
+    assert result["indexes"]["existing"] == 1
+    assert [(i["label"], i["property"], i["kind"]) for i in result["indexes"]["created"]] == [
+        ("Assembly", "assembly_id", "constraint"),
+        ("Part", "part_id", "constraint"),
+        ("Supplier", "supplier_id", "constraint"),
+        ("Supplier", "supplier_name", "index"),
+    ]
+    assert "CREATE INDEX `Supplier_supplier_name_index` IF NOT EXISTS FOR (n:`Supplier`) ON (n.`supplier_name`)" in schema.created
+    # awaited once, before the first relationship rule
+    assert schema.awaited == 1
+    assert set(indexes_awaited.values()) == {1}
+
+
+def test_flattened_property_keys_are_quoted_in_schema_statements(monkeypatch):
+    schema = FakeSchema()
+    monkeypatch.setattr(cypher_tools.graphdb, "send_query", schema.send_query)
+    assert cypher_tools.create_uniqueness_constraint("Supplier", "address.city")["status"] == "success"
+    assert cypher_tools.create_property_index("Supplier", "address.city")["status"] == "success"
+    assert schema.created == [
+        "CREATE CONSTRAINT `Supplier_address.city_constraint` IF NOT EXISTS FOR (n:`Supplier`) REQUIRE n.`address.city` IS UNIQUE",
+        "CREATE INDEX `Supplier_address.city_index` IF NOT EXISTS FOR (n:`Supplier`) ON (n.`address.city`)",
+    ]
+
+
+def test_delta_import_writes_only_changed_rows(tmp_path, monkeypatch):
+    sent = []
+
+    def send_query(query, parameters=None):
+        if "UNWIND $rows" in query:
+            sent.append(("delete" if "DELETE" in query else "merge", [dict(row) for row in parameters["rows"]]))
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    source = tmp_path / "part_supplier_mapping.csv"
+    rule = {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv", "relationship_type": "SUPPLIED_BY",
+            "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier",
+            "to_node_column": "supplier_id", "properties": ["lead_time_days"]}
+
+    source.write_text("part_id,supplier_id,lead_time_days\nP1,S1,5\nP1,S2,7\nP2,S1,3\nP3,S3,9\n")
+    first = kg_construction_tools.import_rule_delta(rule)["delta"]
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (4, 0, 0)
+    assert kg_construction_tools.import_rule_delta(rule)["delta"]["file_unchanged"]
+
+    sent.clear()
+    # P1-S2 changed, P3-S3 removed, P4-S1 added
+    source.write_text("part_id,supplier_id,lead_time_days\nP1,S1,5\nP1,S2,8\nP2,S1,3\nP4,S1,2\n")
+    second = kg_construction_tools.import_rule_delta(rule)["delta"]
+    assert (second["inserted"], second["updated"], second["unchanged"], second["deleted"]) == (1, 1, 2, 0)
+    assert sent == [("merge", [
+        {"part_id": "P1", "supplier_id": "S2", "lead_time_days": "8"},
+        {"part_id": "P4", "supplier_id": "S1", "lead_time_days": "2"},
+    ])]
+
+    # the removed row is still remembered, so it can be deleted later
+    sent.clear()
+    third = kg_construction_tools.import_rule_delta(rule, delete_missing=True)["delta"]
+    assert third["deleted"] == 1 and third["updated"] == 0
+    assert sent == [("delete", [{"key": ["P3", "S3"]}])]
+    assert kg_construction_tools.import_rule_delta(rule, delete_missing=True)["delta"]["file_unchanged"]
+
+    # relationship types may hold any character, but their fingerprints stay in the catalog
+    fingerprints = get_catalog_dir(tmp_path) / "row_fingerprints"
+    kg_construction_tools.import_rule_delta({**rule, "relationship_type": "../../ESCAPED"})
+    assert len(list(fingerprints.iterdir())) == 2
+    assert [p.name for p in tmp_path.iterdir() if not p.is_relative_to(get_catalog_dir(tmp_path))] == [source.name]
+
+
+def test_failed_build_resumes_after_the_last_committed_batch(tmp_path, monkeypatch):
+    schema = FakeSchema()
+    part_batches = []
+    failures = ["connection lost"]
+
+    def send_query(query, parameters=None):
+        if "dbms.listConfig" in query:
+            return tool_success("records", [{"import_dir": str(tmp_path)}])
+        if "UNWIND $rows" in query:
+            if parameters["label"] == "Part":
+                # the second batch fails, once
+                if len(part_batches) == 1 and failures:
+                    return tool_error(failures.pop())
+                part_batches.append([row["part_id"] for row in parameters["rows"]])
+            return tool_success("records", [])
+        return schema.send_query(query, parameters)
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    (tmp_path / "parts.jsonl").write_text("".join(f'{{"part_id": "P{i}"}}\n' for i in range(10)))
+    (tmp_path / "suppliers.jsonl").write_text('{"supplier_id": "S1"}\n')
+    plan = {
+        "Supplier": {"construction_type": "node", "label": "Supplier", "source_file": "suppliers.jsonl",
+                     "unique_column_name": "supplier_id", "properties": []},
+        "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.jsonl",
+                 "unique_column_name": "part_id", "properties": [], "batch_size": 3},
+    }
+
+    first = kg_construction_tools.construct_domain_graph(plan)["domain_graph_constructed"]
+    assert first["failed_rules"] == ["Part"]
+    assert first["rules"]["Part"]["error_message"] == "Loading stopped after 3 rows: connection lost"
+
+    second = kg_construction_tools.construct_domain_graph(plan, resume=True)["domain_graph_constructed"]
+    assert second["failed_rules"] == []
+    assert second["rules"]["Supplier"]["resumed"] == "completed by an earlier build"
+    assert second["rules"]["Part"]["resumed_after_rows"] == 3
+    # the batch of P0-P2 was committed before the failure, and isn't written again
+    assert part_batches == [["P0", "P1", "P2"], ["P3", "P4", "P5"], ["P6", "P7", "P8"], ["P9"]]
+
+    # without resume, everything is built again
+    third = kg_construction_tools.construct_domain_graph(plan)["domain_graph_constructed"]
+    assert "resumed" not in third["rules"]["Supplier"]
+    assert len(part_batches) == 8
+
+
+def test_build_progress_is_reported_while_rules_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", FakeSchema().send_query)
+    monkeypatch.setattr(kg_construction_tools, "PROGRESS_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    (tmp_path / "parts.csv").write_text("part_id\n" + "".join(f"P{i}\n" for i in range(100)))
+
+    def import_rule(rule, progress=None):
+        for _ in range(5):
+            time.sleep(0.02)
+            progress.batch_committed(20, 20)
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools, "import_rule", import_rule)
+    snapshots = []
+    plan = {"Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv",
+                     "unique_column_name": "part_id", "properties": []}}
+    kg_construction_tools.construct_domain_graph(plan, on_progress=snapshots.append)
+
+    running = [s["rules"]["Part"] for s in snapshots if s["rules"]["Part"]["state"] == "running" and s["rules"]["Part"]["batches"]]
+    assert running, "no progress while the rule was running"
+    assert running[-1]["total_rows"] == 100
+    assert running[-1]["rows_per_second"] > 0 and running[-1]["eta_seconds"] is not None
+    final = kg_construction_tools.construction_progress()
+    assert not final["running"] and final["rules_done"] == 1
+    assert final["rules"]["Part"]["rows_processed"] == 100 and final["rules"]["Part"]["batches"] == 5
+
+
+def test_row_count_is_estimated_from_line_density(tmp_path, monkeypatch):
+    from agentic_kg.common import build_progress
+
+    monkeypatch.setattr(build_progress, "ESTIMATE_SAMPLE_BYTES", 1000)
+    path = tmp_path / "parts.csv"
+    path.write_text("part_id,name\n" + "".join(f"P{i:05d},part\n" for i in range(2000)))
+    assert abs(build_progress.estimate_row_count(path) - 2000) < 50
+    assert build_progress.estimate_row_count(tmp_path / "parts.json") is None
+
+
+def test_typed_properties_are_converted_and_keys_stay_text(tmp_path, monkeypatch):
+    source = tmp_path / "supplied_by.csv"
+    source.write_text("part_id,supplier_id,lead_time_days,unit_cost,preferred\n1,7,8,\"$1,042.73\",yes\n2,7,,$3,no\n")
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append((query, parameters))
+        return tool_success("records", [{"rows": 2, "rows_committed": 2, "error_message": None}])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    rule = {"construction_type": "relationship", "source_file": str(source), "relationship_type": "SUPPLIED_BY",
+            "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier", "to_node_column": "supplier_id",
+            "properties": ["lead_time_days", "unit_cost", "preferred"],
+            "property_types": {"part_id": "int", "lead_time_days": "int", "unit_cost": "currency", "preferred": "bool"}}
+
+    kg_construction_tools.load_relationships_from_client(rule)
+    assert sent[0][1]["rows"] == [
+        {"part_id": "1", "supplier_id": "7", "lead_time_days": 8, "unit_cost": 1042.73, "preferred": True},
+        {"part_id": "2", "supplier_id": "7", "lead_time_days": None, "unit_cost": 3.0, "preferred": False},
+    ]
+
+    sent.clear()
+    kg_construction_tools.load_relationships_from_csv("supplied_by.csv", rule)
+    query, parameters = sent[0]
+    assert parameters["properties"] == []
+    assert parameters["typed_properties"] == ["lead_time_days", "unit_cost", "preferred"]
+    assert "SET r[$typed_properties[1]] = CASE WHEN trim(row[$typed_properties[1]]) = '' THEN null ELSE toFloat(" in query
+
+    # a node property relationships look nodes up by stays text too
+    plan = {"Part": {"construction_type": "node", "label": "Part", "unique_column_name": "part_id",
+                     "property_types": {"sku": "int", "weight": "float"}},
+            "REPLACES": {"construction_type": "relationship", "from_node_label": "Part", "from_node_column": "sku",
+                         "to_node_label": "Part", "to_node_column": "part_id"}}
+    assert kg_construction_tools.untyped_lookup_keys(plan)["Part"]["property_types"] == {"weight": "float"}
+
+
+def test_plan_estimate_combines_row_counts_and_query_plans(tmp_path, monkeypatch):
+    (tmp_path / "parts.csv").write_text("part_id,name\n" + "".join(f"P{i},part {i}\n" for i in range(3000)))
+    (tmp_path / "supplied_by.csv").write_text("part_id,supplier_id\n" + "".join(f"P{i},S{i % 7}\n" for i in range(5000)))
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    schema = FakeSchema(existing=[("Part", "part_id"), ("Supplier", "supplier_id")])
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", schema.send_query)
+    explained = []
+
+    def explain_query(query, parameters=None):
+        explained.append(query)
+        if query.startswith("UNWIND") or "MATCH (from_node" not in query:
+            return tool_success("plan", {"operatorType": "Merge@neo4j", "children": []})
+        return tool_success("plan", {"operatorType": "Eager@neo4j", "children": [
+            {"operatorType": "NodeByLabelScan@neo4j", "arguments": {"Details": "from_node:Part"}}
+        ]})
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "explain_query", explain_query, raising=False)
+    plan = {
+        "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv",
+                 "unique_column_name": "part_id", "properties": ["name"]},
+        "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "supplied_by.csv", "relationship_type": "SUPPLIED_BY",
+                        "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier",
+                        "to_node_column": "supplier_id", "properties": [], "batch_size": 2000},
+        "MADE_BY": {"construction_type": "relationship", "source_file": "supplied_by.csv", "relationship_type": "MADE_BY",
+                    "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Maker",
+                    "to_node_column": "supplier_id", "properties": [], "loader": "client"},
+    }
+    estimate = kg_construction_tools.estimate_construction_plan(plan, max_workers=2)["construction_estimate"]
+
+    assert len(explained) == 3 and not schema.created
+    part, supplied_by, made_by = (estimate["rules"][key] for key in plan)
+    assert part["rows"] == 3000 and part["rows_counted_by"] == "line_count"
+    assert part["transactions"] == 3 and part["throughput"] == "default" and part["warnings"] == []
+    assert supplied_by["transactions"] == 3 and supplied_by["label_scans"] == ["from_node:Part"]
+    # the scan reads the 3000 Part nodes for each of the 5000 rows
+    assert supplied_by["seconds"] > part["seconds"] + made_by["seconds"]
+    assert any("scans every node" in w for w in supplied_by["warnings"]) and any("eager" in w for w in supplied_by["warnings"])
+    # a lookup without an index is created by the build, so it isn't counted as a scan
+    assert made_by["indexes_to_create"] == ["Maker.supplier_id"] and made_by["warnings"] == []
+    assert estimate["indexes_to_create"] == ["Maker.supplier_id"]
+    assert estimate["transactions"] == 3 + 3 + 5
+    assert estimate["seconds"] == round(part["seconds"] + max(supplied_by["seconds"], made_by["seconds"]), 1)
+
+
+class FakeGraph:
+    """Keeps the nodes and relationships written by the client loaders, and answers the dry run's counts."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.relationships = set()
+        self.dropped = []
+
+    def send_query(self, query, parameters=None):
+        parameters = parameters or {}
+        if "dbms.listConfig" in query:
+            return tool_error("no import directory")
+        if query.startswith("UNWIND") and "MERGE (n:" in query:
+            for row in parameters["rows"]:
+                self.nodes.setdefault(parameters["label"], set()).add(row[parameters["unique_column_name"]])
+        elif query.startswith("UNWIND"):
+            for row in parameters["rows"]:
+                from_key, to_key = row[parameters["from_node_column"]], row[parameters["to_node_column"]]
+                if from_key in self.nodes.get(parameters["from_node_label"], ()) and to_key in self.nodes.get(parameters["to_node_label"], ()):
+                    self.relationships.add((parameters["from_node_label"], from_key, parameters["to_node_label"], to_key))
+        elif "count(r)" in query:
+            count = sum(1 for r in self.relationships if r[0] == parameters["from_node_label"] and r[2] == parameters["to_node_label"])
+            return tool_success("records", [{"count": count}])
+        elif "count(n)" in query:
+            label = parameters["label"]
+            linked = {(r[0], r[1]) for r in self.relationships} | {(r[2], r[3]) for r in self.relationships}
+            nodes = self.nodes.get(label, set())
+            count = len(nodes) if "NOT EXISTS" not in query else sum(1 for n in nodes if (label, n) not in linked)
+            return tool_success("records", [{"count": count}])
+        elif "DETACH DELETE" in query:
+            self.dropped.append(parameters["label"])
+            self.nodes.pop(parameters["label"], None)
+            self.relationships = {r for r in self.relationships if parameters["label"] not in (r[0], r[2])}
+        return tool_success("records", [])
+
+
+def test_dry_run_builds_a_consistent_sample_and_removes_it(tmp_path, monkeypatch):
+    (tmp_path / "parts.csv").write_text("part_id,name\n" + "".join(f"P{i},part {i}\n" for i in range(400)))
+    (tmp_path / "suppliers.csv").write_text("supplier_id,name\n" + "".join(f"S{i},supplier {i}\n" for i in range(40)))
+    (tmp_path / "supplied_by.csv").write_text("part_id,supplier_id\n" + "".join(f"P{i},S{i % 40}\n" for i in range(400)))
+    (tmp_path / "made_in.csv").write_text("part_id,country\n" + "".join(f"P{i},SE\n" for i in range(400)))
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    graph = FakeGraph()
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", graph.send_query)
+    plan = {
+        "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv",
+                 "unique_column_name": "part_id", "properties": ["name"]},
+        "Supplier": {"construction_type": "node", "label": "Supplier", "source_file": "suppliers.csv",
+                     "unique_column_name": "supplier_id", "properties": ["name"]},
+        "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "supplied_by.csv", "relationship_type": "SUPPLIED_BY",
+                        "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier",
+                        "to_node_column": "supplier_id", "properties": []},
+        "MADE_IN": {"construction_type": "relationship", "source_file": "made_in.csv", "relationship_type": "MADE_IN",
+                    "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Country",
+                    "to_node_column": "country", "properties": []},
+    }
+    dry_run = kg_construction_tools.dry_run_plan(plan, sample_rows=100)["dry_run"]
+
+    namespace = dry_run["namespace"]
+    assert namespace.startswith("DryRun")
+    part, supplier, supplied_by, made_in = (dry_run["rules"][key] for key in plan)
+    assert 0 < part["rows_sampled"] <= 100 and part["nodes"] == part["rows_sampled"]
+    assert supplier["rows_sampled"] == supplier["nodes"] == 40
+    # every sampled relationship row has both of its nodes in the sample
+    assert supplied_by["rows_sampled"] == part["rows_sampled"]
+    assert supplied_by["relationships"] == supplied_by["pairs"] and supplied_by["unmatched_pairs"] == 0
+    assert part["isolated_nodes"] == 0
+    # countries have no node rule, so those rows find no nodes
+    assert made_in["relationships"] == 0 and made_in["unmatched_pairs"] == made_in["pairs"] > 0
+    assert any(w.startswith("MADE_IN:") and "to nodes have no node rule" in w for w in dry_run["warnings"])
+
+    assert sorted(graph.dropped) == [namespace + "Part", namespace + "Supplier"]
+    assert dry_run["cleaned_up"] and not graph.nodes and not graph.relationships
+
+
+def test_duplicate_keys_are_collapsed_before_merge(tmp_path, monkeypatch):
+    (tmp_path / "parts.csv").write_text("part_id,category\nP1,wood\nP2,metal\nP1,glass\nP1,wood\n")
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    monkeypatch.setattr(kg_construction_tools, "create_uniqueness_constraint", lambda label, key: tool_success("constraint", key))
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append((query, parameters))
+        return tool_success("records", [{"rows": 4, "rows_committed": 4, "error_message": None}])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    rule = {"construction_type": "node", "label": "Part", "source_file": "parts.csv",
+            "unique_column_name": "part_id", "properties": ["category"], "duplicate_keys": "aggregate"}
+    result = kg_construction_tools.import_nodes(rule)["rows_loaded"]
+
+    # LOAD CSV can't collapse rows, so the rule is streamed by the client
+    query, parameters = sent[0]
+    assert query.startswith("UNWIND")
+    assert parameters["rows"] == [{"part_id": "P2", "category": "metal"}, {"part_id": "P1", "category": ["wood", "glass", "wood"]}]
+    assert result["rows_loaded"] == 2
+    assert result["duplicates"] == {"policy": "aggregate", "duplicate_keys": 1, "duplicate_rows": 2, "collapsed": True}
+
+    # an explicit LOAD CSV loader is kept, and the duplicates only counted
+    sent.clear()
+    result = kg_construction_tools.import_nodes({**rule, "loader": "load_csv"})["rows_loaded"]
+    assert sent[0][0].startswith("LOAD CSV")
+    assert result["duplicates"]["collapsed"] is False and result["duplicates"]["duplicate_rows"] == 2
+
+    # without a policy, a LOAD CSV rule is left to MERGE and its file isn't checked
+    sent.clear()
+    result = kg_construction_tools.import_nodes({key: value for key, value in rule.items() if key != "duplicate_keys"})["rows_loaded"]
+    assert sent[0][0].startswith("LOAD CSV")
+    assert "duplicates" not in result
+
+    assert kg_construction_tools.check_duplicates({**rule, "duplicate_keys": "merge"})["status"] == "error"
+
+
+def test_load_csv_progress_counts_quoted_labels(tmp_path, monkeypatch):
+    (tmp_path / "parts.csv").write_text("part_id\nP1\n")
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    monkeypatch.setattr(kg_construction_tools, "create_uniqueness_constraint", lambda label, key: tool_success("constraint", key))
+    sent = []
+
+    def send_query(query, parameters=None):
+        sent.append(query)
+        if query.startswith("MATCH"):
+            return tool_success("records", [{"count": 0}])
+        return tool_success("records", [{"rows": 1, "rows_committed": 1, "error_message": None}])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    rule = {"construction_type": "node", "label": "Odd`Part", "source_file": "parts.csv", "unique_column_name": "part_id",
+            "properties": []}
+    kg_construction_tools.import_nodes(rule, RuleProgress())
+    assert "MATCH (:`Odd``Part`) RETURN count(*) AS count" in sent
+
+
+def test_partitioned_relationship_loads_never_lock_a_node_twice(tmp_path, monkeypatch):
+    lines = ["part_id,supplier_id"]
+    lines += [f"P{i},S{i % 7}" for i in range(200)]
+    # a common supplier, and a row missing a key
+    lines += [f"P{i},S99" for i in range(150)]
+    lines.append("P1,")
+    (tmp_path / "part_supplier_mapping.csv").write_text("\n".join(lines) + "\n")
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    lock = threading.Lock()
+    locked = set()
+    written = []
+    conflicts = []
+
+    def send_query(query, parameters=None):
+        nodes = {("Part", row["part_id"]) for row in parameters["rows"]} | {("Supplier", row["supplier_id"]) for row in parameters["rows"]}
+        with lock:
+            if nodes & locked:
+                conflicts.append(nodes & locked)
+            locked.update(nodes)
+        time.sleep(0.002)
+        with lock:
+            locked.difference_update(nodes)
+            written.extend((row["part_id"], row["supplier_id"]) for row in parameters["rows"])
+        return tool_success("records", [])
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    rule = {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv", "relationship_type": "SUPPLIED_BY",
+            "from_node_label": "Part", "from_node_column": "part_id", "to_node_label": "Supplier", "to_node_column": "supplier_id",
+            "properties": [], "loader": "partitioned", "concurrency": 4, "batch_size": 10}
+    result = kg_construction_tools.import_relationships(rule)["rows_loaded"]
+
+    assert not conflicts
+    assert sorted(written) == sorted(tuple(line.split(",")) for line in lines[1:-1])
+    assert result["rows_loaded"] == 350 and result["rows_skipped"] == 1
+    assert result["partitions"] == 4 and result["rounds"] == 4
+    # the common supplier is written last, in the serial lane
+    assert result["hub_nodes"] == 1 and result["hub_rows"] == 150
+    assert all(supplier == "S99" for _, supplier in written[-150:])
+
+    # the file is read once: rounds and hubs are written from spooled rows
+    reads = []
+    property_rows = kg_construction_tools._property_rows
+    monkeypatch.setattr(kg_construction_tools, "_property_rows", lambda *args: reads.append(args) or property_rows(*args))
+    assert kg_construction_tools.load_relationships_partitioned(rule, 10, 4)["rows_loaded"]["rows_loaded"] == 350
+    assert len(reads) == 1
+
+    # only relationship rules are partitioned, and node rules can't use it
+    assert kg_construction_tools.check_batching(rule) is None
+    node_rule = {"construction_type": "node", "source_file": "parts.csv", "loader": "partitioned"}
+    assert kg_construction_tools.check_loader(node_rule)["status"] == "error"
+
+
+def test_plan_compiles_to_bulk_import_files_and_command(tmp_path, monkeypatch):
+    (tmp_path / "parts.csv").write_text('part_id,name,price,in_stock\nP1,bolt,"$1,042.50",yes\nP2,nut,,no\nP1,bolt,$2.00,yes\n')
+    (tmp_path / "suppliers.csv").write_text("supplier_id,name\nS1,Acme\nS2,Bolt Co\n")
+    (tmp_path / "part_supplier_mapping.csv").write_text("part_id,name\nP1,Acme\nP2,Bolt Co\nP2,Nobody\n")
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    plan = {
+        "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv", "unique_column_name": "part_id",
+                 "properties": ["name", "price", "in_stock"], "property_types": {"price": "currency", "in_stock": "bool"}},
+        "Supplier": {"construction_type": "node", "label": "Supplier", "source_file": "suppliers.csv",
+                     "unique_column_name": "supplier_id", "properties": ["name"]},
+        # suppliers are found by name, not by their key
+        "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv",
+                        "relationship_type": "SUPPLIED_BY", "from_node_label": "Part", "from_node_column": "part_id",
+                        "to_node_label": "Supplier", "to_node_column": "name", "properties": []},
+        "MADE_BY": {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv",
+                    "relationship_type": "MADE_BY", "from_node_label": "Part", "from_node_column": "part_id",
+                    "to_node_label": "Maker", "to_node_column": "name", "properties": []},
+    }
+    result = kg_construction_tools.compile_bulk_import(plan)["bulk_import"]
+
+    output = tmp_path / "bulk_import"
+    assert (output / "Part.header.csv").read_text().strip() == "part_id:ID(Part),name,price:double,in_stock:boolean"
+    # duplicate keys are collapsed (the last row wins), values converted, and empty values left empty
+    assert (output / "Part.csv").read_text().splitlines() == ["P2,nut,,false", "P1,bolt,2.0,true"]
+    assert (output / "SUPPLIED_BY.header.csv").read_text().strip() == ":START_ID(Part),:END_ID(Supplier)"
+    assert (output / "SUPPLIED_BY.csv").read_text().splitlines() == ["P1,S1", "P2,S2"]
+    assert result["files"]["SUPPLIED_BY"]["rows"] == 2
+    assert "MADE_BY" not in result["files"] and "MADE_BY was left out" in result["warnings"][0]
+    assert result["command"] == (
+        f"neo4j-admin database import full --nodes=Part={output}/Part.header.csv,{output}/Part.csv "
+        f"--nodes=Supplier={output}/Supplier.header.csv,{output}/Supplier.csv "
+        f"--relationships=SUPPLIED_BY={output}/SUPPLIED_BY.header.csv,{output}/SUPPLIED_BY.csv "
+        "--skip-bad-relationships=true '--array-delimiter=;' neo4j"
+    )
+    assert "CREATE INDEX `Supplier_name_index` IF NOT EXISTS FOR (n:`Supplier`) ON (n.`name`)" in result["schema_statements"]
+    assert (output / "schema.cypher").read_text().count(";\n") == 3
+
+    # the suppliers' keys by name are read once for both rules that find suppliers by name
+    reads = []
+    node_keys_by = kg_construction_tools._node_keys_by
+    monkeypatch.setattr(kg_construction_tools, "_node_keys_by", lambda *args: reads.append(args) or node_keys_by(*args))
+    twice = {**plan, "SOURCED_FROM": {**plan["SUPPLIED_BY"], "relationship_type": "SOURCED_FROM"}}
+    assert kg_construction_tools.compile_bulk_import(twice)["bulk_import"]["files"]["SOURCED_FROM"]["rows"] == 2
+    assert len(reads) == 1
+    bad_label = {**plan, "Part": {**plan["Part"], "label": "Part:Item"}}
+    assert "Label 'Part:Item'" in kg_construction_tools.compile_bulk_import(bad_label)["error_message"]
+
+    # the import only runs against a stopped, local database
+    config = SimpleNamespace(host="localhost")
+    monkeypatch.setattr(kg_construction_tools.graphdb, "get_config", lambda: config)
+    monkeypatch.setattr(kg_construction_tools.graphdb, "check_available", lambda: tool_success("available", True))
+    assert "is running" in kg_construction_tools.execute_bulk_import(result)["error_message"]
+    monkeypatch.setattr(kg_construction_tools.graphdb, "check_available", lambda: tool_error("authentication failure"))
+    assert "Could not tell" in kg_construction_tools.execute_bulk_import(result)["error_message"]
+    monkeypatch.setattr(kg_construction_tools.graphdb, "check_available", lambda: tool_success("available", False))
+    config.host = "neo4j.example.com"
+    assert "can only be run on the machine" in kg_construction_tools.execute_bulk_import(result)["error_message"]
+    config.host = "127.0.0.1"
+    ran = []
+    monkeypatch.setattr(kg_construction_tools.shutil, "which", lambda name: "/opt/neo4j/bin/neo4j-admin")
+    monkeypatch.setattr(kg_construction_tools.subprocess, "run",
+                        lambda command, **kwargs: ran.append((command, kwargs)) or subprocess.CompletedProcess(command, 0, "IMPORT DONE\n", ""))
+    run = kg_construction_tools.execute_bulk_import(result, overwrite=True)["bulk_import_run"]
+    command, kwargs = ran[0]
+    assert command[0] == "/opt/neo4j/bin/neo4j-admin" and "--overwrite-destination=true" in command
+    assert kwargs["timeout"] == kg_construction_tools.get_settings().neo4j_admin_timeout
+    assert run["output"] == ["IMPORT DONE"]
+
+
+def test_background_build_can_be_polled_while_it_runs(monkeypatch):
+    release = threading.Event()
+
+    def construct_domain_graph(plan, **kwargs):
+        release.wait(5)
+        return tool_success("domain_graph_constructed", {"rules": {}, "failed_rules": []})
+
+    monkeypatch.setattr(kg_construction_tools, "construct_domain_graph", construct_domain_graph)
+    monkeypatch.setattr(kg_construction_tools, "_background_build", None)
+    plan = {"Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv",
+                     "unique_column_name": "part_id", "properties": []}}
+    tool_context = SimpleNamespace(state={kg_construction_tools.APPROVED_CONSTRUCTION_PLAN: plan})
+
+    started = kg_construction_tools.build_graph_from_construction_rules(tool_context, background=True)
+    build_id = started["construction_started"]["build_id"]
+    progress = kg_construction_tools.get_construction_progress(tool_context)["construction_progress"]
+    assert progress["running"] and progress["build_id"] == build_id and "result" not in progress
+    # one build at a time
+    assert "still running" in kg_construction_tools.build_graph_from_construction_rules(tool_context)["error_message"]
+
+    release.set()
+    for _ in range(100):
+        if kg_construction_tools.background_build()["result"] is not None:
+            break
+        time.sleep(0.01)
+    progress = kg_construction_tools.get_construction_progress(tool_context)["construction_progress"]
+    assert progress["result"]["status"] == "success"
+    assert tool_context.state[kg_construction_tools.CONSTRUCTION_PROGRESS]["build_id"] == build_id
+
+
+def test_delta_builds_serially_and_rewrites_relationships_of_deleted_nodes(tmp_path, monkeypatch):
+    merged = []
+
+    def send_query(query, parameters=None):
+        if "UNWIND $rows" in query and "DELETE" not in query:
+            merged.append([dict(row) for row in parameters["rows"]])
+        return FakeSchema().send_query(query, parameters)
+
+    monkeypatch.setattr(kg_construction_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(kg_construction_tools, "get_neo4j_import_dir", lambda: tool_success("neo4j_import_dir", str(tmp_path)))
+    monkeypatch.setattr(kg_construction_tools, "create_uniqueness_constraint", lambda label, key: tool_success("constraint", key))
+    monkeypatch.setattr(kg_construction_tools, "await_indexes", lambda timeout: tool_success("indexes", []))
+    (tmp_path / "parts.csv").write_text("part_id\nP1\nP2\n")
+    (tmp_path / "part_supplier_mapping.csv").write_text("part_id,supplier_id\nP1,S1\nP2,S1\n")
+    plan = {
+        # tuned for full LOAD CSV imports, which doesn't stop a delta
+        "Part": {"construction_type": "node", "label": "Part", "source_file": "parts.csv", "unique_column_name": "part_id",
+                 "properties": [], "concurrency": 4, "on_error": "continue"},
+        "SUPPLIED_BY": {"construction_type": "relationship", "source_file": "part_supplier_mapping.csv",
+                        "relationship_type": "SUPPLIED_BY", "from_node_label": "Part", "from_node_column": "part_id",
+                        "to_node_label": "Supplier", "to_node_column": "supplier_id", "properties": []},
+    }
+    first = kg_construction_tools.construct_domain_graph(plan, delta=True)["domain_graph_constructed"]
+    assert first["failed_rules"] == []
+
+    # P2 is removed and deleted with its relationships, then added back
+    (tmp_path / "parts.csv").write_text("part_id\nP1\n")
+    kg_construction_tools.construct_domain_graph(plan, delta=True, delete_missing=True)
+    (tmp_path / "parts.csv").write_text("part_id\nP1\nP2\n")
+    merged.clear()
+    read_kinds = []
+    read_catalog_entry = kg_construction_tools.read_catalog_entry
+    monkeypatch.setattr(kg_construction_tools, "read_catalog_entry",
+                        lambda import_dir, kind, *args, **kwargs: read_kinds.append(kind) or read_catalog_entry(import_dir, kind, *args, **kwargs))
+    third = kg_construction_tools.construct_domain_graph(plan, delta=True)["domain_graph_constructed"]
+    # only the row ending at the returning node is written again
+    assert third["rules"]["SUPPLIED_BY"]["delta"]["inserted"] == 1
+    assert merged[-1] == [{"part_id": "P2", "supplier_id": "S1"}]
+    # the Part import only checked that SUPPLIED_BY has fingerprints; SUPPLIED_BY read its own once
+    assert read_kinds.count(kg_construction_tools._fingerprints_kind(plan["SUPPLIED_BY"])) == 1
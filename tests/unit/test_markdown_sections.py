@@ -0,0 +1,139 @@
+from pathlib import Path
+
+from agentic_kg.common.markdown_sections import document_title, iter_sections
+from agentic_kg.common.tool_result import tool_success
+from agentic_kg.tools import markdown_tools
+
+REVIEWS_DIR = Path(__file__).resolve().parents[2] / "data" / "bom" / "product_reviews"
+
+
+def test_review_files_split_into_structured_sections():
+    for path in sorted(REVIEWS_DIR.glob("*.md")):
+        with open(path, encoding="utf-8") as f:
+            sections = list(iter_sections(f))
+        title, reviews = sections[0], sections[1:]
+        assert document_title(title).endswith("Reviews")
+        assert title.fields["source_url"].startswith("https://")
+        assert reviews
+        for review in reviews:
+            assert 1 <= review.fields["rating"] <= review.fields["rating_scale"] == 5
+            assert review.fields["author"] and review.fields["city"]
+            assert "@" not in review.text
+            assert not review.text.endswith("---")
+
+
+def test_sections_ignore_fenced_headings_and_keep_subheadings():
+    markdown = [
+        "Intro without a title\n",
+        "## Rating: ★★★★☆\n",
+        "Nice.\n",
+        "```\n",
+        "## not a heading\n",
+        "```\n",
+        "### Details\n",
+        "More.\n",
+        "\n",
+        "— @reviewer_1\n",
+    ]
+    intro, review = list(iter_sections(markdown))
+    assert document_title(intro) is None
+    assert intro.text == "Intro without a title"
+    assert review.start_line == 2
+    assert review.fields == {"rating": 4.0, "rating_scale": 5, "author": "reviewer_1"}
+    assert "## not a heading" in review.text and "### Details" in review.text
+
+
+def test_markdown_document_is_written_in_batches(monkeypatch):
+    queries = []
+
+    def send_query(query, parameters=None):
+        queries.append((query, parameters))
+        return tool_success("records", [])
+
+    monkeypatch.setattr(markdown_tools.graphdb, "send_query", send_query)
+    result = markdown_tools.import_markdown_document(REVIEWS_DIR.parent, "product_reviews/gothenburg_table_reviews.md",
+                                                     "ProductReviews", batch_size=3)
+
+    assert result["markdown_import"] == {"source_file": "product_reviews/gothenburg_table_reviews.md",
+                                         "title": "Gothenburg Table Reviews", "chunks": 8, "reviews": 7}
+    chunk_batches = [p["chunks"] for q, p in queries if "chunks" in p]
+    assert [len(batch) for batch in chunk_batches] == [3, 3, 2]
+    assert chunk_batches[0][1]["city"] == "Cambridge"
+    assert [p["chunk_counts"] for q, p in queries if "chunk_counts" in p] == [{"product_reviews/gothenburg_table_reviews.md": 8}]
+    assert queries[-1][1]["documents"][0]["content_hash"]
+
+
+def test_reimported_chunks_that_are_no_longer_reviews_lose_review_fields(tmp_path, monkeypatch):
+    review = tmp_path / "review.md"
+    review.write_text("# Desk Reviews\n\n## Rating: (4/5)\n\n**Reviewer:** sam\n\nSturdy.\n", encoding="utf-8")
+    queries = []
+
+    def send_query(query, parameters=None):
+        queries.append((query, parameters or {}))
+        return tool_success("records", [])
+
+    monkeypatch.setattr(markdown_tools.graphdb, "send_query", send_query)
+    markdown_tools.import_markdown_document(tmp_path, "review.md", "Reviews")
+    first = [row for q, p in queries for row in p.get("chunks", [])]
+    assert first[1]["rating"] == 4
+
+    review.write_text("# Desk Reviews\n\n## Assembly notes\n\nTakes an hour.\n", encoding="utf-8")
+    queries.clear()
+    markdown_tools.import_markdown_document(tmp_path, "review.md", "Reviews")
+    query, parameters = next((q, p) for q, p in queries if "chunks" in p)
+    second = parameters["chunks"][1]
+    assert second["id"] == first[1]["id"]
+    assert all(second[key] is None for key in markdown_tools.REVIEW_FIELDS)
+    # review fields are set on every chunk, so the missing ones are removed, and so is the label
+    assert "c.rating = chunk.rating" in query.split("MERGE (d)")[0]
+    assert "REMOVE c:$($review_label)" in query
+
+
+def test_bulk_import_batches_files_and_skips_unchanged(tmp_path, monkeypatch):
+    import shutil
+    shutil.copytree(REVIEWS_DIR, tmp_path / "reviews")
+    (tmp_path / "reviews" / "broken.md").write_bytes(b"## Rating: (1/5)\n\xff\xfe not utf-8\n")
+    files = sorted(str(p.relative_to(tmp_path)) for p in (tmp_path / "reviews").glob("*.md"))
+
+    documents = {}
+    chunk_batches = []
+
+    def send_query(query, parameters=None):
+        parameters = parameters or {}
+        if "source_files" in parameters:
+            return tool_success("records", [
+                {"source_file": f, "content_hash": documents[f]["content_hash"]}
+                for f in parameters["source_files"] if documents.get(f, {}).get("content_hash")
+            ])
+        for document in parameters.get("documents", []):
+            documents.setdefault(document["source_file"], {}).update(document)
+        if "chunks" in parameters:
+            chunk_batches.append(list(parameters["chunks"]))
+        return tool_success("records", [])
+
+    transactions = []
+
+    def send_queries(queries):
+        transactions.append(queries)
+        return tool_success("records", [send_query(query, parameters)["records"] for query, parameters in queries])
+
+    monkeypatch.setattr(markdown_tools.graphdb, "send_query", send_query)
+    monkeypatch.setattr(markdown_tools.graphdb, "send_queries", send_queries)
+    result = markdown_tools.import_markdown_documents(tmp_path, files, "ProductReviews", batch_size=20)["markdown_import"]
+
+    assert result["files_imported"] == 10
+    assert result["files_unchanged"] == 0
+    assert list(result["errors"]) == ["reviews/broken.md"]
+    assert result["reviews"] == result["chunks"] - 10
+    assert 1 < len(chunk_batches) < 10
+    # every batch holds the whole of several files
+    assert all(len({c["source_file"] for c in batch}) > 1 for batch in chunk_batches[:-1])
+    # each batch is written in one transaction, content hashes included
+    assert len(transactions) == len(chunk_batches)
+    assert all(d["content_hash"] for queries in transactions for d in queries[0][1]["documents"])
+
+    (tmp_path / "reviews" / "malmo_desk_reviews.md").write_text("# Malmo Desk Reviews\n", encoding="utf-8")
+    again = markdown_tools.import_markdown_documents(tmp_path, files, "ProductReviews")["markdown_import"]
+    assert again["files_imported"] == 1
+    assert again["files_unchanged"] == 9
+    assert again["chunks"] == 1
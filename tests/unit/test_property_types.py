@@ -0,0 +1,43 @@
+import datetime
+
+from agentic_kg.common.property_types import check_property_types, coerce_value, cypher_coercion, infer_type, infer_types
+
+
+def test_types_are_inferred_from_every_non_empty_value():
+    assert infer_type(["14", "", "-3"]) == "int"
+    assert infer_type(["14", "2.5"]) == "float"
+    assert infer_type(["$42.73", "$1,042", " £3 "]) == "currency"
+    assert infer_type(["yes", "No", "TRUE"]) == "bool"
+    assert infer_type(["2024-05-31", ""]) == "date"
+    assert infer_type(["14", "fourteen"]) == "string"
+    assert infer_type(["", None]) == "string"
+    # JSON values are already typed
+    assert infer_type([1, 2.5]) == "float"
+    assert infer_type([True, False]) == "bool"
+
+    records = [{"id": "P1", "qty": "3", "cost": "$2"}, {"id": "P2", "qty": "", "cost": "$2.50"}]
+    assert infer_types(records, ["id", "qty", "cost", "missing"]) == {
+        "id": "string", "qty": "int", "cost": "currency", "missing": "string"
+    }
+
+
+def test_values_are_coerced_and_empty_values_dropped():
+    assert coerce_value("14", "int") == 14
+    assert coerce_value("$1,042.73", "currency") == 1042.73
+    assert coerce_value("Yes", "bool") is True
+    assert coerce_value("no", "bool") is False
+    assert coerce_value("2024-05-31", "date") == datetime.date(2024, 5, 31)
+    assert coerce_value(" ", "string") is None
+    assert coerce_value("", "int") is None
+    # values that don't fit the type are dropped, like toInteger() in Cypher
+    assert coerce_value("many", "int") is None
+    assert coerce_value(7, "string") == 7
+
+
+def test_cypher_coercion_nulls_empty_values():
+    expression = cypher_coercion("row.cost", "currency")
+    assert expression.startswith("CASE WHEN trim(row.cost) = '' THEN null ELSE toFloat(")
+    assert "'\\d" not in cypher_coercion("row.day", "date")
+    assert cypher_coercion("row.name", "string") == "CASE WHEN trim(row.name) = '' THEN null ELSE row.name END"
+    assert check_property_types({"qty": "int"}) is None
+    assert "decimal" in check_property_types({"qty": "decimal"})
@@ -0,0 +1,39 @@
+from agentic_kg.common.relationship_partitions import RelationshipPartitions, endpoint_degrees, partition_rounds
+
+
+def lane_nodes(lane, same_label):
+    if same_label:
+        return {partition for cell in lane for partition in cell}
+    return {("from", i) for i, _ in lane} | {("to", j) for _, j in lane}
+
+
+def test_rounds_cover_every_cell_with_lanes_that_share_no_partition():
+    for partitions in (1, 2, 3, 4, 5):
+        for same_label in (False, True):
+            rounds = partition_rounds(partitions, same_label)
+            cells = [cell for lanes in rounds for lane in lanes for cell in lane]
+            assert sorted(cells) == [(i, j) for i in range(partitions) for j in range(partitions)]
+            for lanes in rounds:
+                seen = set()
+                for lane in lanes:
+                    nodes = lane_nodes(lane, same_label)
+                    assert not nodes & seen
+                    seen |= nodes
+    # different labels run every partition at once
+    assert [len(lanes) for lanes in partition_rounds(4, False)] == [4, 4, 4, 4]
+
+
+def test_rows_of_hub_nodes_are_kept_out_of_the_grid():
+    rows = [{"part_id": f"P{i}", "supplier": "S1"} for i in range(30)]
+    rows += [{"part_id": f"P{i}", "supplier": f"S{i}"} for i in range(30, 40)]
+    rows.append({"part_id": None, "supplier": "S2"})
+    degrees = endpoint_degrees(rows, "part_id", "supplier")
+    assert degrees["rows"] == 41 and degrees["keyed_rows"] == 40
+
+    partitions = RelationshipPartitions.from_degrees(degrees, 2, same_label=False, min_degree=5)
+    assert partitions.hub_count == 1
+    assert partitions.cell("P0", "S1") is None
+    i, j = partitions.cell("P30", "S30")
+    assert partitions.lane((i, j)) in [(r, lane) for r in range(2) for lane in range(2)]
+    # the same key lands in the same partition wherever it appears
+    assert partitions.cell("P30", "S31")[0] == i
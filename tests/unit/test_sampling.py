@@ -0,0 +1,57 @@
+import io
+import random
+
+from agentic_kg.common.sampling import sample_head, sample_random_offsets, sample_reservoir
+
+HEADER = b"id,name\n"
+ROWS = [f"{i},name-{i}\n".encode() for i in range(1000)]
+CSV = HEADER + b"".join(ROWS)
+
+
+def test_head_respects_line_and_byte_budgets():
+    sample = sample_head(io.BytesIO(CSV), max_lines=5, max_bytes=10_000)
+    assert sample.content == (HEADER + b"".join(ROWS[:4])).decode()
+
+    budgeted = sample_head(io.BytesIO(CSV), max_lines=100, max_bytes=50)
+    assert len(budgeted.content.encode()) <= 50
+    assert budgeted.budget_exhausted
+
+
+def test_reservoir_keeps_header_and_file_order():
+    sample = sample_reservoir(io.BytesIO(CSV), max_lines=11, max_bytes=10_000, rng=random.Random(7))
+    assert sample.lines[0] == HEADER.decode()
+    ids = [int(line.split(",")[0]) for line in sample.lines[1:]]
+    assert len(ids) == 10
+    assert ids == sorted(ids)
+    # a uniform sample of 1000 rows is very unlikely to be the first ten
+    assert ids != list(range(10))
+
+
+def test_byte_budget_keeps_lines_from_across_the_file():
+    # room for the header and about ten of the hundred sampled rows
+    max_bytes = len(HEADER) + 10 * len(ROWS[500])
+    for sample_lines in (sample_reservoir, sample_random_offsets):
+        sample = sample_lines(io.BytesIO(CSV), max_lines=101, max_bytes=max_bytes, rng=random.Random(5))
+        assert sample.budget_exhausted
+        ids = [int(line.split(",")[0]) for line in sample.lines[1:]]
+        assert 5 <= len(ids) < 100
+        assert ids == sorted(ids)
+        # not just the earliest of the sampled rows
+        assert ids[-1] > 500
+
+
+def test_random_offsets_return_whole_lines():
+    sample = sample_random_offsets(io.BytesIO(CSV), max_lines=21, max_bytes=10_000, rng=random.Random(3))
+    assert sample.lines[0] == HEADER.decode()
+    body = sample.lines[1:]
+    assert 0 < len(body) <= 20
+    assert all(line.encode() in ROWS for line in body)
+    assert len(set(body)) == len(body)
+
+
+def test_overly_long_lines_are_cut_short():
+    data = HEADER + b"1," + b"x" * 100_000 + b"\n" + b"2,short\n"
+    sample = sample_head(io.BytesIO(data), max_lines=10, max_bytes=10_000, max_line_bytes=100)
+    assert sample.truncated_lines == 1
+    assert sample.lines[1].endswith("...[line truncated]\n")
+    assert sample.lines[2] == "2,short\n"